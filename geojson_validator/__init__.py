@@ -1,13 +1,50 @@
 from .main import (
     validate_structure,
     validate_geometries,
+    iter_validate_geometries,
     fix_geometries,
     configure_logging,
 )
+from .validator import Validator
+from .results import ValidationResults
+from .partition import validate_partition, merge_results
+from .parallel import validate_file_parallel, validate_geometries_parallel
+from .feature_index import FeatureIndex
+from .streaming import iter_features
+from .sources import configure_http
+from .archive import validate_archive
+from .batch import validate_files
+from .server import ValidationServer
+from .async_validation import (
+    validate_structure_async,
+    validate_geometries_async,
+    fix_geometries_async,
+)
+from .geometry_arrays import validate_geometry_array
+from .geoparquet import validate_geoparquet, iter_validate_geoparquet
 
 __all__ = [
     "validate_structure",
     "validate_geometries",
+    "iter_validate_geometries",
     "fix_geometries",
     "configure_logging",
+    "Validator",
+    "ValidationResults",
+    "validate_partition",
+    "merge_results",
+    "validate_file_parallel",
+    "validate_geometries_parallel",
+    "FeatureIndex",
+    "iter_features",
+    "configure_http",
+    "validate_archive",
+    "validate_files",
+    "ValidationServer",
+    "validate_structure_async",
+    "validate_geometries_async",
+    "fix_geometries_async",
+    "validate_geometry_array",
+    "validate_geoparquet",
+    "iter_validate_geoparquet",
 ]
@@ -0,0 +1,166 @@
+from typing import Any, Dict, List, Optional, Sequence, Union, cast
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import io
+import json
+import os
+import zipfile
+
+from loguru import logger
+
+from .geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    ALLOWED_PROBLEMATIC_CRITERIA,
+    check_criteria,
+    check_criteria_options,
+)
+from .main import validate_geometries, validate_structure
+from .sources import check_geojson_source, decompressed
+
+# The errors of a member that can not be read or validated, reported instead of raised so
+# the other members are still validated.
+_MEMBER_ERRORS = (
+    ValueError,
+    TypeError,
+    KeyError,
+    AttributeError,
+    OSError,
+    EOFError,
+    zipfile.BadZipFile,
+)
+
+
+def _is_geojson_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    # E.g. the resource forks that macOS adds to a zip.
+    if info.is_dir() or name.startswith("__MACOSX/") or Path(name).name.startswith("."):
+        return False
+    try:
+        check_geojson_source(name)
+    except ValueError:
+        return False
+    return True
+
+
+def geojson_report(geojson_data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The structure and geometry validation results of one decoded GeoJSON.
+
+    Args:
+        geojson_data: The decoded GeoJSON.
+        options: "check_structure", "check_crs", and the criteria of `validate_geometries`.
+    """
+    report: Dict[str, Any] = {}
+    if options["check_structure"]:
+        report["structure"] = validate_structure(
+            geojson_data, check_crs=options["check_crs"]
+        )
+    report["geometries"] = validate_geometries(
+        geojson_data,
+        options["criteria_invalid"],
+        options["criteria_problematic"],
+        options["criteria_options"],
+    )
+    return report
+
+
+def report_is_valid(report: Dict[str, Any]) -> bool:
+    """
+    Whether the report of `geojson_report` has no structure errors, no invalid geometries
+    and no error. Problematic geometries are still valid.
+    """
+    return (
+        "error" not in report
+        and not report.get("structure")
+        and not report["geometries"]["invalid"]
+    )
+
+
+def _validate_member(
+    zip_path: Union[str, Path], name: str, options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Reads a member straight from the archive and validates it, also in a worker."""
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            with archive.open(name) as member:
+                # E.g. a data.geojson.gz member is decompressed as well.
+                stream = io.BufferedReader(cast(Any, member))
+                geojson_data = json.load(decompressed(stream, None))
+        return geojson_report(geojson_data, options)
+    except _MEMBER_ERRORS as error:
+        logger.info(f"Archive member {name} could not be validated: {error}")
+        return {"error": str(error) or type(error).__name__}
+
+
+def validate_archive(
+    zip_path: Union[str, Path],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    *,
+    check_structure: bool = True,
+    check_crs: bool = False,
+    workers: Optional[int] = 1,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Validate every GeoJSON member of a zip archive, read directly from the archive without
+    extracting it.
+
+    The members with a (Geo)JSON suffix, also compressed like data.geojson.gz, are each
+    validated with `validate_structure` and `validate_geometries`. Only one member per
+    worker is decoded at a time.
+
+    Args:
+        zip_path: Filepath to the zip archive.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+        criteria_options: Options of the criteria that compare the features with each other,
+            e.g. {"duplicate_features": {"normalize": True}}.
+        check_structure: Also validate the structure of each member.
+        check_crs: Also flag a crs member, see `validate_structure`.
+        workers: The number of worker processes that validate the members in parallel,
+            None for the number of CPUs. With 1, the members are validated one after
+            another in this process.
+
+    Returns:
+        Per member name its report, e.g. {"a.geojson": {"structure": {...},
+        "geometries": {"invalid": {...}, ...}}}, or {"error": message} for a member that
+        is no readable GeoJSON.
+    """
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(
+        criteria_problematic, ALLOWED_PROBLEMATIC_CRITERIA, name="problematic"
+    )
+    check_criteria_options(criteria_options, criteria_problematic)
+    options: Dict[str, Any] = {
+        "check_structure": check_structure,
+        "check_crs": check_crs,
+        "criteria_invalid": criteria_invalid,
+        "criteria_problematic": criteria_problematic,
+        "criteria_options": criteria_options,
+    }
+
+    with zipfile.ZipFile(zip_path) as archive:
+        names: List[str] = [
+            info.filename for info in archive.infolist() if _is_geojson_member(info)
+        ]
+    logger.info(f"Validating {len(names)} GeoJSON members of {zip_path}")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(names) <= 1:
+        reports = [_validate_member(zip_path, name, options) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(
+                executor.map(
+                    _validate_member,
+                    [zip_path] * len(names),
+                    names,
+                    [options] * len(names),
+                )
+            )
+    return dict(zip(names, reports))
@@ -0,0 +1,195 @@
+from typing import Any, Callable, Dict, Optional, Sequence, TypeVar, Union
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+import asyncio
+
+from loguru import logger
+
+from .fixes_utils import process_fix
+from .geometry_utils import input_to_geojson, any_geojson_to_featurecollection
+from .geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    ALLOWED_PROBLEMATIC_CRITERIA,
+    check_criteria,
+    check_criteria_options,
+)
+from .partition import validate_partition, merge_results
+from .schema_validation import GeoJsonLint
+
+T = TypeVar("T")
+
+_CHUNK_SIZE = 10_000
+
+
+async def _run(
+    executor: Optional[Executor],
+    semaphore: Optional[asyncio.Semaphore],
+    func: Callable[..., T],
+    *args: Any,
+) -> T:
+    """Runs the blocking function in the executor, within the concurrency limit."""
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        return await loop.run_in_executor(executor, partial(func, *args))
+    async with semaphore:
+        return await loop.run_in_executor(executor, partial(func, *args))
+
+
+async def _read_input(
+    geojson_input: Any, semaphore: Optional[asyncio.Semaphore]
+) -> Dict[str, Any]:
+    """
+    The input as GeoJSON. A file or url is read in a thread, with the pooled session of
+    `configure_http`, so the event loop is not blocked while its bytes arrive.
+    """
+    if isinstance(geojson_input, (str, Path)):
+        # Not in the executor of the checks, e.g. a process pool would pickle the GeoJSON.
+        return await _run(None, semaphore, input_to_geojson, geojson_input)
+    return input_to_geojson(geojson_input)
+
+
+async def validate_structure_async(
+    geojson_input: Union[dict, str, Path, Any],
+    check_crs: bool = False,
+    summary_only: bool = False,
+    *,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Dict[str, Any]:
+    """
+    Like `validate_structure`, but reads and checks the input without blocking the event
+    loop. The json paths of the errors refer to the whole input, so it is checked in one
+    piece.
+
+    Args:
+        geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
+        check_crs: Also flag a crs member, which the GeoJSON specification disallows.
+        summary_only: Only count the occurrences of each error.
+        executor: The executor of the check, by default the thread pool of the event loop.
+        semaphore: Limits the blocking jobs that run at the same time, e.g. one
+            asyncio.Semaphore(4) shared by all validations of a server.
+
+    Returns:
+        The same as `validate_structure`.
+    """
+    geojson_data = await _read_input(geojson_input, semaphore)
+    lint = GeoJsonLint(check_crs=check_crs, summary_only=summary_only)
+    errors = await _run(executor, semaphore, lint.lint, geojson_data)
+    logger.info(f"Structure validation results: {errors}")
+    return errors
+
+
+async def validate_geometries_async(
+    geojson_input: Union[dict, str, Path, Any],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    *,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    chunk_size: int = _CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Like `validate_geometries`, but reads and checks the input without blocking the event
+    loop, e.g. in an async web service.
+
+    The features are checked in chunks (`validate_partition`) in the executor and their
+    results merged, so many inputs share the executor fairly. Cancelling the call cancels
+    the chunks that have not started yet.
+
+    Args:
+        geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+        criteria_options: Options of the criteria that compare the features with each other,
+            e.g. {"duplicate_features": {"normalize": True}}.
+        executor: The executor of the chunks, by default the thread pool of the event loop.
+            A ProcessPoolExecutor checks them in parallel on several cores.
+        semaphore: Limits the blocking jobs that run at the same time, e.g. one
+            asyncio.Semaphore(4) shared by all validations of a server.
+        chunk_size: The number of features per chunk.
+
+    Returns:
+        The same as `validate_geometries`.
+    """
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` must be at least 1")
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(
+        criteria_problematic, ALLOWED_PROBLEMATIC_CRITERIA, name="problematic"
+    )
+    check_criteria_options(criteria_options, criteria_problematic)
+
+    geojson_data = await _read_input(geojson_input, semaphore)
+    features = any_geojson_to_featurecollection(geojson_data)["features"]
+    partial_results = await asyncio.gather(
+        *(
+            _run(
+                executor,
+                semaphore,
+                validate_partition,
+                features[offset : offset + chunk_size],
+                offset,
+                criteria_invalid,
+                criteria_problematic,
+                criteria_options,
+            )
+            for offset in range(0, len(features), chunk_size)
+        )
+    )
+    results = merge_results(partial_results)
+    logger.info(f"Validation results: {results}")
+    return results
+
+
+async def fix_geometries_async(
+    geojson_input: Union[dict, str, Path, Any],
+    optional: Sequence[str] = ("duplicate_nodes",),
+    *,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    chunk_size: int = _CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Like `fix_geometries`, but reads, checks and fixes the input without blocking the event
+    loop. The geometries are checked in chunks, see `validate_geometries_async`.
+
+    Args:
+        geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
+        optional: Additional, non-essential fixes, one of ["duplicate_nodes"].
+        executor: The executor of the checks and the fix, by default the thread pool of the
+            event loop.
+        semaphore: Limits the blocking jobs that run at the same time.
+        chunk_size: The number of features per chunk.
+
+    Returns:
+        The GeoJSON feature collection with fixed geometries.
+    """
+    criteria = ["unclosed", "exterior_not_ccw", "interior_not_cw"]
+    check_criteria(optional, ["duplicate_nodes"], name="optional")
+    optional = list(optional or [])
+
+    geojson_data = await _read_input(geojson_input, semaphore)
+    geometry_validation_results = await validate_geometries_async(
+        geojson_data,
+        criteria_invalid=criteria,
+        criteria_problematic=optional,
+        executor=executor,
+        semaphore=semaphore,
+        chunk_size=chunk_size,
+    )
+    fc = any_geojson_to_featurecollection(geojson_data)
+
+    # The optional criteria go last: they are the ones that can remove nodes.
+    all_criteria = [*criteria, *optional]
+    fixed_fc = await _run(
+        executor, semaphore, process_fix, fc, geometry_validation_results, all_criteria
+    )
+    logger.info(f"Fixed geometries for criteria {all_criteria}")
+    return fixed_fc
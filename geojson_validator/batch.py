@@ -0,0 +1,251 @@
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+import glob
+import json
+import os
+
+from .archive import _MEMBER_ERRORS, report_is_valid
+from .geometry_utils import input_to_geojson
+from .geometry_validation import INVALID_CRITERIA, PROBLEMATIC_CRITERIA
+from .schema_validation import GeoJsonLint
+from .sources import check_geojson_source, is_url
+from .validator import Validator
+
+# The most files and bytes per job of a worker process. Small files are batched so that
+# they do not each pay a round trip to the worker, large files are a job of their own.
+_BATCH_FILES = 16
+_BATCH_BYTES = 1024 * 1024
+
+# The validator of a worker process, created once by `_init_worker`.
+_WORKER: Dict[str, "_FileValidator"] = {}
+
+
+class _FileValidator:
+    """Validates files with the criteria compiled once, without logging each result."""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.validator = Validator(
+            options["criteria_invalid"],
+            options["criteria_problematic"],
+            criteria_options=options["criteria_options"],
+        )
+        self.lint = (
+            GeoJsonLint(check_crs=options["check_crs"])
+            if options["check_structure"]
+            else None
+        )
+
+    def validate(self, path: str) -> Dict[str, Any]:
+        return {"path": path, **self.validate_json(path)}
+
+    def validate_json(self, source: Union[str, bytes]) -> Dict[str, Any]:
+        """The report of a filepath/url, or of the json text of a GeoJSON."""
+        report: Dict[str, Any] = {}
+        try:
+            if isinstance(source, bytes):
+                geojson_data = input_to_geojson(json.loads(source))
+            else:
+                geojson_data = input_to_geojson(source)
+            if self.lint is not None:
+                report["structure"] = self.lint.lint(geojson_data)
+            report["geometries"] = self.validator.validate(geojson_data)
+        except _MEMBER_ERRORS as error:
+            report["error"] = str(error) or type(error).__name__
+        report["valid"] = report_is_valid(report)
+        return report
+
+
+def error_report(path: str, error: BaseException) -> Dict[str, Any]:
+    """The report of a file whose validation failed, e.g. in a worker process that died."""
+    return {"path": path, "error": str(error) or type(error).__name__, "valid": False}
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    _WORKER["validator"] = _FileValidator(options)
+
+
+def _validate_batch(paths: List[str]) -> List[Dict[str, Any]]:
+    validator = _WORKER["validator"]
+    return [validator.validate(path) for path in paths]
+
+
+def validate_body(body: bytes) -> Dict[str, Any]:
+    """The report of the json text of a GeoJSON, in a worker of `worker_pool`."""
+    return _WORKER["validator"].validate_json(body)
+
+
+def worker_pool(
+    options: Dict[str, Any], workers: Optional[int] = None
+) -> ProcessPoolExecutor:
+    """
+    A process pool whose workers each compile the criteria once, for `validate_body` and
+    `submit_files`.
+
+    Args:
+        options: "check_structure", "check_crs", and the criteria of `validate_files`.
+        workers: The number of worker processes, by default the number of CPUs.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(options,)
+    )
+
+
+def submit_files(
+    executor: ProcessPoolExecutor, paths: Iterable[str]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validates the files in the `worker_pool`, the largest first, and yields the report of
+    each file as soon as it is done.
+    """
+    sized_paths = sorted(((_size(path), path) for path in paths), reverse=True)
+    # The executor starts the jobs in the order of submission, the largest first.
+    batches: Dict[Future, List[str]] = {
+        executor.submit(_validate_batch, batch): batch
+        for batch in _batches(sized_paths)
+    }
+    pending: Set[Future] = set(batches)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    yield from future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    # E.g. a worker process that died, the other batches go on.
+                    yield from (error_report(path, error) for path in batches[future])
+    finally:
+        # E.g. when the caller stops iterating early.
+        for future in pending:
+            future.cancel()
+
+
+def expand_paths(
+    paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+) -> List[str]:
+    """
+    The files of a glob pattern, e.g. "data/**/*.geojson", of a directory (its (Geo)JSON
+    files, recursively), or of a list of filepaths/urls.
+    """
+    if isinstance(paths_or_glob, (str, Path)):
+        paths_or_glob = [paths_or_glob]
+    paths: List[str] = []
+    for source in paths_or_glob:
+        source = str(source)
+        if is_url(source):
+            paths.append(source)
+        elif os.path.isdir(source):
+            for path in sorted(Path(source).rglob("*")):
+                try:
+                    check_geojson_source(path)
+                except ValueError:
+                    continue
+                if path.is_file():
+                    paths.append(str(path))
+        elif glob.has_magic(source):
+            paths.extend(sorted(glob.glob(source, recursive=True)))
+        else:
+            paths.append(source)
+    return paths
+
+
+def _size(path: str) -> int:
+    try:
+        return 0 if is_url(path) else os.path.getsize(path)
+    except OSError:
+        return 0  # Reported by the worker.
+
+
+def validate_files(
+    paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    *,
+    check_structure: bool = True,
+    check_crs: bool = False,
+    workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validate many GeoJSON files in worker processes, lazily yielding the report of each
+    file as soon as it is done, e.g. to write them as JSONL.
+
+    The largest files are scheduled first, so that no large file is left for the end while
+    the other workers are idle. Each worker compiles the criteria once (`Validator`) and
+    validates the small files in batches.
+
+    Args:
+        paths_or_glob: A glob pattern, e.g. "data/**/*.geojson", a directory of (Geo)JSON
+            files, or a list of filepaths/urls.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+        criteria_options: Options of the criteria that compare the features with each other,
+            e.g. {"duplicate_features": {"normalize": True}}.
+        check_structure: Also validate the structure of each file.
+        check_crs: Also flag a crs member, see `validate_structure`.
+        workers: The number of worker processes, by default the number of CPUs. With 1,
+            the files are validated one after another in this process.
+
+    Yields:
+        Per file, in the order they are done, e.g. {"path": "a.geojson", "structure": {...},
+        "geometries": {"invalid": {...}, ...}, "valid": False}, or with an "error" message
+        for a file that is no readable GeoJSON, or whose worker process died. "valid" is
+        False for structure errors, invalid geometries and errors, problematic geometries
+        are still valid.
+    """
+    options: Dict[str, Any] = {
+        "check_structure": check_structure,
+        "check_crs": check_crs,
+        "criteria_invalid": criteria_invalid,
+        "criteria_problematic": criteria_problematic,
+        "criteria_options": criteria_options,
+    }
+    # Raises for unknown criteria on the call, not in the workers.
+    file_validator = _FileValidator(options)
+    return _validate_files(
+        expand_paths(paths_or_glob), file_validator, options, workers
+    )
+
+
+def _batches(sized_paths: List[Tuple[int, str]]) -> List[List[str]]:
+    """Groups the consecutive files into batches of at most _BATCH_FILES and _BATCH_BYTES."""
+    batches: List[List[str]] = []
+    batch_bytes = 0
+    for size, path in sized_paths:
+        if (
+            not batches
+            or len(batches[-1]) == _BATCH_FILES
+            or batch_bytes + size > _BATCH_BYTES
+        ):
+            batches.append([])
+            batch_bytes = 0
+        batches[-1].append(path)
+        batch_bytes += size
+    return batches
+
+
+def _validate_files(
+    paths: List[str],
+    file_validator: _FileValidator,
+    options: Dict[str, Any],
+    workers: Optional[int],
+) -> Iterator[Dict[str, Any]]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        for path in sorted(paths, key=_size, reverse=True):
+            yield file_validator.validate(path)
+        return
+
+    with worker_pool(options, workers) as executor:
+        yield from submit_files(executor, paths)
@@ -0,0 +1,277 @@
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
+from array import array
+from hashlib import blake2b
+from pathlib import Path
+import struct
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from .geometry_utils import to_shapely_or_none
+
+# Criteria that compare the features of a collection with each other. Each is an
+# accumulator: the features are added one by one with their index, and the result is
+# taken at the end. Accumulators of different parts of a collection can be merged, so the
+# criteria also work when the features are validated in chunks or in parallel.
+
+
+class CrossFeatureCheck(Protocol):
+    def add(self, index: int, geometry: dict) -> None: ...
+
+    def merge(self, other: Any) -> None: ...
+
+    def result(self) -> List[Any]: ...
+
+
+_RECORD = struct.Struct("<16sq")  # geometry digest, feature index
+_SPILL_BYTES = 1 << 20
+
+
+def _canonical(value: Any) -> Any:
+    """Nested coordinates with every number as float, so e.g. 1 and 1.0 hash the same."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) + 0.0  # + 0.0 turns -0.0 into 0.0
+    return value
+
+
+def _normalized_ring(ring: tuple) -> tuple:
+    """The ring without its closing position, from the smallest position, in the smaller direction."""
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring = ring[:-1]
+    if not ring:
+        return ring
+    start = min(ring)
+    candidates = []
+    for direction in (ring, ring[::-1]):
+        for i, position in enumerate(direction):
+            if position == start:
+                candidates.append(direction[i:] + direction[:i])
+    return min(candidates)
+
+
+def _normalized(geometry_type: Optional[str], coordinates: tuple) -> tuple:
+    if geometry_type == "Polygon":
+        return tuple(_normalized_ring(ring) for ring in coordinates)
+    if geometry_type == "MultiPolygon":
+        return tuple(_normalized("Polygon", polygon) for polygon in coordinates)
+    if geometry_type == "LineString":
+        return min(coordinates, coordinates[::-1])
+    if geometry_type == "MultiLineString":
+        return tuple(_normalized("LineString", line) for line in coordinates)
+    return coordinates
+
+
+def geometry_digest(geometry: dict, normalize: bool = False) -> bytes:
+    """
+    A 16 byte hash of the geometry's type and coordinates, equal for identical geometries.
+
+    Args:
+        geometry: A GeoJSON geometry dict.
+        normalize: Ignore the start position and orientation of the rings (and lines).
+    """
+    geometry_type = geometry.get("type")
+    if geometry_type == "GeometryCollection":
+        key: Any = tuple(
+            geometry_digest(g, normalize) if isinstance(g, dict) else g
+            for g in geometry.get("geometries") or ()
+        )
+    else:
+        key = _canonical(geometry.get("coordinates"))
+        if normalize and isinstance(key, tuple):
+            key = _normalized(geometry_type, key)
+    return blake2b(repr((geometry_type, key)).encode(), digest_size=16).digest()
+
+
+class DuplicateFeatures:
+    """
+    Finds the features with identical geometries, in a single pass over their digests.
+
+    The result groups the indices of the features that share a geometry, e.g. [[0, 3], [5, 7, 9]].
+    """
+
+    def __init__(self, normalize: bool = False, partitions: int = 1):
+        """
+        Args:
+            normalize: Also count geometries as duplicates if their rings only differ in
+                start position or orientation.
+            partitions: If above 1, the digests are not kept in memory but spilled to this
+                many temporary files by hash, which are grouped one at a time. Bounds the
+                memory to that of the largest partition, for very large collections.
+                A pickled accumulator contains its records, each unpickled copy spills
+                them to temporary files of its own.
+        """
+        if partitions < 1:
+            raise ValueError("`partitions` must be at least 1")
+        self.normalize = normalize
+        self.partitions = partitions
+        self._first_index: Dict[bytes, int] = {}
+        self._groups: Dict[bytes, List[int]] = {}
+        self._buffers: Dict[int, bytearray] = {}
+        self._spill_dir: Optional[Path] = None
+        self._cleanup: Optional[weakref.finalize] = None
+        if partitions > 1:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="geojson_validator_"))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+
+    def add(self, index: int, geometry: dict) -> None:
+        self._add_digest(geometry_digest(geometry, self.normalize), index)
+
+    def merge(self, other: "DuplicateFeatures") -> None:
+        """Adds the features of another accumulator, of a different part of the collection."""
+        for digest, index in other._records():
+            self._add_digest(digest, index)
+
+    def result(self) -> List[List[int]]:
+        if self._spill_dir is None:
+            groups = list(self._groups.values())
+        else:
+            groups = []
+            for partition in range(self.partitions):
+                first_index: Dict[bytes, int] = {}
+                partition_groups: Dict[bytes, List[int]] = {}
+                for digest, index in self._read_partition(partition):
+                    _group(first_index, partition_groups, digest, index)
+                groups.extend(partition_groups.values())
+        return sorted(sorted(group) for group in groups)
+
+    def _add_digest(self, digest: bytes, index: int) -> None:
+        if self._spill_dir is None:
+            _group(self._first_index, self._groups, digest, index)
+            return
+        partition = digest[0] % self.partitions
+        buffer = self._buffers.setdefault(partition, bytearray())
+        buffer += _RECORD.pack(digest, index)
+        if len(buffer) >= _SPILL_BYTES:
+            self._flush(partition)
+
+    def _flush(self, partition: int) -> None:
+        assert self._spill_dir is not None
+        with (self._spill_dir / f"{partition}.bin").open("ab") as f:
+            f.write(self._buffers.pop(partition, b""))
+
+    def _read_partition(self, partition: int) -> Iterator[Tuple[bytes, int]]:
+        assert self._spill_dir is not None
+        self._flush(partition)
+        yield from _RECORD.iter_unpack(
+            (self._spill_dir / f"{partition}.bin").read_bytes()
+        )
+
+    def _partition_bytes(self, partition: int) -> bytes:
+        """The spilled and the buffered records of the partition, without flushing."""
+        assert self._spill_dir is not None
+        path = self._spill_dir / f"{partition}.bin"
+        spilled = path.read_bytes() if path.exists() else b""
+        return spilled + self._buffers.get(partition, b"")
+
+    def _records(self) -> Iterator[Tuple[bytes, int]]:
+        if self._spill_dir is None:
+            for digest, first in self._first_index.items():
+                yield digest, first
+                for index in self._groups.get(digest, [])[1:]:
+                    yield digest, index
+        else:
+            for partition in range(self.partitions):
+                yield from self._read_partition(partition)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {**self.__dict__, "_spill_dir": None, "_cleanup": None}
+        if self._spill_dir is not None:
+            # The records themselves, the files are local to this process and machine.
+            state["_buffers"] = {
+                partition: bytearray(self._partition_bytes(partition))
+                for partition in range(self.partitions)
+            }
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self.partitions > 1:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="geojson_validator_"))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+            for partition in list(self._buffers):
+                self._flush(partition)
+
+
+def _group(
+    first_index: Dict[bytes, int],
+    groups: Dict[bytes, List[int]],
+    digest: bytes,
+    index: int,
+) -> None:
+    """Records the feature index under its digest, starting a group on the first repeat."""
+    first = first_index.setdefault(digest, index)
+    if first != index:
+        groups.setdefault(digest, [first]).append(index)
+
+
+class OverlappingFeatures:
+    """
+    Finds the pairs of polygon features whose areas overlap, e.g. parcels that should tile.
+
+    Uses a bulk query of an STRtree over all polygons, instead of comparing each pair. Polygons
+    that only touch at their boundaries do not overlap, one polygon within another does. The
+    result lists the index pairs, e.g. [[0, 3], [2, 5]].
+    """
+
+    def __init__(self, min_overlap_area: float = 0.0):
+        """
+        Args:
+            min_overlap_area: Only report pairs whose overlap has a larger area, in the
+                squared units of the coordinates (degrees). Ignores e.g. slivers from
+                imprecise shared borders.
+        """
+        if min_overlap_area < 0:
+            raise ValueError("`min_overlap_area` must not be negative")
+        self.min_overlap_area = min_overlap_area
+        self._indices = array("q")
+        self._geoms: List[BaseGeometry] = []
+
+    def add(self, index: int, geometry: dict) -> None:
+        if geometry.get("type") not in ("Polygon", "MultiPolygon"):
+            return
+        geom = to_shapely_or_none(geometry)
+        if geom is not None and not geom.is_empty:
+            self._indices.append(index)
+            self._geoms.append(geom)
+
+    def merge(self, other: "OverlappingFeatures") -> None:
+        """Adds the features of another accumulator, of a different part of the collection."""
+        self._indices.extend(other._indices)
+        self._geoms.extend(other._geoms)
+
+    def result(self) -> List[List[int]]:
+        if len(self._geoms) < 2:
+            return []
+        geoms = np.array(self._geoms, dtype=object)
+        tree = shapely.STRtree(geoms)
+        # overlaps excludes a polygon fully within the other, contains finds those.
+        pairs = np.concatenate(
+            [
+                tree.query(geoms, predicate="overlaps"),
+                tree.query(geoms, predicate="contains"),
+            ],
+            axis=1,
+        )
+        pairs = np.unique(np.sort(pairs, axis=0), axis=1)
+        pairs = pairs[:, pairs[0] != pairs[1]]
+        if self.min_overlap_area > 0 and pairs.size:
+            areas = _overlap_areas(geoms[pairs[0]], geoms[pairs[1]])
+            pairs = pairs[:, areas > self.min_overlap_area]
+        indices = np.asarray(self._indices)[pairs]
+        return sorted(sorted(pair) for pair in indices.T.tolist())
+
+
+def _overlap_areas(geoms: np.ndarray, others: np.ndarray) -> np.ndarray:
+    try:
+        return shapely.area(shapely.intersection(geoms, others))
+    except shapely.errors.GEOSException:
+        # An invalid (e.g. self-intersecting) polygon can make the overlay fail.
+        return shapely.area(
+            shapely.intersection(shapely.make_valid(geoms), shapely.make_valid(others))
+        )
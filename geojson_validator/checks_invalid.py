@@ -1,6 +1,9 @@
-from shapely.geometry import Polygon
-
-from .geometry_utils import coordinate_arrays
+from .geometry_utils import (
+    closed_ring_arrays,
+    coordinate_arrays,
+    ring_is_ccw,
+    to_shapely_or_none,
+)
 
 
 def check_unclosed(geometry: dict) -> bool:
@@ -14,11 +17,21 @@ def check_less_three_unique_nodes(geometry: dict) -> bool:
     return any(len(set(map(tuple, ring))) < 3 for ring in coordinate_arrays(geometry))
 
 
-def check_exterior_not_ccw(geom: Polygon) -> bool:
+def check_exterior_not_ccw(geometry: dict) -> bool:
     """Return True if the exterior ring is not counter-clockwise."""
-    return not geom.exterior.is_ccw
+    # The orientation of the raw rings, no need to build a shapely geometry.
+    rings = closed_ring_arrays(geometry)
+    if rings is None:  # e.g. an unclosed ring, which shapely closes
+        geom = to_shapely_or_none(geometry)
+        # Skipped like the other shapely checks if shapely cannot parse the geometry.
+        return geom is not None and not geom.exterior.is_ccw
+    return not ring_is_ccw(rings[0])
 
 
-def check_interior_not_cw(geom: Polygon) -> bool:
+def check_interior_not_cw(geometry: dict) -> bool:
     """Return True if any interior ring is counter-clockwise."""
-    return any(interior.is_ccw for interior in geom.interiors)
+    rings = closed_ring_arrays(geometry)
+    if rings is None:
+        geom = to_shapely_or_none(geometry)
+        return geom is not None and any(interior.is_ccw for interior in geom.interiors)
+    return any(ring_is_ccw(interior) for interior in rings[1:])
@@ -1,37 +1,77 @@
+from typing import Union
+
+import numpy as np
+import shapely
 from shapely.geometry import Polygon
-from shapely.validation import explain_validity
 
-from .geometry_utils import coordinate_arrays
+from .geometry_utils import (
+    closed_ring_arrays,
+    coordinate_arrays,
+    is_convex_ring,
+    to_shapely_or_none,
+)
 
 
-def check_holes(geom: Polygon) -> bool:
+def check_holes(geometry: dict) -> bool:
     """Return True if the geometry has holes (interior rings)."""
-    return len(geom.interiors) > 0
+    rings = closed_ring_arrays(geometry)
+    if rings is None:
+        # Skipped like the other shapely checks if shapely cannot parse the geometry.
+        geom = to_shapely_or_none(geometry)
+        return geom is not None and len(geom.interiors) > 0
+    return len(rings) > 1
+
+
+def is_trivially_simple(geometry: dict) -> bool:
+    """
+    Return True if the Polygon geometry dict can be proven not to self-intersect without
+    GEOS: a single convex ring, e.g. a triangle or a rectangle. False means unknown.
+    """
+    try:
+        rings = coordinate_arrays(geometry)
+        return len(rings) == 1 and is_convex_ring(rings[0])
+    # e.g. non-numeric or empty positions, left to the shapely parsing.
+    except (TypeError, ValueError, KeyError):
+        return False
 
 
-def check_self_intersection(geom: Polygon) -> bool:
-    """Return True if the geometry is self-intersecting."""
-    # TODO: Shapely independent?
-    self_intersection = False
-    if not geom.is_valid:
-        self_intersection = "Self-intersection" in explain_validity(geom)
-    return self_intersection
+def check_self_intersection(geom: Union[Polygon, str]) -> bool:
+    """
+    Return True if the geometry is self-intersecting. Takes the shapely geometry, or its
+    GEOS validity reason (`shapely.is_valid_reason`), which the validation computes only
+    once per geometry.
+    """
+    validity_reason = geom if isinstance(geom, str) else shapely.is_valid_reason(geom)
+    return "Self-intersection" in validity_reason
 
 
 def check_inner_and_exterior_ring_intersect(geom: Polygon) -> bool:
     """Return True if any interior ring intersects the exterior ring in more than a single touching point."""
-    if not geom.interiors:
+    num_interiors = shapely.get_num_interior_rings(geom)
+    if not num_interiors:
         return False
+    exterior = geom.exterior
+    interiors = shapely.get_interior_ring(geom, np.arange(num_interiors))
+    # A hole touching at a single point but lying outside the shell is not acceptable.
+    shell = Polygon(exterior)
+    shapely.prepare(shell)
+    if not shapely.covers(shell, interiors).all():
+        return True
     # Rings touching at a single point are allowed, line overlaps and crossings are not.
-    shell = Polygon(geom.exterior)
-    for interior in geom.interiors:
-        intersection = geom.exterior.intersection(interior)
-        if not intersection.is_empty and intersection.geom_type != "Point":
-            return True
-        # A hole touching at a single point but lying outside the shell is not acceptable.
-        if not shell.covers(interior):
-            return True
-    return False
+    # Only the holes whose envelope touches that of an exterior segment can intersect
+    # the exterior at all, which for a polygon with many holes is usually a small share.
+    coords = shapely.get_coordinates(exterior)
+    segments = shapely.linestrings(np.stack([coords[:-1], coords[1:]], axis=1))
+    candidates = np.unique(shapely.STRtree(segments).query(interiors)[0])
+    if candidates.size == 0:
+        return False
+    intersections = shapely.intersection(exterior, interiors[candidates])
+    return bool(
+        np.any(
+            ~shapely.is_empty(intersections)
+            & (shapely.get_type_id(intersections) != shapely.GeometryType.POINT)
+        )
+    )
 
 
 def check_duplicate_nodes(geometry: dict) -> bool:
@@ -0,0 +1,176 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import argparse
+import json
+import sys
+
+from .archive import geojson_report, report_is_valid, validate_archive
+from .batch import validate_files
+from .geometry_validation import INVALID_CRITERIA, PROBLEMATIC_CRITERIA
+from .main import configure_logging
+from .server import ValidationServer
+from .sources import open_geojson_source
+
+
+def _criteria(value: str) -> List[str]:
+    return [criterium for criterium in value.split(",") if criterium]
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="geojson-validator",
+        description="Validate the structure and geometries of GeoJSON files, urls and zip "
+        "archives of GeoJSON files. Prints a json report per input. Exits with 1 if any "
+        "input has structure errors or invalid geometries.",
+    )
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        help="GeoJSON filepaths or urls, also compressed (e.g. data.geojson.gz), or zip "
+        "archives of GeoJSON files",
+    )
+    parser.add_argument(
+        "--criteria-invalid",
+        type=_criteria,
+        default=list(INVALID_CRITERIA),
+        help="Comma separated invalid criteria, by default all",
+    )
+    parser.add_argument(
+        "--criteria-problematic",
+        type=_criteria,
+        default=list(PROBLEMATIC_CRITERIA),
+        help="Comma separated problematic criteria, by default all",
+    )
+    parser.add_argument(
+        "--no-structure",
+        action="store_true",
+        help="Only validate the geometries, not the structure",
+    )
+    parser.add_argument(
+        "--check-crs", action="store_true", help="Also flag a crs member"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes validating the members of a zip archive, or with --jsonl "
+        "the files, or with --serve the requests, in parallel, 0 for the number of CPUs",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Validate many files, largest first, and print the report of each file as one "
+        "json line as soon as it is done. Sources can also be directories and quoted glob "
+        "patterns, e.g. 'data/**/*.geojson'",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help="Instead of validating sources, run a validation server on host:port or a "
+        "unix socket path, with a warm pool of --workers processes, see ValidationServer",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=64,
+        help="With --serve, the validation requests handled at once, further requests are "
+        "rejected with 503",
+    )
+    parser.add_argument(
+        "--max-body-bytes",
+        type=int,
+        default=256 * 2**20,
+        help="With --serve, the largest request body, larger requests are rejected with 413",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Do not log the results to stderr"
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the command line interface, returns the exit code."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.quiet:
+        configure_logging(enabled=False)
+    options: Dict[str, Any] = {
+        "check_structure": not args.no_structure,
+        "check_crs": args.check_crs,
+        "criteria_invalid": args.criteria_invalid,
+        "criteria_problematic": args.criteria_problematic,
+        "criteria_options": None,
+    }
+    if not args.sources and not args.serve:
+        parser.error("Select at least one source, or --serve")
+    try:
+        if args.serve:
+            return _serve(args, options)
+        if args.jsonl:
+            return _print_jsonl(args, options)
+        report: Dict[str, Any] = {}
+        valid = True
+        for source in args.sources:
+            if source.lower().endswith(".zip"):
+                report[source] = validate_archive(
+                    source,
+                    args.criteria_invalid,
+                    args.criteria_problematic,
+                    check_structure=options["check_structure"],
+                    check_crs=options["check_crs"],
+                    workers=args.workers or None,
+                )
+                valid &= all(map(report_is_valid, report[source].values()))
+            else:
+                with open_geojson_source(source) as f:
+                    report[source] = geojson_report(json.load(f), options)
+                valid &= report_is_valid(report[source])
+    except ValueError as error:
+        # E.g. an unknown criterium, or a source that is no (Geo)JSON.
+        parser.error(str(error))
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if valid else 1
+
+
+def _print_jsonl(args: argparse.Namespace, options: Dict[str, Any]) -> int:
+    if any(source.lower().endswith(".zip") for source in args.sources):
+        raise ValueError("--jsonl does not support zip archives")
+    valid = True
+    for report in validate_files(
+        args.sources,
+        args.criteria_invalid,
+        args.criteria_problematic,
+        check_structure=options["check_structure"],
+        check_crs=options["check_crs"],
+        workers=args.workers or None,
+    ):
+        valid &= report["valid"]
+        sys.stdout.write(json.dumps(report) + "\n")
+        sys.stdout.flush()
+    return 0 if valid else 1
+
+
+def _serve(args: argparse.Namespace, options: Dict[str, Any]) -> int:
+    host, _, port = args.serve.rpartition(":")
+    address: Union[Tuple[str, int], str] = (
+        (host, int(port)) if host and port.isdigit() else args.serve
+    )
+    with ValidationServer(
+        address,
+        options["criteria_invalid"],
+        options["criteria_problematic"],
+        check_structure=options["check_structure"],
+        check_crs=options["check_crs"],
+        workers=args.workers or None,
+        max_pending=args.max_pending,
+        max_body_bytes=args.max_body_bytes,
+    ) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
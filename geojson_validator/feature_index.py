@@ -0,0 +1,261 @@
+from typing import Any, Iterable, List, Optional, Tuple, Union
+from array import array
+from pathlib import Path
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+from loguru import logger
+
+from .geometry_utils import input_to_geojson, any_geojson_to_featurecollection
+
+# A json string (skipped as a whole, it can contain braces) or an object brace. Numbers,
+# e.g. the coordinates, and everything else are skipped by the regex engine.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]')
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_FEATURES_KEY = b'"features"'
+
+
+def _skip_whitespace(buffer: Any, pos: int) -> int:
+    match = _WHITESPACE.match(buffer, pos)
+    assert match is not None  # matches the empty string
+    return match.end()
+
+
+def _object_end(buffer: Any, start: int) -> int:
+    """The end position of the json object starting at `start`."""
+    depth = 0
+    pos = start
+    while True:
+        match = _TOKEN.search(buffer, pos)
+        if match is None:
+            raise ValueError(f"Unterminated object at byte {start}")
+        token = match.group()
+        if token == b"{":
+            depth += 1
+        elif token == b"}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+        pos = match.end()
+
+
+def _features_array_start(buffer: Any) -> int:
+    """The position after the opening bracket of the root object's "features" array."""
+    depth = 0
+    pos = 0
+    while True:
+        match = _TOKEN.search(buffer, pos)
+        if match is None:
+            raise ValueError('No "features" member found in the root object')
+        token = match.group()
+        pos = match.end()
+        if token == b"{":
+            depth += 1
+        elif token == b"}":
+            depth -= 1
+        elif depth == 1 and token == _FEATURES_KEY:
+            colon = _skip_whitespace(buffer, pos)
+            if buffer[colon : colon + 1] != b":":
+                continue  # a "features" value, not the key
+            bracket = _skip_whitespace(buffer, colon + 1)
+            if buffer[bracket : bracket + 1] != b"[":
+                raise ValueError('"features" member must be an array')
+            return bracket + 1
+
+
+def feature_byte_ranges(buffer: Any) -> Tuple[array, array]:
+    """
+    Finds the byte range of each feature of a FeatureCollection without parsing it.
+
+    Only tracks the json strings and object braces, so e.g. the coordinates are skipped at
+    the speed of the regex engine.
+
+    Args:
+        buffer: The raw bytes of a GeoJSON FeatureCollection, e.g. a memory-mapped file.
+
+    Returns:
+        The start and end positions of the features, in feature order.
+
+    Raises:
+        ValueError: If the features can not be split, e.g. a feature is not an object.
+    """
+    starts, ends = array("q"), array("q")
+    pos = _skip_whitespace(buffer, _features_array_start(buffer))
+    if buffer[pos : pos + 1] == b"]":
+        return starts, ends
+    while True:
+        if buffer[pos : pos + 1] != b"{":
+            raise ValueError(f"Feature at byte {pos} is not an object")
+        end = _object_end(buffer, pos)
+        starts.append(pos)
+        ends.append(end)
+        pos = _skip_whitespace(buffer, end)
+        separator = buffer[pos : pos + 1]
+        if separator == b"]":
+            return starts, ends
+        if separator != b",":
+            raise ValueError(f"Expected ',' or ']' after the feature at byte {end}")
+        pos = _skip_whitespace(buffer, pos + 1)
+
+
+# Sidecar file header: format marker, size and modification time of the indexed file (to
+# detect a stale index), number of features. Followed by the start and the end positions.
+_HEADER = struct.Struct("<8sqqq")
+_MARKER = b"GJVIDX01"
+
+
+def index_path(filepath: Union[str, Path]) -> Path:
+    """The path of the sidecar index of a GeoJSON file, e.g. data.geojson.idx."""
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + ".idx")
+
+
+def _file_version(filepath: Path) -> Tuple[int, int]:
+    stat = filepath.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_feature_index(filepath: Union[str, Path], starts: array, ends: array) -> None:
+    """Writes the byte ranges of the features of a file to its sidecar index."""
+    filepath = Path(filepath)
+    size, mtime = _file_version(filepath)
+    positions = array("q", starts)
+    positions.extend(ends)
+    if sys.byteorder != "little":
+        positions.byteswap()
+    sidecar = index_path(filepath)
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(_MARKER, size, mtime, len(starts)))
+        f.write(positions.tobytes())
+    os.replace(tmp, sidecar)  # Readers never see a partially written index.
+
+
+def read_feature_index(filepath: Union[str, Path]) -> Optional[Tuple[array, array]]:
+    """The byte ranges of the features from the sidecar index, None if missing or stale."""
+    sidecar = index_path(filepath)
+    try:
+        data = sidecar.read_bytes()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    marker, size, mtime, count = _HEADER.unpack_from(data)
+    if marker != _MARKER or (size, mtime) != _file_version(Path(filepath)):
+        return None
+    positions = array("q")
+    positions.frombytes(data[_HEADER.size :])
+    if len(positions) != 2 * count:
+        return None
+    if sys.byteorder != "little":
+        positions.byteswap()
+    return positions[:count], positions[count:]
+
+
+class FeatureIndex:
+    """
+    Random access to the features of a large FeatureCollection file by their index.
+
+    Only the requested features are parsed, from the memory-mapped file. The byte range of
+    each feature is kept in a sidecar index file next to it, which is built on the first
+    open and rebuilt when the file changed.
+
+    Example:
+        with FeatureIndex.open("large.geojson") as index:
+            feature = index[1_000_000]
+    """
+
+    def __init__(self, filepath: Union[str, Path], starts: array, ends: array):
+        self.filepath = Path(filepath)
+        self._starts = starts
+        self._ends = ends
+        with self.filepath.open("rb") as f:
+            self._buffer: Optional[mmap.mmap] = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+    @classmethod
+    def open(cls, filepath: Union[str, Path], save: bool = True) -> "FeatureIndex":
+        """
+        Args:
+            filepath: Filepath to a GeoJSON FeatureCollection.
+            save: Write the sidecar index if it is missing or stale.
+
+        Raises:
+            ValueError: If the file is not a FeatureCollection that can be split by features.
+        """
+        ranges = read_feature_index(filepath)
+        if ranges is None:
+            with Path(filepath).open("rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    ranges = feature_byte_ranges(buffer)
+            if save:
+                try:
+                    write_feature_index(filepath, *ranges)
+                except OSError as error:
+                    logger.info(f"Could not write the feature index ({error}).")
+        return cls(filepath, *ranges)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def byte_range(self, index: int) -> Tuple[int, int]:
+        """The start and end position of the feature in the file."""
+        return self._starts[index], self._ends[index]
+
+    def __getitem__(self, index: int) -> Any:
+        if self._buffer is None:
+            raise ValueError("The feature index is closed")
+        start, end = self.byte_range(index)
+        return json.loads(self._buffer[start:end])
+
+    def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def __enter__(self) -> "FeatureIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def select_feature_geometries(
+    geojson_input: Union[dict, str, Path, Any], feature_indices: Iterable[int]
+) -> Tuple[List[Optional[dict]], List[int]]:
+    """
+    The geometries of only the selected features. A local FeatureCollection file is read
+    through its `FeatureIndex`, without parsing the other features.
+
+    Returns:
+        The geometries, and their sorted feature indices.
+    """
+    indices = sorted(set(feature_indices))
+    if isinstance(geojson_input, (str, Path)) and Path(geojson_input).is_file():
+        try:
+            index = FeatureIndex.open(geojson_input)
+        except ValueError as error:
+            logger.info(
+                f"File can not be indexed by features ({error}), reading it whole."
+            )
+        else:
+            with index:
+                _check_indices(indices, len(index))
+                return [index[i].get("geometry") for i in indices], indices
+    features = any_geojson_to_featurecollection(input_to_geojson(geojson_input))[
+        "features"
+    ]
+    _check_indices(indices, len(features))
+    return [features[i].get("geometry") for i in indices], indices
+
+
+def _check_indices(indices: List[int], count: int) -> None:
+    if indices and (indices[0] < 0 or indices[-1] >= count):
+        raise ValueError(
+            f"`feature_indices` must be between 0 and {count - 1}, the input has {count} features"
+        )
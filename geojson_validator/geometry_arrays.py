@@ -0,0 +1,417 @@
+from typing import Any, Callable, Dict, Sequence
+from functools import cached_property
+
+from loguru import logger
+import numpy as np
+import shapely
+
+from .checks_problematic import check_inner_and_exterior_ring_intersect
+from .geometry_utils import single_geometry_parts
+from .geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    CROSS_FEATURE_CRITERIA,
+    VALIDATION_CRITERIA,
+    check_criteria,
+)
+
+_TYPE_IDS = {
+    "Point": shapely.GeometryType.POINT,
+    "LineString": shapely.GeometryType.LINESTRING,
+    "Polygon": shapely.GeometryType.POLYGON,
+}
+
+
+class _Parts:
+    """
+    The single geometries of the rows, and their position arrays like `coordinate_arrays`:
+    the rings of a polygon, the positions of a line or a point.
+    """
+
+    def __init__(
+        self,
+        *,
+        rows: np.ndarray,
+        types: np.ndarray,
+        array_part: np.ndarray,
+        is_interior: np.ndarray,
+        coords: np.ndarray,
+        counts: np.ndarray,
+        has_z: np.ndarray,
+        build_parts: Callable[[], np.ndarray],
+    ):
+        """
+        Args:
+            rows: The row of each single geometry.
+            types: The shapely type id of each single geometry.
+            array_part: The single geometry of each position array.
+            is_interior: If the array is an interior ring.
+            coords: The positions of all arrays, shape (n, 3), z is 0 for 2D positions.
+            counts: The number of positions of each array.
+            has_z: If the positions of the array are 3D.
+            build_parts: Returns the shapely single geometries, only called for the GEOS
+                based checks.
+        """
+        self.rows = rows
+        self.types = types
+        self.array_part = array_part
+        self.is_interior = is_interior
+        # -0.0 compares like 0 in the json positions.
+        self.coords = coords + 0.0
+        self.counts = counts
+        self.has_z = has_z
+        self._build_parts = build_parts
+        self.coord_array = np.repeat(np.arange(len(counts)), counts)
+        self.ends = np.cumsum(counts)
+        self.starts = self.ends - counts
+
+    @classmethod
+    def from_geometries(cls, geoms: np.ndarray) -> "_Parts":
+        """The parts of an array of shapely geometries (or None)."""
+        parts, rows = single_geometry_parts(geoms)
+        types = shapely.get_type_id(parts)
+        polygons = np.flatnonzero(types == shapely.GeometryType.POLYGON)
+        others = np.flatnonzero(types != shapely.GeometryType.POLYGON)
+        rings, ring_polygon = shapely.get_rings(parts[polygons], return_index=True)
+        arrays = np.concatenate([rings, parts[others]])
+        # The rings of a polygon are in order, the exterior first.
+        is_interior = np.zeros(len(arrays), dtype=bool)
+        is_interior[1 : len(rings)] = ring_polygon[1:] == ring_polygon[:-1]
+        coords, coord_array = shapely.get_coordinates(
+            arrays, include_z=True, return_index=True
+        )
+        has_z = shapely.has_z(arrays)
+        # The missing z of a 2D position compares like in the json positions.
+        coords[~has_z[coord_array], 2] = 0.0
+        return cls(
+            rows=rows,
+            types=types,
+            array_part=np.concatenate([polygons[ring_polygon], others]),
+            is_interior=is_interior,
+            coords=coords,
+            counts=np.bincount(coord_array, minlength=len(arrays)),
+            has_z=has_z,
+            build_parts=lambda: parts,
+        )
+
+    @classmethod
+    def from_ragged(
+        cls, geometry_type: str, coords: np.ndarray, offsets: Sequence[np.ndarray]
+    ) -> "_Parts":
+        """
+        The parts of geometries of one type in the GeoArrow layout, like
+        `shapely.from_ragged_array` takes them, without building shapely geometries.
+
+        Args:
+            geometry_type: The GeoJSON geometry type, e.g. "MultiPolygon".
+            coords: The positions, shape (n, 2) or (n, 3).
+            offsets: The offset arrays from the innermost level, each starting at 0, e.g.
+                the positions of each ring, the rings of each polygon and the polygons of
+                each row for a MultiPolygon.
+        """
+        single_type = geometry_type.replace("Multi", "")
+        offsets = [np.asarray(level, dtype=np.int64) for level in offsets]
+        # The offsets within a single geometry, and those of the parts of each row.
+        inner = offsets[:-1] if single_type != geometry_type else offsets
+        if single_type == "Point":
+            num_parts = len(coords)
+        else:
+            num_parts = len(inner[-1]) - 1
+        if single_type != geometry_type:
+            part_rows = np.diff(offsets[-1])
+        else:
+            part_rows = np.ones(num_parts, dtype=np.int64)
+
+        positions = np.zeros((len(coords), 3))
+        positions[:, : coords.shape[1]] = coords[:, :3]
+        if single_type == "Point":
+            # An empty point has NaN coordinates.
+            present = ~np.isnan(coords[:, :2]).all(axis=1)
+            positions = positions[present]
+            counts = present.astype(np.int64)
+            array_part = np.arange(num_parts)
+        elif single_type == "LineString":
+            counts = np.diff(inner[0])
+            array_part = np.arange(num_parts)
+        else:
+            counts = np.diff(inner[0])
+            array_part = np.repeat(np.arange(num_parts), np.diff(inner[1]))
+        is_interior = np.zeros(len(counts), dtype=bool)
+        if single_type == "Polygon":
+            is_interior = np.arange(len(counts)) != inner[1][array_part]
+
+        return cls(
+            rows=np.repeat(np.arange(len(part_rows)), part_rows),
+            types=np.full(num_parts, _TYPE_IDS[single_type]),
+            array_part=array_part,
+            is_interior=is_interior,
+            coords=positions,
+            counts=counts,
+            has_z=np.full(len(counts), coords.shape[1] > 2),
+            build_parts=lambda: shapely.from_ragged_array(
+                _TYPE_IDS[single_type],
+                np.ascontiguousarray(coords[:, :3], dtype=float),
+                inner or None,
+            ),
+        )
+
+    @cached_property
+    def parts(self) -> np.ndarray:
+        """The shapely single geometries."""
+        return self._build_parts()
+
+    def array_flags_to_parts(self, flags: np.ndarray) -> np.ndarray:
+        return np.bincount(self.array_part[flags], minlength=len(self.types)) > 0
+
+    def coord_flags_to_parts(self, flags: np.ndarray) -> np.ndarray:
+        array_flags = np.bincount(self.coord_array[flags], minlength=len(self.counts))
+        return self.array_flags_to_parts(array_flags > 0)
+
+    @cached_property
+    def unique_counts(self) -> np.ndarray:
+        """The number of unique positions of each array."""
+        order = np.lexsort((*self.coords.T[::-1], self.coord_array))
+        coords, arrays = self.coords[order], self.coord_array[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (arrays[1:] != arrays[:-1]) | np.any(
+            coords[1:] != coords[:-1], axis=1
+        )
+        return np.bincount(arrays[first], minlength=len(self.counts))
+
+    @cached_property
+    def is_closed(self) -> np.ndarray:
+        """If the first and the last position of each (non-empty) array are equal."""
+        closed = np.zeros(len(self.counts), dtype=bool)
+        filled = self.counts > 0
+        closed[filled] = np.all(
+            self.coords[self.starts[filled]] == self.coords[self.ends[filled] - 1],
+            axis=1,
+        )
+        return closed
+
+    @cached_property
+    def is_ccw(self) -> np.ndarray:
+        """
+        If each polygon ring is counter-clockwise, like `ring_is_ccw` by its highest vertex
+        in GEOS. A ring without area is not counter-clockwise.
+        """
+        is_ccw = np.zeros(len(self.counts), dtype=bool)
+        rings = (self.types[self.array_part] == shapely.GeometryType.POLYGON) & (
+            self.counts >= 4
+        )
+        in_rings = rings[self.coord_array]
+        is_ccw[rings] = shapely.is_ccw(
+            shapely.linearrings(
+                self.coords[in_rings, :2],
+                indices=np.repeat(np.arange(rings.sum()), self.counts[rings]),
+            )
+        )
+        return is_ccw
+
+
+def _unclosed(p: _Parts) -> np.ndarray:
+    return p.array_flags_to_parts((p.counts > 0) & ~p.is_closed)
+
+
+def _less_three_unique_nodes(p: _Parts) -> np.ndarray:
+    return p.array_flags_to_parts(p.unique_counts < 3)
+
+
+def _exterior_not_ccw(p: _Parts) -> np.ndarray:
+    # Like in GEOS, the empty exterior of an empty polygon is not counter-clockwise.
+    no_rings = np.bincount(p.array_part, minlength=len(p.types)) == 0
+    return p.array_flags_to_parts(~p.is_interior & ~p.is_ccw) | no_rings
+
+
+def _interior_not_cw(p: _Parts) -> np.ndarray:
+    return p.array_flags_to_parts(p.is_interior & p.is_ccw)
+
+
+def _holes(p: _Parts) -> np.ndarray:
+    return p.array_flags_to_parts(p.is_interior)
+
+
+def _inner_and_exterior_ring_intersect(p: _Parts) -> np.ndarray:
+    flags = np.zeros(len(p.types), dtype=bool)
+    for i in np.unique(p.array_part[p.is_interior]):
+        flags[i] = check_inner_and_exterior_ring_intersect(p.parts[i])
+    return flags
+
+
+def _self_intersection(p: _Parts) -> np.ndarray:
+    flags = np.zeros(len(p.types), dtype=bool)
+    polygons = np.flatnonzero(p.types == shapely.GeometryType.POLYGON)
+    reasons = shapely.is_valid_reason(p.parts[polygons])
+    flags[polygons] = ["Self-intersection" in reason for reason in reasons]
+    return flags
+
+
+def _duplicate_nodes(p: _Parts) -> np.ndarray:
+    unique = p.unique_counts
+    only_closing = p.is_closed & (unique == p.counts - 1)
+    return p.array_flags_to_parts((unique < p.counts) & ~only_closing)
+
+
+def _excessive_coordinate_precision(p: _Parts, precision: int = 6) -> np.ndarray:
+    values = p.coords
+    candidates = np.flatnonzero((np.round(values, precision) != values).any(axis=1))
+    # np.round scales by a power of ten, confirmed with the exact round of the checks.
+    # One confirmed position flags its geometry, so the first candidate of each geometry
+    # is confirmed, and the next one only for the geometries that are not flagged yet.
+    flags = np.zeros(len(p.types), dtype=bool)
+    candidate_parts = p.array_part[p.coord_array[candidates]]
+    while candidates.size:
+        _, first = np.unique(candidate_parts, return_index=True)
+        confirmed = [
+            any(round(value, precision) != value for value in values[i])
+            for i in candidates[first]
+        ]
+        flags[candidate_parts[first[confirmed]]] = True
+        left = ~flags[candidate_parts]
+        left[first] = False
+        candidates, candidate_parts = candidates[left], candidate_parts[left]
+    return flags
+
+
+def _excessive_vertices(p: _Parts) -> np.ndarray:
+    return np.bincount(p.array_part, weights=p.counts, minlength=len(p.types)) > 999
+
+
+def _3d_coordinates(p: _Parts) -> np.ndarray:
+    return p.array_flags_to_parts(p.has_z & (p.counts > 0))
+
+
+def _outside_lat_lon_boundaries(p: _Parts) -> np.ndarray:
+    lon, lat = p.coords[:, 0], p.coords[:, 1]
+    inside = (-180 <= lon) & (lon <= 180) & (-90 <= lat) & (lat <= 90)
+    return p.coord_flags_to_parts(~inside)
+
+
+def _crosses_antimeridian(p: _Parts) -> np.ndarray:
+    lon = (p.coords[:, 0] + 180) % 360 - 180
+    same_array = p.coord_array[1:] == p.coord_array[:-1]
+    flags = np.zeros(len(lon), dtype=bool)
+    flags[1:] = same_array & (np.abs(lon[1:] - lon[:-1]) > 180)
+    return p.coord_flags_to_parts(flags)
+
+
+# The vectorized counterpart of each criterium, flagging the single geometries.
+ARRAY_CHECKS: Dict[str, Callable[[_Parts], np.ndarray]] = {
+    "unclosed": _unclosed,
+    "less_three_unique_nodes": _less_three_unique_nodes,
+    "exterior_not_ccw": _exterior_not_ccw,
+    "interior_not_cw": _interior_not_cw,
+    "holes": _holes,
+    "inner_and_exterior_ring_intersect": _inner_and_exterior_ring_intersect,
+    "self_intersection": _self_intersection,
+    "duplicate_nodes": _duplicate_nodes,
+    "excessive_coordinate_precision": _excessive_coordinate_precision,
+    "excessive_vertices": _excessive_vertices,
+    "3d_coordinates": _3d_coordinates,
+    "outside_lat_lon_boundaries": _outside_lat_lon_boundaries,
+    "crosses_antimeridian": _crosses_antimeridian,
+}
+
+
+def _geometry_array(geometries: Any) -> np.ndarray:
+    """The shapely geometries of the input, None for a missing or unreadable geometry."""
+    # The active geometry column of a GeoDataFrame, a GeoSeries is its own.
+    array = np.array(getattr(geometries, "geometry", geometries), dtype=object)
+    if array.ndim != 1:
+        raise ValueError("Input must be a one-dimensional array of geometries")
+    present = [value for value in array if value is not None]
+    if shapely.is_geometry(present).all():
+        return array
+    if all(isinstance(value, (bytes, bytearray)) for value in present):
+        return shapely.from_wkb(array, on_invalid="ignore")
+    raise ValueError(
+        "Input must be an array of shapely geometries, a GeoSeries/GeoDataFrame or an "
+        "array of WKB bytes"
+    )
+
+
+def _check_array_criteria(
+    criteria_invalid: Sequence[str], criteria_problematic: Sequence[str]
+) -> None:
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    cross_feature = set(criteria_problematic or []) & set(CROSS_FEATURE_CRITERIA)
+    if cross_feature:
+        raise ValueError(
+            f"The criteria {sorted(cross_feature)} compare the features with each other and "
+            f"are not supported here, use `validate_geometries`"
+        )
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(criteria_problematic, PROBLEMATIC_CRITERIA, name="problematic")
+
+
+def _flag_parts(parts: _Parts, criteria_type: str, criterium: str) -> np.ndarray:
+    """If each single geometry violates the criterium, False for the irrelevant types."""
+    relevant = [
+        _TYPE_IDS[geometry_type]
+        for geometry_type in VALIDATION_CRITERIA[criteria_type][criterium].relevant
+    ]
+    return ARRAY_CHECKS[criterium](parts) & np.isin(parts.types, relevant)
+
+
+def _flag_rows(
+    parts: _Parts,
+    skipped: np.ndarray,
+    criteria_invalid: Sequence[str],
+    criteria_problematic: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """Per criterium if each row violates it, and "skipped_validation"."""
+    results: Dict[str, np.ndarray] = {}
+    for criteria_type, selected in (
+        ("invalid", criteria_invalid or []),
+        ("problematic", criteria_problematic or []),
+    ):
+        for criterium in selected:
+            flagged = _flag_parts(parts, criteria_type, criterium)
+            rows = np.bincount(parts.rows[flagged], minlength=len(skipped)) > 0
+            results[criterium] = rows & ~skipped
+    results["skipped_validation"] = skipped
+    return results
+
+
+def validate_geometry_array(
+    geometries: Any,
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+) -> Dict[str, np.ndarray]:
+    """
+    Validate many geometries at once without converting them to GeoJSON, e.g. a
+    GeoDataFrame. The criteria run vectorized over all geometries.
+
+    Like in `validate_geometries`, a multi-geometry or collection is flagged if any of its
+    single geometries is. The rings of shapely geometries are always closed, so
+    "unclosed" can only be found in GeoJSON.
+
+    Args:
+        geometries: A NumPy array or list of shapely geometries, a GeoSeries/GeoDataFrame,
+            or an array of WKB bytes.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            The criteria that compare the features with each other are not supported.
+
+    Returns:
+        Per selected criterium a boolean array with a value per row, True where the
+        geometry violates it, and "skipped_validation" for the missing or unreadable
+        geometries. E.g. `pd.DataFrame(results, index=gdf.index)` gives the columns.
+    """
+    _check_array_criteria(criteria_invalid, criteria_problematic)
+    geoms = _geometry_array(geometries)
+    # A LinearRing is no GeoJSON geometry type, like in validate_geometries it is skipped.
+    skipped = shapely.is_missing(geoms) | (
+        shapely.get_type_id(geoms) == shapely.GeometryType.LINEARRING
+    )
+    geoms[skipped] = None
+    results = _flag_rows(
+        _Parts.from_geometries(geoms), skipped, criteria_invalid, criteria_problematic
+    )
+    logger.info(
+        f"Validation results: { {name: int(flags.sum()) for name, flags in results.items()} }"
+    )
+    return results
@@ -1,12 +1,14 @@
-from typing import Any, List, Optional, Union
-from urllib.parse import urlparse
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import json
 
+import numpy as np
+import shapely
 from shapely.geometry import shape
 from shapely.geometry.base import BaseGeometry
 from shapely.errors import ShapelyError
-import requests
+from .packed_json import load_packed
+from .sources import open_geojson_source
 
 ALL_ACCEPTED_GEOMETRY_TYPES = [
     POINT,
@@ -27,27 +29,35 @@ ALL_ACCEPTED_GEOMETRY_TYPES = [
 ]
 
 
-def read_geojson_file_or_url(fp_or_url: Union[str, Path]) -> dict:
-    """Reads a geojson source from a filepath or url"""
-    parsed_url = urlparse(str(fp_or_url))
-    is_url = parsed_url.scheme in ("http", "https", "ftp", "ftps")
-    # For urls the suffix must come from the path only, a query string would be part of it.
-    suffix = Path(parsed_url.path if is_url else fp_or_url).suffix
-    if suffix.lower() not in (".json", ".geojson"):
-        raise ValueError("Filepath or URL must be a geojson or json file")
-    if is_url:
-        response = requests.get(str(fp_or_url), timeout=5)
-        response.raise_for_status()  # raise a clear HTTP error instead of falling through to a file open
-        return response.json()
-
-    with Path(fp_or_url).open(encoding="UTF-8") as f:
+def read_geojson_file_or_url(
+    fp_or_url: Union[str, Path], packed_coordinates: bool = False
+) -> dict:
+    """
+    Reads a geojson source from a filepath or url
+
+    Args:
+        fp_or_url: Filepath or url to a (Geo)JSON, optionally compressed with gzip, bz2,
+            xz or zstd, e.g. data.geojson.gz.
+        packed_coordinates: Decode the coordinates into compact arrays (`PackedGeometry`).
+    """
+    with open_geojson_source(fp_or_url) as f:
+        if packed_coordinates:
+            return load_packed(f)
         return json.load(f)
 
 
-def input_to_geojson(geojson_input: Any) -> dict:
-    """Take the input which can be various types and reads/transforms it to Geojson"""
+def input_to_geojson(geojson_input: Any, packed_coordinates: bool = False) -> dict:
+    """
+    Take the input which can be various types and reads/transforms it to Geojson
+
+    Args:
+        geojson_input: Input GeoJSON, filepath/url to (Geo)JSON, or object with a __geo_interface__.
+        packed_coordinates: Decode the coordinates of a read file/url into compact arrays,
+            which take a fraction of the memory of nested lists of floats. The geometries
+            are then `PackedGeometry` mappings instead of dicts.
+    """
     if isinstance(geojson_input, (str, Path)):
-        return read_geojson_file_or_url(geojson_input)
+        return read_geojson_file_or_url(geojson_input, packed_coordinates)
     if hasattr(
         geojson_input, "__geo_interface__"
     ):  # e.g. shapely geometry object, geojson library objects
@@ -82,6 +92,38 @@ def any_geojson_to_featurecollection(geojson_input: dict) -> dict:
     return fc
 
 
+def geojson_geometries(geojson_input: dict) -> List[Optional[dict]]:
+    """
+    The geometry of every feature of a GeoJSON of any type, in feature order.
+
+    Equivalent to the geometries of `any_geojson_to_featurecollection`, without building
+    the FeatureCollection wrapper for a single Feature or Geometry.
+    """
+    type_ = geojson_input.get("type", None)
+    if type_ == "FeatureCollection":
+        # A missing geometry member is treated like an explicit null geometry.
+        return [feature.get("geometry") for feature in geojson_input["features"]]
+    if type_ == "Feature":
+        return [geojson_input.get("geometry")]
+    if type_ in ALL_ACCEPTED_GEOMETRY_TYPES:
+        return [geojson_input]
+    # Raises the matching error for a missing or unsupported type.
+    fc = any_geojson_to_featurecollection(geojson_input)
+    return [feature.get("geometry") for feature in fc["features"]]
+
+
+def iter_feature_geometries(features: Iterable[Any]) -> Iterator[Optional[Any]]:
+    """
+    Lazily the geometry of each Feature, e.g. from a streaming reader. A bare geometry is
+    taken as is, and anything else is passed on, to be reported as not validated.
+    """
+    for feature in features:
+        if isinstance(feature, dict) and feature.get("type") == "Feature":
+            yield feature.get("geometry")
+        else:
+            yield feature
+
+
 def extract_single_geometries(geometry: dict, geometry_type: str) -> List[dict]:
     if "Multi" in geometry_type:
         single_type = geometry_type.split("Multi")[1]
@@ -93,6 +135,25 @@ def extract_single_geometries(geometry: dict, geometry_type: str) -> List[dict]:
     return []
 
 
+def single_geometry_parts(geoms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The single geometries of an array of shapely geometries: the parts of the
+    multi-geometries and the members of the collections, also of nested ones.
+
+    Returns:
+        The single geometries, and the index of the geometry each belongs to.
+    """
+    parts = geoms
+    index = np.arange(len(geoms))
+    multi = shapely.get_type_id(parts) >= shapely.GeometryType.MULTIPOINT
+    while multi.any():
+        sub_parts, sub_index = shapely.get_parts(parts[multi], return_index=True)
+        parts = np.concatenate([parts[~multi], sub_parts])
+        index = np.concatenate([index[~multi], index[multi][sub_index]])
+        multi = shapely.get_type_id(parts) >= shapely.GeometryType.MULTIPOINT
+    return parts, index
+
+
 def coordinate_arrays(geometry: dict) -> list:
     """
     The position arrays of a single geometry, without modifying it:
@@ -106,6 +167,118 @@ def coordinate_arrays(geometry: dict) -> list:
     return geometry["coordinates"]
 
 
+def ring_xy(ring: Union[list, tuple]) -> np.ndarray:
+    """The x/y values of a ring's positions, as a float array of shape (n, 2)."""
+    if len(ring) == 0:
+        return np.empty((0, 2))
+    try:
+        try:
+            array = np.asarray(ring)
+        except ValueError:  # mixed 2D/3D positions
+            array = np.asarray([position[:2] for position in ring])
+    except ValueError as error:  # e.g. an empty position
+        raise TypeError(
+            "Ring positions must be arrays of at least two numbers"
+        ) from error
+    # Not converted with dtype=float, as that would silently accept numeric strings.
+    if array.dtype.kind not in "iuf" or array.ndim != 2 or array.shape[1] < 2:
+        raise TypeError("Ring positions must be arrays of at least two numbers")
+    return array[:, :2].astype(float)
+
+
+def closed_ring_arrays(geometry: dict) -> Optional[List[np.ndarray]]:
+    """
+    The x/y values of each ring of the Polygon geometry dict, if shapely parses the rings
+    unchanged: closed, with at least four finite positions of the same dimension. None
+    else, e.g. for an unclosed ring that shapely closes, or positions shapely rejects.
+    """
+    try:
+        rings = coordinate_arrays(geometry)
+        arrays = [np.asarray(ring) for ring in rings]
+    except (TypeError, ValueError, KeyError, AttributeError):
+        return None
+    if not arrays:
+        return None
+    for array in arrays:
+        if (
+            array.dtype.kind not in "iuf"
+            or array.ndim != 2
+            or array.shape[1] not in (2, 3)
+            or array.shape[1:] != arrays[0].shape[1:]
+            or len(array) < 4
+            or array[0].tolist() != array[-1].tolist()
+            or not np.isfinite(array).all()
+        ):
+            return None
+    return [array[:, :2].astype(float) for array in arrays]
+
+
+def ring_is_ccw(xy: np.ndarray) -> bool:
+    """
+    True if the closed ring of `closed_ring_arrays` is counter-clockwise, the same as
+    shapely's `LinearRing.is_ccw`. Like GEOS, the orientation is that of the highest
+    vertex, which is also defined for a self-intersecting ring. A ring without area is
+    not counter-clockwise.
+    """
+    y = xy[:, 1]
+    top = y.max()
+    # The last vertex at the top that is reached by a rising segment.
+    rising = np.flatnonzero((y[1:] == top) & (y[1:] > y[:-1]))
+    if rising.size == 0:  # A flat ring.
+        return False
+    up_high = int(rising[-1]) + 1
+    num_points = len(xy) - 1  # Without the closing position.
+    down_low = (up_high + 1) % num_points
+    while y[down_low] == top:
+        down_low = (down_low + 1) % num_points
+    down_high = down_low - 1 if down_low > 0 else num_points - 1
+    a, b, c, d = map(tuple, xy[[up_high - 1, up_high, down_low, down_high]].tolist())
+
+    if b != d:  # A flat top, its direction is the orientation.
+        return d[0] < b[0]
+    if a in (b, c) or c == b:
+        return False
+    det_left = (a[0] - c[0]) * (b[1] - c[1])
+    det_right = (a[1] - c[1]) * (b[0] - c[0])
+    det = det_left - det_right
+    # The error bound of the floating point determinant, as in GEOS. Within it, the exact
+    # orientation of GEOS decides.
+    if abs(det) < 1e-15 * (abs(det_left) + abs(det_right)) and det_left * det_right > 0:
+        return bool(shapely.is_ccw(shapely.linearrings(xy)))
+    return det > 0
+
+
+def is_convex_ring(ring: Union[list, tuple]) -> bool:
+    """
+    True if the raw ring is strictly convex, which also proves that it is simple. Repeated
+    consecutive positions are ignored, and an unclosed ring is treated as closed.
+    """
+    xy = ring_xy(ring)
+    xy = xy[np.any(xy != np.roll(xy, 1, axis=0), axis=1)]
+    if len(xy) < 3:
+        return False
+    edges = np.roll(xy, -1, axis=0) - xy
+    following = np.roll(edges, -1, axis=0)
+    cross = edges[:, 0] * following[:, 1] - edges[:, 1] * following[:, 0]
+    dot = edges[:, 0] * following[:, 0] + edges[:, 1] * following[:, 1]
+    # Nearly collinear vertices (e.g. a spike) are left to GEOS, instead of trusting the
+    # sign of a cross product that is within floating point error of zero.
+    tolerance = 1e-12 * np.hypot(*edges.T) * np.hypot(*following.T)
+    if not (np.all(cross > tolerance) or np.all(cross < -tolerance)):
+        return False
+    # Turning in one direction only, a ring that winds around more than once (e.g. a
+    # pentagram) crosses itself.
+    turning = np.arctan2(cross, dot).sum()
+    return bool(abs(abs(turning) - 2 * np.pi) < 1e-6)
+
+
+def has_no_interior_rings(geometry: dict) -> bool:
+    """True if the Polygon geometry dict has only an exterior ring."""
+    # Broken coordinates are left to the checks, which report them as before.
+    coordinates = geometry.get("coordinates")
+    return isinstance(coordinates, list) and len(coordinates) < 2
+
+
 def to_shapely_or_none(geometry: dict) -> Optional[BaseGeometry]:
     """Parses the geometry dict to shapely for the validation checks that require it."""
     # Some criteria require the original json geometry dict as shapely etc. autofixes (e.g. closes) geometries.
@@ -1,11 +1,36 @@
-from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
-from collections import Counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from dataclasses import dataclass, field
+from functools import partial
+import inspect
 
 from loguru import logger
+import shapely
 from shapely.geometry.base import BaseGeometry
 
-from . import checks_invalid, checks_problematic
+from . import checks_invalid, checks_problematic, checks_cross_feature
+from .checks_cross_feature import CrossFeatureCheck
+from .packed_json import PackedGeometry
+from .results import (
+    DictResults,
+    FeatureResult,
+    ResultsCollector,
+    SummaryResults,
+    ValidationResults,
+)
 from .geometry_utils import (
     ALL_ACCEPTED_GEOMETRY_TYPES,
     POINT,
@@ -13,6 +38,7 @@ from .geometry_utils import (
     POLYGON,
     to_shapely_or_none,
     extract_single_geometries,
+    has_no_interior_rings,
 )
 
 
@@ -25,39 +51,57 @@ class Check:
     # Checks that take a shapely geometry rather than the raw json geometry dict. The raw
     # dict is needed by the others because shapely silently repairs (e.g. closes) rings.
     needs_shapely: bool = field(default=False)
+    # Checks that take the GEOS validity reason of the shapely geometry (e.g. "Valid
+    # Geometry" or "Self-intersection[0 1]"), which is computed at most once per geometry.
+    needs_validity_reason: bool = field(default=False)
+    # Relative cost of running the check, used to order the checks cheapest-first.
+    cost: int = field(default=1)
+    # A cheap test on the raw json geometry dict that proves the check cannot flag it, so
+    # e.g. the shapely geometry is not built for a hole check on a polygon without holes.
+    skip_if: Optional[Callable[[dict], bool]] = field(default=None)
 
 
 VALIDATION_CRITERIA: Dict[str, Dict[str, Check]] = {
     "invalid": {
         "unclosed": Check(checks_invalid.check_unclosed, frozenset({POLYGON})),
         "less_three_unique_nodes": Check(
-            checks_invalid.check_less_three_unique_nodes, frozenset({POLYGON})
+            checks_invalid.check_less_three_unique_nodes, frozenset({POLYGON}), cost=3
         ),
         "exterior_not_ccw": Check(
-            checks_invalid.check_exterior_not_ccw, frozenset({POLYGON}), True
+            checks_invalid.check_exterior_not_ccw, frozenset({POLYGON}), cost=2
         ),
         "interior_not_cw": Check(
-            checks_invalid.check_interior_not_cw, frozenset({POLYGON}), True
+            checks_invalid.check_interior_not_cw, frozenset({POLYGON}), cost=2
         ),
     },
     "problematic": {
-        "holes": Check(checks_problematic.check_holes, frozenset({POLYGON}), True),
+        "holes": Check(checks_problematic.check_holes, frozenset({POLYGON})),
         # Valid by the GeoJSON specification, but invalid by the OGC Simple Features standard
         # which many tools follow.
         "inner_and_exterior_ring_intersect": Check(
             checks_problematic.check_inner_and_exterior_ring_intersect,
             frozenset({POLYGON}),
             True,
+            cost=5,
+            skip_if=has_no_interior_rings,
         ),
         "self_intersection": Check(
-            checks_problematic.check_self_intersection, frozenset({POLYGON}), True
+            checks_problematic.check_self_intersection,
+            frozenset({POLYGON}),
+            True,
+            needs_validity_reason=True,
+            cost=5,
+            skip_if=checks_problematic.is_trivially_simple,
         ),
         "duplicate_nodes": Check(
-            checks_problematic.check_duplicate_nodes, frozenset({LINESTRING, POLYGON})
+            checks_problematic.check_duplicate_nodes,
+            frozenset({LINESTRING, POLYGON}),
+            cost=3,
         ),
         "excessive_coordinate_precision": Check(
             checks_problematic.check_excessive_coordinate_precision,
             frozenset({POINT, LINESTRING, POLYGON}),
+            cost=3,
         ),
         "excessive_vertices": Check(
             checks_problematic.check_excessive_vertices,
@@ -66,22 +110,37 @@ VALIDATION_CRITERIA: Dict[str, Dict[str, Check]] = {
         "3d_coordinates": Check(
             checks_problematic.check_3d_coordinates,
             frozenset({POINT, LINESTRING, POLYGON}),
+            cost=2,
         ),
         "outside_lat_lon_boundaries": Check(
             checks_problematic.check_outside_lat_lon_boundaries,
             frozenset({POINT, LINESTRING, POLYGON}),
+            cost=2,
         ),
         "crosses_antimeridian": Check(
             checks_problematic.check_crosses_antimeridian,
             frozenset({LINESTRING, POLYGON}),
+            cost=3,
         ),
     },
 }
 
+# Problematic criteria that compare the features with each other, instead of checking each
+# geometry on its own. Opt-in, so not part of PROBLEMATIC_CRITERIA, as they keep state for
+# the whole collection. Configured with `criteria_options`, e.g.
+# {"duplicate_features": {"normalize": True}}.
+CROSS_FEATURE_CRITERIA: Dict[str, Callable[..., CrossFeatureCheck]] = {
+    "duplicate_features": checks_cross_feature.DuplicateFeatures,
+    "overlapping_features": checks_cross_feature.OverlappingFeatures,
+}
+
 INVALID_CRITERIA: Tuple[str, ...] = tuple(VALIDATION_CRITERIA["invalid"])
 PROBLEMATIC_CRITERIA: Tuple[str, ...] = tuple(VALIDATION_CRITERIA["problematic"])
+ALLOWED_PROBLEMATIC_CRITERIA: Tuple[str, ...] = PROBLEMATIC_CRITERIA + tuple(
+    CROSS_FEATURE_CRITERIA
+)
 
-SelectedChecks = List[Tuple[str, Check]]
+SelectedChecks = Tuple[Tuple[str, Check], ...]
 
 
 def check_criteria(
@@ -100,92 +159,300 @@ def check_criteria(
         logger.info(f"Criteria '{name}': {selected_criteria}")
 
 
-def _select(criteria_type: str, selected_criteria: Sequence[str]) -> SelectedChecks:
-    """Resolves criteria names to their checks once, keeping the caller's order."""
-    return [
-        (name, VALIDATION_CRITERIA[criteria_type][name]) for name in selected_criteria
+def check_criteria_options(
+    criteria_options: Optional[Dict[str, Dict[str, Any]]],
+    selected_criteria: Sequence[str],
+) -> None:
+    """Checks that the options are for selected cross-feature criteria, and fit their arguments."""
+    for criterium, options in (criteria_options or {}).items():
+        if criterium not in CROSS_FEATURE_CRITERIA:
+            raise ValueError(
+                f"Options are only supported for the criteria {list(CROSS_FEATURE_CRITERIA)}, "
+                f"not {criterium}"
+            )
+        if criterium not in (selected_criteria or []):
+            raise ValueError(
+                f"Options given for {criterium}, but it is not a selected criterium"
+            )
+        try:
+            inspect.signature(CROSS_FEATURE_CRITERIA[criterium]).bind(**options)
+        except TypeError as error:
+            raise ValueError(f"Invalid options for {criterium}: {error}") from error
+
+
+def _select(
+    criteria_type: str, selected_criteria: Sequence[str], order_by_cost: bool = False
+) -> SelectedChecks:
+    """
+    Resolves criteria names to their checks once, in the caller's order, or with
+    `order_by_cost` the raw json checks first and then by cost.
+    """
+    selected = [
+        (name, VALIDATION_CRITERIA[criteria_type][name])
+        for name in selected_criteria
+        if name in VALIDATION_CRITERIA[criteria_type]
     ]
+    if order_by_cost:
+        # The raw json checks first, so a shapely check can often be skipped entirely.
+        selected.sort(key=lambda item: (item[1].needs_shapely, item[1].cost))
+    return tuple(selected)
 
 
-def _apply_checks(
-    selected: SelectedChecks,
-    geometry: dict,
-    shapely_geom: Optional[BaseGeometry],
-    geometry_type: str,
-) -> List[str]:
-    """The names of the criteria that flag this single geometry."""
-    flagged = []
-    for name, check in selected:
-        if geometry_type not in check.relevant:
-            continue
+@dataclass(frozen=True)
+class ValidationPlan:
+    """
+    A criteria selection resolved to its checks. Immutable, so a plan compiled once can
+    be shared between calls and threads.
+    """
+
+    invalid: SelectedChecks
+    problematic: SelectedChecks
+    # Stop checking a geometry once it violates an invalid criterium. The results then
+    # only list the first violated invalid criterium, and no problematic ones, per geometry.
+    stop_on_first_invalid: bool = field(default=False)
+    # Each selected cross-feature criterium, with a factory for a fresh accumulator.
+    cross_feature: Tuple[Tuple[str, Callable[[], CrossFeatureCheck]], ...] = field(
+        default=()
+    )
+
+
+def compile_plan(
+    criteria_invalid: Sequence[str],
+    criteria_problematic: Sequence[str],
+    order_by_cost: bool = False,
+    stop_on_first_invalid: bool = False,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> ValidationPlan:
+    """
+    Resolves the selected criteria names (already checked) to a `ValidationPlan`.
+
+    Args:
+        criteria_invalid: The selected invalid criteria.
+        criteria_problematic: The selected problematic criteria.
+        order_by_cost: Run the checks cheapest-first instead of in the given order, always
+            the invalid before the problematic criteria. Only the order of the criteria in
+            the results changes.
+        stop_on_first_invalid: Stop checking a geometry once it violates an invalid criterium.
+        criteria_options: The options (already checked) of the cross-feature criteria.
+    """
+    criteria_options = criteria_options or {}
+    return ValidationPlan(
+        _select("invalid", criteria_invalid or [], order_by_cost),
+        _select("problematic", criteria_problematic or [], order_by_cost),
+        stop_on_first_invalid,
+        tuple(
+            (
+                name,
+                partial(CROSS_FEATURE_CRITERIA[name], **criteria_options.get(name, {})),
+            )
+            for name in criteria_problematic or []
+            if name in CROSS_FEATURE_CRITERIA
+        ),
+    )
+
+
+def needs_raw_geometry(plan: ValidationPlan) -> bool:
+    """True if a selected check takes the raw json geometry dict, not only shapely."""
+    return any(
+        not (check.needs_shapely or check.needs_validity_reason)
+        for _, check in plan.invalid + plan.problematic
+    )
+
+
+class GeosGeometry(NamedTuple):
+    """A geometry that is already parsed by GEOS, e.g. in bulk from the json text of a file."""
+
+    geometry_type: str
+    shapely_geom: BaseGeometry
+    # The json geometry dict, None if no selected check needs the raw coordinates.
+    geometry: Optional[dict]
+
+    def parts(self) -> List["GeosGeometry"]:
+        """The single geometries of a multi-geometry, or the members of a collection."""
+        parts = shapely.get_parts(self.shapely_geom)
+        if self.geometry is None:
+            raw_parts: Sequence[Optional[dict]] = [None] * len(parts)
+        else:
+            raw_parts = extract_single_geometries(self.geometry, self.geometry_type)
+        return [
+            GeosGeometry(part.geom_type, part, raw_part)
+            for part, raw_part in zip(parts, raw_parts)
+        ]
+
+
+class _GeometryInputs:
+    """The input forms of one single geometry, each built only once and only if needed."""
+
+    __slots__ = ("geometry", "_shapely_geom", "_parsed", "_validity_reason")
+
+    def __init__(
+        self, geometry: Optional[dict], shapely_geom: Optional[BaseGeometry] = None
+    ):
+        self.geometry = geometry
+        self._shapely_geom = shapely_geom
+        self._parsed = shapely_geom is not None
+        self._validity_reason: Optional[str] = None
+
+    @property
+    def shapely_geom(self) -> Optional[BaseGeometry]:
+        if not self._parsed:
+            assert self.geometry is not None  # else the shapely geometry is given
+            self._shapely_geom = to_shapely_or_none(self.geometry)
+            self._parsed = True
+        return self._shapely_geom
+
+    @property
+    def validity_reason(self) -> Optional[str]:
+        if self._validity_reason is None and self.shapely_geom is not None:
+            self._validity_reason = shapely.is_valid_reason(self.shapely_geom)
+        return self._validity_reason
+
+    def for_check(self, check: Check) -> Any:
+        """The input form the check takes, None if it could not be built."""
+        if check.needs_validity_reason:
+            return self.validity_reason
         if check.needs_shapely:
-            if shapely_geom is None:
+            return self.shapely_geom
+        return self.geometry
+
+
+def _apply_checks(
+    plan: ValidationPlan, inputs: _GeometryInputs, geometry_type: str
+) -> Tuple[List[str], List[str]]:
+    """The names of the invalid and problematic criteria that flag this single geometry."""
+    flagged_invalid: List[str] = []
+    flagged_problematic: List[str] = []
+    for selected, flagged in (
+        (plan.invalid, flagged_invalid),
+        (plan.problematic, flagged_problematic),
+    ):
+        for name, check in selected:
+            if geometry_type not in check.relevant:
+                continue
+            if (
+                check.skip_if is not None
+                and inputs.geometry is not None
+                and check.skip_if(inputs.geometry)
+            ):
+                continue
+            # Only built here, so the shapely geometry is never built if no shapely check
+            # is left to run.
+            check_input = inputs.for_check(check)
+            if check_input is None:
                 logger.info(
                     f"Skipping check '{name}', geometry could not be parsed by shapely."
                 )
                 continue
-            if check.func(shapely_geom):
+            if check.func(check_input):
                 flagged.append(name)
-        elif check.func(geometry):
-            flagged.append(name)
-    return flagged
+                if plan.stop_on_first_invalid and selected is plan.invalid:
+                    return flagged_invalid, flagged_problematic
+    return flagged_invalid, flagged_problematic
 
 
 def process_validation(
-    geometries: Sequence[Optional[dict]],
+    geometries: Iterable[Any],
     criteria_invalid: Sequence[str],
     criteria_problematic: Sequence[str],
-) -> Dict[str, Any]:
-    selected_invalid = _select("invalid", criteria_invalid)
-    selected_problematic = _select("problematic", criteria_problematic)
-    # Only build the shapely geometry for types that a selected check actually needs it
-    # for, so e.g. validating a FeatureCollection of Points does not parse every feature.
-    types_needing_shapely = frozenset(
-        geometry_type
-        for _, check in selected_invalid + selected_problematic
-        if check.needs_shapely
-        for geometry_type in check.relevant
-    )
-    return _validate(
-        geometries, selected_invalid, selected_problematic, types_needing_shapely
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    *,
+    compact: bool = False,
+    summary_only: bool = False,
+    indices: Optional[Iterable[int]] = None,
+) -> Union[Dict[str, Any], ValidationResults]:
+    plan = compile_plan(
+        criteria_invalid, criteria_problematic, criteria_options=criteria_options
     )
+    if compact:
+        return _collect(geometries, plan, ValidationResults(), indices=indices)
+    collector = SummaryResults() if summary_only else DictResults()
+    return _collect(geometries, plan, collector, indices=indices).to_dict()
 
 
 def _validate(
-    geometries: Sequence[Optional[dict]],
-    selected_invalid: SelectedChecks,
-    selected_problematic: SelectedChecks,
-    types_needing_shapely: FrozenSet[str],
+    geometries: Sequence[Any],
+    plan: ValidationPlan,
+    cross_feature: bool = True,
 ) -> Dict[str, Any]:
-    results_invalid: Dict[str, List[Any]] = {}
-    results_problematic: Dict[str, List[Any]] = {}
-    skipped_validation: List[int] = []
-    geometry_types: List[Optional[str]] = []
+    return _collect(geometries, plan, DictResults(), cross_feature).to_dict()
+
+
+CollectorT = TypeVar("CollectorT", bound=ResultsCollector)
+
 
-    for i, geometry in enumerate(geometries):
-        if geometry is None:
+def _collect(
+    geometries: Iterable[Any],
+    plan: ValidationPlan,
+    collector: CollectorT,
+    cross_feature: bool = True,
+    indices: Optional[Iterable[int]] = None,
+) -> CollectorT:
+    # Not for the sub-geometries of a multi-geometry, only across features.
+    accumulators = (
+        [(name, new()) for name, new in plan.cross_feature] if cross_feature else []
+    )
+    for result, geometry_type, counted in _iter_validate(
+        geometries, plan, accumulators, indices
+    ):
+        collector.add(result, geometry_type, counted)
+    for criterium, accumulator in accumulators:
+        collector.add_cross_feature(criterium, accumulator.result())
+    return collector
+
+
+def _iter_validate(
+    geometries: Iterable[Any],
+    plan: ValidationPlan,
+    accumulators: Sequence[Tuple[str, CrossFeatureCheck]] = (),
+    indices: Optional[Iterable[int]] = None,
+) -> Iterator[Tuple[FeatureResult, Optional[str], bool]]:
+    """
+    Validates the geometries one by one, without keeping their results.
+
+    Args:
+        geometries: The geometries, lazily consumed.
+        plan: The compiled criteria.
+        accumulators: The cross-feature criteria, each geometry is added to them.
+        indices: The feature index of each geometry, e.g. of a slice of a larger
+            collection. By default their position.
+
+    Yields:
+        The result of each geometry, its geometry type, and if the type is counted in
+        the results (not for a null or non-object geometry).
+    """
+    numbered = enumerate(geometries) if indices is None else zip(indices, geometries)
+    geometry_type: Any
+    for i, geometry in numbered:
+        if isinstance(geometry, PackedGeometry):
+            # The nested coordinate lists only exist while the geometry is checked.
+            geometry = geometry.to_dict()
+        if isinstance(geometry, GeosGeometry):
+            geometry_type = geometry.geometry_type
+        elif geometry is None:
             logger.info("Null geometry found in GeoJSON Feature, skipping.")
-            skipped_validation.append(i)
+            yield FeatureResult(i, {}, {}, True), None, False
             continue
-        if not isinstance(geometry, dict):
+        elif not isinstance(geometry, dict):
             logger.info(
                 f"Geometry must be an object, but is a {type(geometry).__name__}, skipping."
             )
-            skipped_validation.append(i)
-            continue
-        geometry_type = geometry.get("type", None)
-        geometry_types.append(geometry_type)
-        if geometry_type not in ALL_ACCEPTED_GEOMETRY_TYPES:
-            logger.info(
-                f"Geometry of type {geometry_type} currently not supported, skipping."
-            )
-            skipped_validation.append(i)  # TODO: Improve skipped_validation result
+            yield FeatureResult(i, {}, {}, True), None, False
             continue
+        else:
+            geometry_type = geometry.get("type", None)
+            if geometry_type not in ALL_ACCEPTED_GEOMETRY_TYPES:
+                logger.info(
+                    f"Geometry of type {geometry_type} currently not supported, skipping."
+                )
+                # TODO: Improve skipped_validation result
+                yield FeatureResult(i, {}, {}, True), geometry_type, True
+                continue
 
-        # The value appended per flagged criterium: the geometry's own index, or
+        # The value reported per flagged criterium: the geometry's own index, or
         # {index: [sub-indices]} for a multi-geometry.
         flagged_invalid: Dict[str, Any]
         flagged_problematic: Dict[str, Any]
+        skipped = False
         try:
             if "Multi" in geometry_type or geometry_type == "GeometryCollection":
                 # Validate each single geometry inside the multi-geometry/collection
@@ -193,15 +460,17 @@ def _validate(
                 # multi-geometry: {3: [1, 2]} is "the fourth geometry is invalid,
                 # because its second and third sub-geometries are".
                 results_multi = _validate(
-                    extract_single_geometries(geometry, geometry_type),
-                    selected_invalid,
-                    selected_problematic,
-                    types_needing_shapely,
+                    (
+                        geometry.parts()
+                        if isinstance(geometry, GeosGeometry)
+                        else extract_single_geometries(geometry, geometry_type)
+                    ),
+                    plan,
+                    cross_feature=False,
                 )
                 # A sub-geometry that could not be checked must not pass silently, or a
                 # broken multi-geometry is indistinguishable from a valid one.
-                if results_multi["skipped_validation"]:
-                    skipped_validation.append(i)
+                skipped = bool(results_multi["skipped_validation"])
                 flagged_invalid = {
                     criterium: {i: indices}
                     for criterium, indices in results_multi["invalid"].items()
@@ -211,42 +480,25 @@ def _validate(
                     for criterium, indices in results_multi["problematic"].items()
                 }
             else:
-                shapely_geom = (
-                    to_shapely_or_none(geometry)
-                    if geometry_type in types_needing_shapely
-                    else None
+                if isinstance(geometry, GeosGeometry):
+                    inputs = _GeometryInputs(geometry.geometry, geometry.shapely_geom)
+                else:
+                    inputs = _GeometryInputs(geometry)
+                names_invalid, names_problematic = _apply_checks(
+                    plan, inputs, geometry_type
                 )
-                flagged_invalid = {
-                    criterium: i
-                    for criterium in _apply_checks(
-                        selected_invalid, geometry, shapely_geom, geometry_type
-                    )
-                }
-                flagged_problematic = {
-                    criterium: i
-                    for criterium in _apply_checks(
-                        selected_problematic, geometry, shapely_geom, geometry_type
-                    )
-                }
+                flagged_invalid = {criterium: i for criterium in names_invalid}
+                flagged_problematic = {criterium: i for criterium in names_problematic}
+            for _, accumulator in accumulators:
+                accumulator.add(i, geometry)
         except (TypeError, IndexError, KeyError) as error:
             # A structurally broken geometry, e.g. a position with a single or a
             # non-numeric value, or missing coordinates. validate_structure reports what
             # is actually wrong; here it is only skipped instead of raising.
             logger.info(f"Geometry could not be validated ({error!r}), skipping.")
-            skipped_validation.append(i)
+            yield FeatureResult(i, {}, {}, True), geometry_type, True
             continue
 
-        for criterium, flagged in flagged_invalid.items():
-            results_invalid.setdefault(criterium, []).append(flagged)
-        for criterium, flagged in flagged_problematic.items():
-            results_problematic.setdefault(criterium, []).append(flagged)
-
-    # TODO: Results format better: feature1: flaws, feature4: flaws, feature9: flaws?
-    results = {
-        "invalid": results_invalid,
-        "problematic": results_problematic,
-        "count_geometry_types": dict(Counter(geometry_types)),
-        "skipped_validation": skipped_validation,
-    }
-
-    return results
+        yield FeatureResult(
+            i, flagged_invalid, flagged_problematic, skipped
+        ), geometry_type, True
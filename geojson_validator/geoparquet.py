@@ -0,0 +1,240 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import json
+
+from loguru import logger
+import numpy as np
+import shapely
+
+from .geometry_arrays import _Parts, _check_array_criteria, _flag_rows
+from .geometry_validation import INVALID_CRITERIA, PROBLEMATIC_CRITERIA
+
+# The GeoArrow encodings of a single geometry type, by the GeoParquet "encoding" name and
+# by the Arrow extension name, and the number of their offset levels.
+_NATIVE_TYPES = {
+    "point": ("Point", 0),
+    "linestring": ("LineString", 1),
+    "polygon": ("Polygon", 2),
+    "multipoint": ("MultiPoint", 1),
+    "multilinestring": ("MultiLineString", 2),
+    "multipolygon": ("MultiPolygon", 3),
+}
+_EXTENSION_NAME = b"ARROW:extension:name"
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError as error:
+        raise ImportError(
+            "Reading GeoParquet or Arrow requires pyarrow, install it with "
+            "`pip install geojson-validator[parquet]`"
+        ) from error
+    return pyarrow
+
+
+def _geometry_encoding(schema: Any, geometry_column: Optional[str]) -> Tuple[str, str]:
+    """
+    The geometry column and its encoding, "wkb" or a GeoArrow name like "polygon", from
+    the GeoParquet metadata, else from the GeoArrow extension name of the column.
+    """
+    geo = json.loads((schema.metadata or {}).get(b"geo", b"{}"))
+    column = geometry_column or geo.get("primary_column")
+    if column in geo.get("columns", {}):
+        encoding = geo["columns"][column].get("encoding", "WKB").lower()
+    else:
+        candidates = [column] if column else schema.names
+        for name in candidates:
+            if name not in schema.names:
+                raise ValueError(f"The input has no column {name!r}")
+            field = schema.field(name)
+            extension = getattr(field.type, "extension_name", None) or (
+                field.metadata or {}
+            ).get(_EXTENSION_NAME, b"")
+            if isinstance(extension, bytes):
+                extension = extension.decode()
+            if extension.startswith("geoarrow."):
+                column, encoding = name, extension.removeprefix("geoarrow.")
+                break
+        else:
+            if not column:
+                raise ValueError(
+                    "Found no geometry column, set it with `geometry_column`"
+                )
+            # E.g. a plain binary column.
+            encoding = "wkb"
+    if encoding != "wkb" and encoding not in _NATIVE_TYPES:
+        raise ValueError(
+            f"The geometry encoding {encoding!r} of column {column!r} is not supported, "
+            f"only WKB and the single type GeoArrow encodings"
+        )
+    return column, encoding
+
+
+def _coordinates(array: Any) -> np.ndarray:
+    """The x, y and z if any of the GeoArrow coordinates, interleaved or separated."""
+    pa = _import_pyarrow()
+    if pa.types.is_fixed_size_list(array.type):
+        dimensions = array.type.value_field.name
+        size = array.type.list_size
+        if len(dimensions) != size:
+            dimensions = "xyzm"[:size]
+        # Not flatten(), which drops the null slots and shifts the following positions.
+        values = array.values.slice(array.offset * size, len(array) * size)
+        coords = values.to_numpy(zero_copy_only=False).reshape(-1, size)
+    else:
+        dimensions = "".join(field.name for field in array.type)
+        coords = np.column_stack(
+            [child.to_numpy(zero_copy_only=False) for child in array.flatten()]
+        )
+    # An m value has no GeoJSON counterpart.
+    used = [dimensions.index(name) for name in "xyz" if name in dimensions]
+    return coords[:, used].astype(float)
+
+
+def _ragged_buffers(array: Any, levels: int) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    The coordinates and the offsets from the innermost level of a GeoArrow array, like
+    `_Parts.from_ragged` takes them, for the rows of the (possibly sliced) array.
+    """
+    offsets = []
+    for _ in range(levels):
+        level = array.offsets.to_numpy()
+        offsets.append(level - level[0])
+        array = array.values.slice(level[0], level[-1] - level[0])
+    return _coordinates(array), offsets[::-1]
+
+
+def _row_group_parts(array: Any, encoding: str) -> Tuple[_Parts, np.ndarray]:
+    """The parts of the geometries of a row group, and the rows that are skipped."""
+    pa = _import_pyarrow()
+    if isinstance(array, pa.ExtensionArray):
+        array = array.storage
+    if encoding == "wkb":
+        geoms = shapely.from_wkb(
+            array.to_numpy(zero_copy_only=False), on_invalid="ignore"
+        )
+        # Like in validate_geometry_array, a LinearRing is skipped.
+        skipped = shapely.is_missing(geoms) | (
+            shapely.get_type_id(geoms) == shapely.GeometryType.LINEARRING
+        )
+        geoms[skipped] = None
+        return _Parts.from_geometries(geoms), skipped
+    geometry_type, levels = _NATIVE_TYPES[encoding]
+    coords, offsets = _ragged_buffers(array, levels)
+    skipped = array.is_null().to_numpy(zero_copy_only=False)
+    return _Parts.from_ragged(geometry_type, coords, offsets), skipped
+
+
+def _geometry_column_batches(source: Any, column: str) -> Iterator[Any]:
+    """The geometry column of each row group of a file, or each record batch."""
+    pa = _import_pyarrow()
+    if isinstance(source, (str, Path)):
+        parquet_file = pa.parquet.ParquetFile(source)
+        for i in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(i, columns=[column])
+            yield table.column(column).combine_chunks()
+    else:
+        batches = source.to_batches() if isinstance(source, pa.Table) else source
+        for batch in batches:
+            yield batch.column(column)
+
+
+def iter_validate_geoparquet(
+    source: Union[str, Path, Any],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    *,
+    geometry_column: Optional[str] = None,
+) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+    """
+    Validate the geometries of a GeoParquet file or Arrow data one row group at a time,
+    without converting them to GeoJSON. Only the geometry column of one row group is in
+    memory at once.
+
+    A WKB column is read with shapely and checked like in `validate_geometry_array`. For
+    the native GeoArrow encodings, e.g. "polygon", the coordinate criteria run directly on
+    the coordinate and offset buffers, shapely geometries are only built for the GEOS
+    based criteria, e.g. `self_intersection`.
+
+    Args:
+        source: Filepath to a GeoParquet file, or a `pyarrow.Table` or
+            `pyarrow.RecordBatchReader` with a WKB or GeoArrow geometry column.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            The criteria that compare the features with each other are not supported.
+        geometry_column: The geometry column, by default the primary column of the
+            GeoParquet metadata or the first GeoArrow column.
+
+    Yields:
+        Per row group (or record batch) the index of its first row, and like
+        `validate_geometry_array` per criterium a boolean array with a value per row.
+    """
+    _check_array_criteria(criteria_invalid, criteria_problematic)
+    pa = _import_pyarrow()
+    if isinstance(source, (str, Path)):
+        schema = pa.parquet.ParquetFile(source).schema_arrow
+    else:
+        schema = source.schema
+    column, encoding = _geometry_encoding(schema, geometry_column)
+
+    def results() -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        first_row = 0
+        for array in _geometry_column_batches(source, column):
+            parts, skipped = _row_group_parts(array, encoding)
+            yield first_row, _flag_rows(
+                parts, skipped, criteria_invalid, criteria_problematic
+            )
+            first_row += len(array)
+
+    # The input is checked above on the call, the row groups only on iterating.
+    return results()
+
+
+def validate_geoparquet(
+    source: Union[str, Path, Any],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    *,
+    geometry_column: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Validate the geometries of a GeoParquet file or Arrow data, see
+    `iter_validate_geoparquet`. Requires pyarrow.
+
+    Args:
+        source: Filepath to a GeoParquet file, or a `pyarrow.Table` or
+            `pyarrow.RecordBatchReader` with a WKB or GeoArrow geometry column.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+        geometry_column: The geometry column, by default the primary column of the
+            GeoParquet metadata or the first GeoArrow column.
+
+    Returns:
+        A dictionary with the violated criteria and the affected row indices, e.g.
+        {"invalid": {"exterior_not_ccw": [0]}, "problematic": {}, "skipped_validation": [3]}.
+        A multi-geometry row is flagged if any of its single geometries is.
+    """
+    results: Dict[str, Any] = {"invalid": {}, "problematic": {}}
+    skipped_validation: List[int] = []
+    for first_row, flags in iter_validate_geoparquet(
+        source,
+        criteria_invalid,
+        criteria_problematic,
+        geometry_column=geometry_column,
+    ):
+        for criteria_type, selected in (
+            ("invalid", criteria_invalid or []),
+            ("problematic", criteria_problematic or []),
+        ):
+            for criterium in selected:
+                rows = (np.flatnonzero(flags[criterium]) + first_row).tolist()
+                if rows:
+                    results[criteria_type].setdefault(criterium, []).extend(rows)
+        skipped_validation.extend(
+            (np.flatnonzero(flags["skipped_validation"]) + first_row).tolist()
+        )
+    results["skipped_validation"] = skipped_validation
+    logger.info(f"Validation results: {results}")
+    return results
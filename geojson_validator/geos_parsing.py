@@ -0,0 +1,252 @@
+from typing import Any, Iterator, List, Optional, Sequence, Union
+from pathlib import Path
+import json
+import mmap
+import re
+import warnings
+
+from loguru import logger
+import numpy as np
+import shapely
+
+from .feature_index import _TOKEN, _skip_whitespace, _features_array_start
+from .geometry_utils import ALL_ACCEPTED_GEOMETRY_TYPES, single_geometry_parts
+from .geometry_validation import GeosGeometry, compile_plan, needs_raw_geometry
+
+# The number of geometries parsed by GEOS at once.
+_CHUNK_FEATURES = 10_000
+_ROOT_TYPE = re.compile(rb'"type"[ \t\n\r]*:[ \t\n\r]*"FeatureCollection"')
+_TYPE_KEY = b'"type"'
+_GEOMETRY_KEY = b'"geometry"'
+_GEOMETRY_TYPES = {
+    json.dumps(geometry_type).encode(): i
+    for i, geometry_type in enumerate(ALL_ACCEPTED_GEOMETRY_TYPES)
+}
+# The geometry codes of a null (or missing) geometry, and of one that is left to json.
+_NULL = -1
+_DECODE = -2
+
+
+class _FeatureScan:
+    """The byte ranges of the features, and of the geometry object of each."""
+
+    def __init__(self) -> None:
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.geometry_starts: List[int] = []
+        self.geometry_ends: List[int] = []
+        # Per feature the index of its geometry type in ALL_ACCEPTED_GEOMETRY_TYPES, or
+        # _NULL or _DECODE.
+        self.geometry_codes: List[int] = []
+        # The position after the features array.
+        self.array_end = 0
+
+    def add(
+        self, start: int, end: int, geometry_start: int, geometry_end: int, code: int
+    ) -> None:
+        self.starts.append(start)
+        self.ends.append(end)
+        self.geometry_starts.append(geometry_start)
+        self.geometry_ends.append(geometry_end)
+        self.geometry_codes.append(code)
+
+
+def _key_value(buffer: Any, pos: int) -> Optional[int]:
+    """The value position if the string token ending at `pos` is a key, else None."""
+    colon = _skip_whitespace(buffer, pos)
+    if buffer[colon : colon + 1] != b":":
+        return None
+    return _skip_whitespace(buffer, colon + 1)
+
+
+def _scan_features(buffer: Any) -> _FeatureScan:
+    """
+    Like `feature_byte_ranges`, and in the same single pass finds the geometry object of
+    each feature and its type. A geometry that is not an object with a plainly written
+    supported type, or a feature with an escaped key, is left to json.
+
+    Raises:
+        ValueError: If the features can not be split, e.g. a feature is not an object.
+    """
+    scan = _FeatureScan()
+    gap = _features_array_start(buffer)
+    depth = 0
+    in_geometry = escaped = False
+    # The positions in the current feature of the value of its "geometry" member, of the
+    # end of that object, and of the value of the geometry's "type" member.
+    start = geometry_value = geometry_end = type_value = -1
+    type_code = _DECODE
+    for match in _TOKEN.finditer(buffer, gap):
+        token = match.group()
+        if depth == 0:
+            separator = buffer[gap : match.start()].strip()
+            if token != b"{":
+                if not separator.startswith(b"]"):
+                    raise ValueError(f"Feature at byte {gap} is not an object")
+                scan.array_end = gap
+                return scan
+            if separator != (b"," if scan.starts else b""):
+                raise ValueError(f"Expected ',' or ']' after the feature at byte {gap}")
+            start, geometry_value, geometry_end = match.start(), -1, -1
+            escaped = False
+            depth = 1
+        elif token == b"{":
+            depth += 1
+            if depth == 2 and match.start() == geometry_value:
+                in_geometry = True
+        elif token == b"}":
+            depth -= 1
+            if depth == 1 and in_geometry:
+                in_geometry = False
+                geometry_end = match.end()
+            elif depth == 0:
+                if escaped:
+                    type_code = _DECODE
+                elif geometry_value < 0 or buffer[geometry_value] == ord("n"):
+                    type_code = _NULL  # missing, or null
+                elif geometry_end < 0:
+                    type_code = _DECODE  # not an object
+                scan.add(start, match.end(), geometry_value, geometry_end, type_code)
+                gap = match.end()
+        elif match.start() == type_value:
+            type_code = _GEOMETRY_TYPES.get(token, _DECODE)
+        elif depth == 1 or (depth == 2 and in_geometry):
+            value = _key_value(buffer, match.end())
+            if value is None:
+                continue
+            if b"\\" in token:
+                escaped = True  # e.g. an escaped "geometry" key
+            elif depth == 1 and token == _GEOMETRY_KEY:
+                # A duplicate member replaces the previous one, like in json.
+                geometry_value, geometry_end, type_code = value, -1, _DECODE
+            elif depth == 2 and token == _TYPE_KEY:
+                type_value = value
+    raise ValueError("Unterminated features array")
+
+
+def _faithful(geoms: np.ndarray) -> np.ndarray:
+    """
+    True for each geometry that GEOS parsed the same as `shapely.geometry.shape` does the
+    decoded json. Not e.g. for a ring of three positions, which shape pads to four, an
+    empty part, or the missing z value of a 2D position among 3D positions.
+    """
+    faithful = ~shapely.is_missing(geoms)
+    flat, index = single_geometry_parts(geoms)
+    faithful[index[shapely.is_empty(flat)]] = False
+    polygons = shapely.get_type_id(flat) == 3
+    rings, ring_index = shapely.get_rings(flat[polygons], return_index=True)
+    short_rings = shapely.get_num_coordinates(rings) < 4
+    faithful[index[polygons][ring_index[short_rings]]] = False
+    coords, coord_index = shapely.get_coordinates(flat, return_index=True)
+    faithful[index[coord_index[np.isnan(coords).any(axis=1)]]] = False
+    has_z = shapely.has_z(flat)
+    coords, coord_index = shapely.get_coordinates(
+        flat[has_z], include_z=True, return_index=True
+    )
+    faithful[index[has_z][coord_index[np.isnan(coords[:, 2])]]] = False
+    return faithful
+
+
+def _parse_chunk(buffer: Any, scan: _FeatureScan, chunk: slice, raw: bool) -> List[Any]:
+    """The geometries of a chunk of the scanned features, in feature order."""
+    codes = scan.geometry_codes[chunk]
+    geometries: List[Any] = [None] * len(codes)
+    texts: List[bytes] = []
+    positions: List[int] = []
+    for k, (code, start, end) in enumerate(
+        zip(codes, scan.geometry_starts[chunk], scan.geometry_ends[chunk])
+    ):
+        if code >= 0:
+            texts.append(buffer[start:end])
+            positions.append(k)
+        elif code == _DECODE:
+            # E.g. an unsupported geometry type, it gets the same treatment as without
+            # GEOS parsing.
+            feature = buffer[scan.starts[chunk][k] : scan.ends[chunk][k]]
+            geometries[k] = json.loads(feature).get("geometry")
+
+    raws = json.loads(b"[" + b",".join(texts) + b"]") if raw else [None] * len(texts)
+    with warnings.catch_warnings():
+        # E.g. a number out of the float range, such a geometry is decoded by json instead.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        geoms = shapely.from_geojson(np.array(texts, dtype=object), on_invalid="ignore")
+    faithful = _faithful(geoms)
+    for j, k in enumerate(positions):
+        geometry_type = ALL_ACCEPTED_GEOMETRY_TYPES[codes[k]]
+        if faithful[j] and geoms[j].geom_type == geometry_type:
+            geometries[k] = GeosGeometry(geometry_type, geoms[j], raws[j])
+        else:
+            # E.g. an unclosed ring, which GEOS rejects.
+            geometries[k] = raws[j] if raw else json.loads(texts[j])
+    return geometries
+
+
+def _iter_file_geometries(
+    filepath: Path, scan: _FeatureScan, raw: bool
+) -> Iterator[Any]:
+    with filepath.open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for first in range(0, len(scan.starts), _CHUNK_FEATURES):
+                chunk = slice(first, first + _CHUNK_FEATURES)
+                yield from _parse_chunk(buffer, scan, chunk, raw)
+
+
+def geos_file_geometries(
+    geojson_input: Union[dict, str, Path, Any],
+    criteria_invalid: Sequence[str],
+    criteria_problematic: Sequence[str],
+) -> Optional[Iterator[Any]]:
+    """
+    The geometries of a FeatureCollection file, parsed by GEOS in bulk from their json
+    text, instead of decoding them to dicts and building each shapely geometry from those.
+
+    The byte ranges of the features and their geometries are found by a single scan of
+    the json strings and braces. The geometry dicts are only decoded if a selected check
+    needs the raw coordinates, e.g. `unclosed`, as GEOS closes or rejects such rings.
+    Geometries that GEOS rejects or parses differently are decoded by json, so the
+    results are the same.
+
+    Args:
+        geojson_input: The input of `validate_geometries`.
+        criteria_invalid: The selected invalid criteria (already checked).
+        criteria_problematic: The selected problematic criteria (already checked).
+
+    Returns:
+        The geometries (mostly `GeosGeometry`), lazily in feature order. None if the fast
+        path does not apply, e.g. not a local FeatureCollection file, or no shapely based
+        criteria.
+    """
+    plan = compile_plan(criteria_invalid, criteria_problematic)
+    if (
+        not isinstance(geojson_input, (str, Path))
+        or not Path(geojson_input).is_file()
+        or Path(geojson_input).suffix.lower() not in (".json", ".geojson")
+    ):
+        logger.info("GEOS parsing only applies to a local file, reading it with json.")
+        return None
+    if plan.cross_feature or not any(
+        check.needs_shapely for _, check in plan.invalid + plan.problematic
+    ):
+        logger.info(
+            "GEOS parsing only applies to shapely based criteria that check each feature "
+            "on its own, reading the file with json."
+        )
+        return None
+
+    filepath = Path(geojson_input)
+    try:
+        with filepath.open("rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                scan = _scan_features(buffer)
+                # The root type is a member outside of the features array.
+                first = scan.starts[0] if scan.starts else scan.array_end
+                spans = [(0, first), (scan.array_end, len(buffer))]
+                if not any(_ROOT_TYPE.search(buffer, *span) for span in spans):
+                    raise ValueError("Root is not a FeatureCollection")
+    except ValueError as error:
+        # E.g. a single Feature, an empty file, or a feature that is not an object.
+        logger.info(
+            f"File can not be split by features ({error}), reading it with json."
+        )
+        return None
+    return _iter_file_geometries(filepath, scan, needs_raw_geometry(plan))
@@ -1,4 +1,17 @@
-from typing import Any, Dict, Sequence, Union, TYPE_CHECKING
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+    TYPE_CHECKING,
+    overload,
+)
+import json
 import sys
 from pathlib import Path
 
@@ -8,14 +21,26 @@ from .schema_validation import GeoJsonLint
 from .geometry_utils import (
     input_to_geojson,
     any_geojson_to_featurecollection,
+    geojson_geometries,
+    iter_feature_geometries,
 )
 from .geometry_validation import (
     INVALID_CRITERIA,
     PROBLEMATIC_CRITERIA,
+    ALLOWED_PROBLEMATIC_CRITERIA,
+    CROSS_FEATURE_CRITERIA,
     check_criteria,
+    check_criteria_options,
+    compile_plan,
     process_validation,
+    _iter_validate,
 )
 from .fixes_utils import process_fix
+from .feature_index import select_feature_geometries
+from .geos_parsing import geos_file_geometries
+from .streaming import iter_features
+from .sources import is_cached_url, validate_cached
+from .results import FeatureResult, ValidationResults
 
 if TYPE_CHECKING:
     from loguru import Logger
@@ -26,7 +51,10 @@ logger.add(sink=sys.stderr, format=logger_format, level="INFO")
 
 
 def validate_structure(
-    geojson_input: Union[dict, str, Path, Any], check_crs: bool = False
+    geojson_input: Union[dict, str, Path, Any],
+    check_crs: bool = False,
+    summary_only: bool = False,
+    packed_coordinates: bool = False,
 ) -> Dict[str, Any]:
     """
     Validate that the input conforms to the GeoJSON json schema.
@@ -34,23 +62,75 @@ def validate_structure(
     Args:
         geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
         check_crs: Also flag a crs member, which the GeoJSON specification disallows.
+        summary_only: Only count the occurrences of each error, instead of listing their
+            json paths and feature indices.
+        packed_coordinates: Decode the coordinates of a file/url input into compact arrays
+            instead of nested lists of floats, see `validate_geometries`.
 
     Returns:
         A dictionary of error messages with the affected json paths and feature indices, e.g.
-        {"Missing 'type' member": {"path": ["/features/0"], "feature": [0]}}.
+        {"Missing 'type' member": {"path": ["/features/0"], "feature": [0]}}. With
+        `summary_only`, the number of occurrences instead, e.g. {"Missing 'type' member": 1}.
         Empty if the structure is valid.
     """
-    geojson_data = input_to_geojson(geojson_input)
-    errors = GeoJsonLint(check_crs=check_crs).lint(geojson_data)
+    if is_cached_url(geojson_input):
+        return validate_cached(
+            geojson_input,
+            ("validate_structure", check_crs, summary_only),
+            lambda path: validate_structure(
+                path, check_crs, summary_only, packed_coordinates
+            ),
+        )
+    geojson_data = input_to_geojson(geojson_input, packed_coordinates)
+    errors = GeoJsonLint(check_crs=check_crs, summary_only=summary_only).lint(
+        geojson_data
+    )
     logger.info(f"Structure validation results: {errors}")
     return errors
 
 
+@overload
+def validate_geometries(
+    geojson_input: Union[dict, str, Path, Any],
+    criteria_invalid: Sequence[str] = ...,
+    criteria_problematic: Sequence[str] = ...,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = ...,
+    *,
+    compact: Literal[False] = ...,
+    summary_only: bool = ...,
+    feature_indices: Optional[Iterable[int]] = ...,
+    packed_coordinates: bool = ...,
+    geos_parsing: bool = ...,
+) -> Dict[str, Any]: ...
+
+
+@overload
+def validate_geometries(
+    geojson_input: Union[dict, str, Path, Any],
+    criteria_invalid: Sequence[str] = ...,
+    criteria_problematic: Sequence[str] = ...,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = ...,
+    *,
+    compact: Literal[True],
+    summary_only: Literal[False] = ...,
+    feature_indices: Optional[Iterable[int]] = ...,
+    packed_coordinates: bool = ...,
+    geos_parsing: bool = ...,
+) -> ValidationResults: ...
+
+
 def validate_geometries(
     geojson_input: Union[dict, str, Path, Any],
     criteria_invalid: Sequence[str] = INVALID_CRITERIA,
     criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
-) -> Dict[str, Any]:
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    *,
+    compact: bool = False,
+    summary_only: bool = False,
+    feature_indices: Optional[Iterable[int]] = None,
+    packed_coordinates: bool = False,
+    geos_parsing: bool = False,
+) -> Union[Dict[str, Any], ValidationResults]:
     """
     Validate that a GeoJSON conforms to the geojson specs.
 
@@ -58,30 +138,157 @@ def validate_geometries(
         geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
         criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
         criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            Can also include the opt-in criteria that compare the features with each other,
+            e.g. "duplicate_features".
+        criteria_options: Options of the criteria that compare the features with each other,
+            e.g. {"duplicate_features": {"normalize": True}}.
+        compact: Return a `ValidationResults` instead of the dictionary, which stores the
+            results of large collections in a fraction of the memory. Its `to_dict()` gives
+            the dictionary.
+        summary_only: Only count the features per violated criterium, instead of listing
+            their indices, e.g. for monitoring. The results then take the same memory for
+            any number of features.
+        feature_indices: Only validate these features, e.g. to re-check the flagged
+            features of a previous validation. The results keep their original indices. A
+            FeatureCollection file is then read through a sidecar index of the feature
+            positions (`FeatureIndex`), without parsing the other features.
+        packed_coordinates: Decode the coordinates of a file/url input into compact arrays
+            instead of nested lists of floats, for large inputs that would otherwise not
+            fit into memory.
+        geos_parsing: Parse the geometries of a local FeatureCollection file in bulk with
+            GEOS (`shapely.from_geojson`), which is faster for the shapely based criteria,
+            e.g. "self_intersection". Only the geometries are decoded, so the json outside
+            of them is not checked. Not for the criteria that compare the features.
 
     Returns:
         A dictionary with the violated criteria and the affected feature indices, e.g.
-        {"invalid": {"unclosed": [0]}, "problematic": {}, ...}.
+        {"invalid": {"unclosed": [0]}, "problematic": {}, ...}. With `summary_only`, the
+        numbers of affected features instead, e.g. {"invalid": {"unclosed": 1}, ...,
+        "skipped_validation": 0}.
     """
     if not criteria_invalid and not criteria_problematic:
         raise ValueError(
             "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
         )
+    if compact and summary_only:
+        raise ValueError("Select only one of `compact` and `summary_only`")
     check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
-    check_criteria(criteria_problematic, PROBLEMATIC_CRITERIA, name="problematic")
+    check_criteria(
+        criteria_problematic, ALLOWED_PROBLEMATIC_CRITERIA, name="problematic"
+    )
+    check_criteria_options(criteria_options, criteria_problematic)
+    if geos_parsing and (packed_coordinates or feature_indices is not None):
+        raise ValueError(
+            "`geos_parsing` can not be combined with `packed_coordinates` or `feature_indices`"
+        )
+    if is_cached_url(geojson_input):
+        if feature_indices is not None:
+            feature_indices = tuple(feature_indices)
+        key = (
+            "validate_geometries",
+            tuple(criteria_invalid or ()),
+            tuple(criteria_problematic or ()),
+            json.dumps(criteria_options, sort_keys=True, default=str),
+            compact,
+            summary_only,
+            feature_indices,
+        )
+        return validate_cached(
+            geojson_input,
+            key,
+            lambda path: validate_geometries(  # type: ignore[call-overload]
+                path,
+                criteria_invalid,
+                criteria_problematic,
+                criteria_options,
+                compact=compact,
+                summary_only=summary_only,
+                feature_indices=feature_indices,
+                packed_coordinates=packed_coordinates,
+                geos_parsing=geos_parsing,
+            ),
+        )
 
-    geojson_input = input_to_geojson(geojson_input)
-    fc = any_geojson_to_featurecollection(geojson_input)
+    indices: Optional[List[int]] = None
+    geometries: Optional[Iterable[Any]] = None
+    if feature_indices is not None:
+        geometries, indices = select_feature_geometries(geojson_input, feature_indices)
+    elif geos_parsing:
+        geometries = geos_file_geometries(
+            geojson_input, criteria_invalid, criteria_problematic
+        )
+    if geometries is None:
+        geojson_input = input_to_geojson(geojson_input, packed_coordinates)
+        fc = any_geojson_to_featurecollection(geojson_input)
 
-    # A missing geometry member is treated like an explicit null geometry, which
-    # process_validation already reports as skipped.
-    geometries = [feature.get("geometry") for feature in fc["features"]]
-    results = process_validation(geometries, criteria_invalid, criteria_problematic)
+        # A missing geometry member is treated like an explicit null geometry, which
+        # process_validation already reports as skipped.
+        geometries = [feature.get("geometry") for feature in fc["features"]]
+    results = process_validation(
+        geometries,
+        criteria_invalid,
+        criteria_problematic,
+        criteria_options,
+        compact=compact,
+        summary_only=summary_only,
+        indices=indices,
+    )
 
     logger.info(f"Validation results: {results}")
     return results
 
 
+def iter_validate_geometries(
+    geojson_input: Union[dict, str, Path, Iterable[dict], Any],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+) -> Iterator[FeatureResult]:
+    """
+    Validate the geometries one by one, lazily yielding the result of each feature as soon
+    as it is checked, e.g. to route invalid features elsewhere while the rest is validated.
+
+    Args:
+        geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to
+            (Geo)JSON, or an iterable of GeoJSON Features, e.g. from a streaming reader.
+            A file or url, also compressed, is parsed one feature at a time (`iter_features`).
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            The criteria that compare the features with each other are not supported, as
+            they only have a result after the last feature.
+
+    Yields:
+        Per feature a `FeatureResult(feature_index, flagged_invalid, flagged_problematic, skipped)`.
+        The flagged dictionaries map each violated criterium to the entry it gets in the
+        `validate_geometries` results, e.g. {"unclosed": 3} or {"unclosed": {3: [0, 2]}}.
+    """
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    cross_feature = set(criteria_problematic or []) & set(CROSS_FEATURE_CRITERIA)
+    if cross_feature:
+        raise ValueError(
+            f"The criteria {sorted(cross_feature)} compare the features with each other and "
+            f"are not supported per feature, use `validate_geometries`"
+        )
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(criteria_problematic, PROBLEMATIC_CRITERIA, name="problematic")
+    plan = compile_plan(criteria_invalid, criteria_problematic)
+
+    geometries: Iterable[Optional[Any]]
+    if isinstance(geojson_input, (str, Path)):
+        # The features are parsed one at a time while the file or url is read.
+        geometries = (
+            feature.get("geometry") for feature in iter_features(geojson_input)
+        )
+    elif isinstance(geojson_input, dict) or hasattr(geojson_input, "__geo_interface__"):
+        geometries = geojson_geometries(input_to_geojson(geojson_input))
+    else:
+        geometries = iter_feature_geometries(geojson_input)
+    # The input is checked above on the call, the features only on iterating.
+    return (result for result, _, _ in _iter_validate(geometries, plan))
+
+
 def fix_geometries(
     geojson_input: Union[dict, str, Path, Any],
     optional: Sequence[str] = ("duplicate_nodes",),
@@ -0,0 +1,283 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .geometry_utils import ALL_ACCEPTED_GEOMETRY_TYPES
+from .packed_json import offsets, pack_ring
+
+# Layout of the arrays in a shared memory block: name, dtype, shape and byte offset each.
+Layout = Tuple[Tuple[str, str, Tuple[int, ...], int], ...]
+
+_FALLBACK = -1
+# Per geometry type code, the fewest positions of a ring that shapely builds the same.
+_MIN_POSITIONS = np.array(
+    [
+        {"Point": 1, "LineString": 2, "Polygon": 4}.get(t.replace("Multi", ""), 0)
+        for t in ALL_ACCEPTED_GEOMETRY_TYPES
+    ]
+)
+
+
+def _runs(
+    run_offsets: np.ndarray, indices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The elements of the runs offsets[i]:offsets[i + 1] of the indices, and their offsets."""
+    starts = run_offsets[indices]
+    counts = run_offsets[indices + 1] - starts
+    selected = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(counts, out=selected[1:])
+    elements = np.arange(selected[-1]) + np.repeat(starts - selected[:-1], counts)
+    return elements, selected
+
+
+def _pack_geometry(geometry: Any) -> Optional[List[List[np.ndarray]]]:
+    """The rings of each single geometry part, None if the geometry can not be packed."""
+    if not isinstance(geometry, dict):
+        return None
+    geometry_type = geometry.get("type")
+    coordinates = geometry.get("coordinates")
+    if (
+        geometry_type not in ALL_ACCEPTED_GEOMETRY_TYPES
+        or geometry_type == "GeometryCollection"
+        or not isinstance(coordinates, list)
+    ):
+        return None
+    parts = coordinates if geometry_type.startswith("Multi") else [coordinates]
+    single_type = geometry_type.replace("Multi", "")
+    packed_parts = []
+    for part in parts:
+        if single_type == "Point":
+            rings: Any = [[part]]
+        elif single_type == "LineString":
+            rings = [part]
+        else:
+            rings = part
+        if not isinstance(rings, list):
+            return None
+        packed_rings = [pack_ring(ring) for ring in rings]
+        if any(ring is None for ring in packed_rings):
+            return None
+        packed_parts.append(packed_rings)
+    return packed_parts  # type: ignore[return-value]
+
+
+class PackedGeometries:
+    """
+    The coordinates of many geometries in a few flat arrays, like the GeoArrow layout.
+
+    The positions of all rings (the single array of a LineString or Point) are stacked in
+    one float64 array. Offset arrays give the rings of each single geometry part and the
+    parts of each feature's geometry. The arrays can be placed in shared memory, from which
+    worker processes read them without copying or unpickling any coordinates. Geometries
+    that can not be packed exactly (e.g. a GeometryCollection, null or broken geometries)
+    are kept as they are, in `fallback`.
+    """
+
+    ARRAYS = (
+        "feature_types",
+        "feature_part_offsets",
+        "part_ring_offsets",
+        "ring_coord_offsets",
+        "ring_dims",
+        "coords",
+    )
+
+    def __init__(
+        self,
+        *,
+        feature_types: np.ndarray,
+        feature_part_offsets: np.ndarray,
+        part_ring_offsets: np.ndarray,
+        ring_coord_offsets: np.ndarray,
+        ring_dims: np.ndarray,
+        coords: np.ndarray,
+        fallback: Dict[int, Any],
+    ):
+        """
+        Args:
+            feature_types: Per feature the index of its geometry type in
+                ALL_ACCEPTED_GEOMETRY_TYPES, -1 for a geometry in `fallback`.
+            feature_part_offsets: The parts of feature i are offsets[i]:offsets[i + 1].
+            part_ring_offsets: The rings of each part, likewise.
+            ring_coord_offsets: The positions of each ring in `coords`, likewise.
+            ring_dims: The number of values of the positions of each ring, 2 or 3.
+            coords: The positions, shape (n, 3). The third value is unused for 2D rings.
+            fallback: The unpacked geometries by feature index.
+        """
+        self.feature_types = feature_types
+        self.feature_part_offsets = feature_part_offsets
+        self.part_ring_offsets = part_ring_offsets
+        self.ring_coord_offsets = ring_coord_offsets
+        self.ring_dims = ring_dims
+        self.coords = coords
+        self.fallback = fallback
+
+    @classmethod
+    def from_geometries(cls, geometries: Iterable[Any]) -> "PackedGeometries":
+        feature_types: List[int] = []
+        part_counts: List[int] = []
+        ring_counts: List[int] = []
+        rings: List[np.ndarray] = []
+        fallback: Dict[int, Any] = {}
+        for i, geometry in enumerate(geometries):
+            parts = _pack_geometry(geometry)
+            if parts is None:
+                feature_types.append(_FALLBACK)
+                part_counts.append(0)
+                fallback[i] = geometry
+                continue
+            feature_types.append(ALL_ACCEPTED_GEOMETRY_TYPES.index(geometry["type"]))
+            part_counts.append(len(parts))
+            for part in parts:
+                ring_counts.append(len(part))
+                rings.extend(part)
+
+        coords = np.full((sum(len(ring) for ring in rings), 3), np.nan)
+        coord_counts = [len(ring) for ring in rings]
+        ring_coord_offsets = offsets(coord_counts)
+        for ring, start in zip(rings, ring_coord_offsets):
+            coords[start : start + len(ring), : ring.shape[1]] = ring
+        return cls(
+            feature_types=np.array(feature_types, dtype=np.int8),
+            feature_part_offsets=offsets(part_counts),
+            part_ring_offsets=offsets(ring_counts),
+            ring_coord_offsets=ring_coord_offsets,
+            ring_dims=np.array([ring.shape[1] for ring in rings], dtype=np.uint8),
+            coords=coords,
+            fallback=fallback,
+        )
+
+    def __len__(self) -> int:
+        return len(self.feature_types)
+
+    def geometry(self, index: int) -> Any:
+        """The GeoJSON geometry of the feature, with its coordinates as floats."""
+        type_code = self.feature_types[index]
+        if type_code == _FALLBACK:
+            return self.fallback[index]
+        geometry_type = ALL_ACCEPTED_GEOMETRY_TYPES[type_code]
+        single_type = geometry_type.replace("Multi", "")
+        parts = [
+            self._part(part, single_type)
+            for part in range(
+                self.feature_part_offsets[index], self.feature_part_offsets[index + 1]
+            )
+        ]
+        coordinates = parts if geometry_type.startswith("Multi") else parts[0]
+        return {"type": geometry_type, "coordinates": coordinates}
+
+    def _part(self, part: int, single_type: str) -> Any:
+        rings = [
+            self.coords[
+                self.ring_coord_offsets[ring] : self.ring_coord_offsets[ring + 1],
+                : self.ring_dims[ring],
+            ].tolist()
+            for ring in range(
+                self.part_ring_offsets[part], self.part_ring_offsets[part + 1]
+            )
+        ]
+        if single_type == "Point":
+            return rings[0][0]
+        if single_type == "LineString":
+            return rings[0]
+        return rings
+
+    def ragged_dims(self, start: int, stop: int) -> np.ndarray:
+        """
+        Per feature of the range the dimension of its positions, 2 or 3, if its arrays are
+        what shapely would build from the GeoJSON geometry, else 0. That is a packed
+        geometry of finite positions of one dimension, whose lines have at least 2
+        positions and whose polygons have at least one ring, each closed with at least 4.
+        """
+        features = np.arange(stop - start)
+        types = self.feature_types[start:stop]
+        first_part, last_part = self.feature_part_offsets[[start, stop]]
+        part_feature = np.repeat(
+            features, np.diff(self.feature_part_offsets[start : stop + 1])
+        )
+        ring_counts = np.diff(self.part_ring_offsets[first_part : last_part + 1])
+        ring_feature = np.repeat(part_feature, ring_counts)
+        first_ring, last_ring = self.part_ring_offsets[[first_part, last_part]]
+        ring_offsets = self.ring_coord_offsets[first_ring : last_ring + 1]
+        counts = np.diff(ring_offsets)
+        dims = self.ring_dims[first_ring:last_ring]
+
+        coords = self.coords[ring_offsets[0] : ring_offsets[-1]]
+        ring_offsets = ring_offsets - ring_offsets[0]
+        # The unused third value of a 2D position is NaN.
+        finite = np.isfinite(coords[:, :2]).all(axis=1) & (
+            np.isfinite(coords[:, 2]) | (np.repeat(dims, counts) == 2)
+        )
+        min_positions = _MIN_POSITIONS[types[ring_feature]]
+        broken = (counts < min_positions) | (
+            np.bincount(
+                np.repeat(np.arange(len(counts)), counts)[~finite],
+                minlength=len(counts),
+            )
+            > 0
+        )
+        rings = np.flatnonzero((min_positions == 4) & (counts > 0))
+        first, last = coords[ring_offsets[rings]], coords[ring_offsets[rings + 1] - 1]
+        broken[rings] |= ~np.all(
+            (first == last) | (np.isnan(first) & np.isnan(last)), axis=1
+        )
+
+        regular = (types != _FALLBACK) & (
+            np.bincount(ring_feature[broken], minlength=len(features)) == 0
+        )
+        no_rings = (_MIN_POSITIONS[types[part_feature]] == 4) & (ring_counts == 0)
+        regular &= np.bincount(part_feature[no_rings], minlength=len(features)) == 0
+        ring_totals = np.bincount(ring_feature, minlength=len(features))
+        ring_3d = np.bincount(ring_feature[dims == 3], minlength=len(features))
+        regular &= (ring_3d == 0) | (ring_3d == ring_totals)
+        return np.where(regular, np.where(ring_3d > 0, 3, 2), 0)
+
+    def ragged(self, indices: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        The positions and the offset arrays of features of one geometry type and dimension
+        (see `ragged_dims`), in the GeoArrow layout `shapely.to_ragged_array` returns.
+        """
+        geometry_type = ALL_ACCEPTED_GEOMETRY_TYPES[self.feature_types[indices[0]]]
+        single_type = geometry_type.replace("Multi", "")
+        parts, part_offsets = _runs(self.feature_part_offsets, indices)
+        rings, ring_offsets = _runs(self.part_ring_offsets, parts)
+        positions, coord_offsets = _runs(self.ring_coord_offsets, rings)
+        # A point is a single ring of one position, a line a single ring.
+        levels = {
+            "Point": [],
+            "LineString": [coord_offsets],
+            "Polygon": [coord_offsets, ring_offsets],
+        }[single_type]
+        if single_type != geometry_type:
+            levels.append(part_offsets)
+        dims = int(self.ring_dims[rings[0]]) if rings.size else 2
+        return self.coords[positions, :dims], levels
+
+    def to_shared_memory(self) -> Tuple[SharedMemory, Layout]:
+        """
+        Copies the arrays into a new shared memory block, for `from_shared_memory`. The
+        caller must `close()` and `unlink()` the block when the workers are done.
+        """
+        arrays = [np.ascontiguousarray(getattr(self, name)) for name in self.ARRAYS]
+        layout = []
+        offset = 0
+        for name, array in zip(self.ARRAYS, arrays):
+            layout.append((name, array.dtype.str, array.shape, offset))
+            offset += -(-array.nbytes // 8) * 8  # keeps every array 8 byte aligned
+        shm = SharedMemory(create=True, size=max(offset, 1))
+        assert shm.buf is not None
+        for (_, _, _, start), array in zip(layout, arrays):
+            shm.buf[start : start + array.nbytes] = array.tobytes()
+        return shm, tuple(layout)
+
+    @classmethod
+    def from_shared_memory(
+        cls, buffer: memoryview, layout: Layout, fallback: Dict[int, Any]
+    ) -> "PackedGeometries":
+        """The packed geometries as views of the shared memory buffer, without a copy."""
+        arrays = {
+            name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=start)
+            for name, dtype, shape, start in layout
+        }
+        return cls(fallback=fallback, **arrays)
@@ -0,0 +1,177 @@
+from typing import Any, Dict, Iterator, List, Optional, Union
+from collections.abc import Mapping
+import json
+
+import numpy as np
+
+# Beyond, an integer coordinate can not be converted to a float without changing it.
+_MAX_EXACT_INT = 2**53
+# The geometry types whose coordinates are packed. Points are not, their few values take
+# about as much memory in a small array.
+_PACKED_TYPES = ("LineString", "MultiLineString", "Polygon", "MultiPolygon")
+
+
+def pack_ring(ring: Any) -> Optional[np.ndarray]:
+    """The positions as an (n, 2) or (n, 3) array, None if they can not be packed exactly."""
+    if not isinstance(ring, list):
+        return None
+    if not ring:
+        return np.empty((0, 2))
+    try:
+        array = np.asarray(ring)
+    except ValueError:  # e.g. mixed 2D/3D positions
+        return None
+    # Not converted with dtype=float, as that would turn e.g. booleans or numeric strings
+    # into numbers that the checks would then accept.
+    if array.dtype.kind not in "iuf" or array.ndim != 2 or array.shape[1] not in (2, 3):
+        return None
+    if array.dtype.kind != "f" and np.abs(array).max() >= _MAX_EXACT_INT:
+        return None
+    return array.astype(float)
+
+
+def offsets(counts: List[int]) -> np.ndarray:
+    """The start of each of the consecutive runs, and the end of the last."""
+    result = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=result[1:])
+    return result
+
+
+class PackedGeometry(Mapping):
+    """
+    A GeoJSON geometry whose coordinates are kept in a compact float64 array.
+
+    Behaves like the geometry dict (a read-only Mapping), the nested coordinate lists are
+    only built when the "coordinates" member is accessed. Only regular coordinates are
+    packed: the nesting depth of the geometry type, no empty arrays, and every position of
+    the same 2 or 3 numbers, so the structure checks have nothing to report on them.
+    """
+
+    def __init__(
+        self,
+        members: Dict[str, Any],
+        coords: np.ndarray,
+        ring_offsets: np.ndarray,
+        part_offsets: Optional[np.ndarray],
+    ):
+        """
+        Args:
+            members: The members of the geometry besides "coordinates", e.g. "type".
+            coords: The positions of all rings (or lines), shape (n, 2) or (n, 3).
+            ring_offsets: The positions of ring i are coords[offsets[i]:offsets[i + 1]].
+            part_offsets: The rings of each polygon of a MultiPolygon, likewise.
+        """
+        self._members = members
+        self.coords = coords
+        self.ring_offsets = ring_offsets
+        self.part_offsets = part_offsets
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "coordinates":
+            return self._coordinates()
+        return self._members[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._members
+        yield "coordinates"
+
+    def __len__(self) -> int:
+        return len(self._members) + 1
+
+    def _coordinates(self) -> list:
+        rings = [
+            self.coords[start:end].tolist()
+            for start, end in zip(self.ring_offsets[:-1], self.ring_offsets[1:])
+        ]
+        geometry_type = self._members["type"]
+        if geometry_type == "LineString":
+            return rings[0]
+        if geometry_type == "MultiPolygon":
+            assert self.part_offsets is not None
+            return [
+                rings[start:end]
+                for start, end in zip(self.part_offsets[:-1], self.part_offsets[1:])
+            ]
+        return rings  # the rings of a Polygon, or the lines of a MultiLineString
+
+    def to_dict(self) -> dict:
+        """The geometry dict, with the coordinates as nested lists of floats."""
+        return dict(self)
+
+    @property
+    def __geo_interface__(self) -> dict:
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"PackedGeometry({self._members.get('type')}, {len(self.coords)} positions)"
+        )
+
+
+def pack_geometry(geometry: dict) -> Union[dict, PackedGeometry]:
+    """The geometry with its coordinates packed, or as is if they are not regular."""
+    geometry_type = geometry.get("type")
+    if geometry_type not in _PACKED_TYPES:
+        return geometry
+    coordinates = geometry.get("coordinates")
+    parts = coordinates if geometry_type == "MultiPolygon" else [coordinates]
+    if not isinstance(parts, list) or not parts:
+        return geometry
+    rings: List[Any] = []
+    ring_counts: List[int] = []
+    for part in parts:
+        part_rings = [part] if geometry_type == "LineString" else part
+        if not isinstance(part_rings, list) or not part_rings:
+            return geometry
+        ring_counts.append(len(part_rings))
+        rings.extend(part_rings)
+    arrays = []
+    for ring in rings:
+        array = pack_ring(ring) if ring else None
+        if array is None:
+            return geometry
+        arrays.append(array)
+    if len({array.shape[1] for array in arrays}) != 1:
+        return geometry  # mixed 2D and 3D
+    members = {key: value for key, value in geometry.items() if key != "coordinates"}
+    return PackedGeometry(
+        members,
+        np.concatenate(arrays),
+        offsets([len(array) for array in arrays]),
+        offsets(ring_counts) if geometry_type == "MultiPolygon" else None,
+    )
+
+
+def _pack_geometries(geometry: Any) -> Any:
+    """The geometry packed, or the members of a GeometryCollection."""
+    if not isinstance(geometry, dict):
+        return geometry
+    if geometry.get("type") == "GeometryCollection" and isinstance(
+        geometry.get("geometries"), list
+    ):
+        geometry["geometries"] = [
+            _pack_geometries(member) for member in geometry["geometries"]
+        ]
+        return geometry
+    if "coordinates" in geometry:
+        return pack_geometry(geometry)
+    return geometry
+
+
+def _object_hook(obj: dict) -> Any:
+    # Called for each json object once its members are decoded, so the nested coordinate
+    # lists of one feature's geometry only exist until the feature is packed. Only the
+    # geometry member, not e.g. an object with "coordinates" in the properties.
+    if obj.get("type") == "Feature" and "geometry" in obj:
+        obj["geometry"] = _pack_geometries(obj["geometry"])
+    return obj
+
+
+def loads_packed(data: Union[str, bytes]) -> Any:
+    """Decodes GeoJSON with the coordinates of the geometries packed as `PackedGeometry`."""
+    return _pack_geometries(json.loads(data, object_hook=_object_hook))
+
+
+def load_packed(fp: Any) -> Any:
+    """Like `loads_packed`, from a file object."""
+    return _pack_geometries(json.load(fp, object_hook=_object_hook))
@@ -0,0 +1,307 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+import json
+import mmap
+import os
+
+from loguru import logger
+import numpy as np
+
+from .geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    ALLOWED_PROBLEMATIC_CRITERIA,
+    CROSS_FEATURE_CRITERIA,
+    check_criteria,
+    check_criteria_options,
+    compile_plan,
+    _collect,
+)
+from .geometry_arrays import _Parts, _flag_parts
+from .feature_index import feature_byte_ranges, write_feature_index
+from .geometry_utils import (
+    ALL_ACCEPTED_GEOMETRY_TYPES,
+    input_to_geojson,
+    geojson_geometries,
+)
+from .packed import Layout, PackedGeometries
+from .partition import validate_partition, merge_results
+from .results import ValidationResults
+from .sources import decompressed
+
+_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def _chunks(starts: array, ends: array, chunk_bytes: int) -> List[Tuple[int, int, int]]:
+    """Groups consecutive features into (start byte, end byte, first feature index) chunks."""
+    chunks = []
+    first = 0
+    for i, end in enumerate(ends):
+        if end - starts[first] >= chunk_bytes or i == len(ends) - 1:
+            chunks.append((starts[first], end, first))
+            first = i + 1
+    return chunks
+
+
+def _validate_byte_range(
+    filepath: Union[str, Path],
+    byte_range: Tuple[int, int, int],
+    criteria: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Parses and validates the consecutive features in the byte range, in a worker."""
+    start, end, offset = byte_range
+    with Path(filepath).open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            # The features with the commas between them, parsed as one array.
+            features = json.loads(b"[" + buffer[start:end] + b"]")
+    return validate_partition(features, offset, **criteria)
+
+
+def validate_file_parallel(
+    filepath: Union[str, Path],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    *,
+    workers: Optional[int] = None,
+    chunk_bytes: int = _CHUNK_BYTES,
+    save_index: bool = False,
+) -> Dict[str, Any]:
+    """
+    Validate the geometries of a large FeatureCollection file, parsing it in parallel.
+
+    The file is memory-mapped and split into byte ranges of whole features, which worker
+    processes each parse and validate. The results are the same as `validate_geometries`.
+
+    Args:
+        filepath: Filepath to a GeoJSON FeatureCollection.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+        criteria_options: Options of the criteria that compare the features with each other,
+            e.g. {"duplicate_features": {"normalize": True}}.
+        workers: The number of worker processes, by default the number of CPUs. With 1, the
+            byte ranges are validated one after another in this process.
+        chunk_bytes: The maximum size of the byte range a worker parses at once, bounds
+            the memory per worker.
+        save_index: Also save the found feature positions as the file's sidecar index, so
+            e.g. the flagged features can afterwards be re-checked with
+            `validate_geometries(filepath, feature_indices=...)` without a full parse.
+
+    Returns:
+        A dictionary with the violated criteria and the affected feature indices, e.g.
+        {"invalid": {"unclosed": [0]}, "problematic": {}, ...}.
+    """
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(
+        criteria_problematic, ALLOWED_PROBLEMATIC_CRITERIA, name="problematic"
+    )
+    check_criteria_options(criteria_options, criteria_problematic)
+    criteria: Dict[str, Any] = {
+        "criteria_invalid": criteria_invalid,
+        "criteria_problematic": criteria_problematic,
+        "criteria_options": criteria_options,
+    }
+    workers = workers or os.cpu_count() or 1
+
+    try:
+        with Path(filepath).open("rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                starts, ends = feature_byte_ranges(buffer)
+        if save_index:
+            write_feature_index(filepath, starts, ends)
+    except ValueError as error:
+        # E.g. a single Feature, an empty file, or a feature that is not an object.
+        logger.info(f"File can not be split by features ({error}), reading it whole.")
+        with Path(filepath).open("rb") as f:
+            # E.g. a compressed file, which is read whole.
+            geojson_input = input_to_geojson(json.load(decompressed(f, None)))
+        partitions = [validate_partition(geojson_input, 0, **criteria)]
+    else:
+        if len(starts):
+            # Enough chunks to keep all workers busy, also for smaller files.
+            span = ends[-1] - starts[0]
+            chunk_bytes = min(chunk_bytes, max(1, span // (workers * 4)))
+        chunks = _chunks(starts, ends, chunk_bytes)
+        if workers == 1 or len(chunks) <= 1:
+            partitions = [_validate_byte_range(filepath, c, criteria) for c in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partitions = list(
+                    executor.map(
+                        _validate_byte_range,
+                        [filepath] * len(chunks),
+                        chunks,
+                        [criteria] * len(chunks),
+                    )
+                )
+    results = merge_results(partitions)
+    logger.info(f"Validation results: {results}")
+    return results
+
+
+def _add_array_flags(
+    results: ValidationResults,
+    packed: PackedGeometries,
+    indices: np.ndarray,
+    criteria: Dict[str, Any],
+) -> None:
+    """Runs the vectorized checks on features of one geometry type and dimension."""
+    geometry_type = ALL_ACCEPTED_GEOMETRY_TYPES[packed.feature_types[indices[0]]]
+    coords, levels = packed.ragged(indices)
+    parts = _Parts.from_ragged(geometry_type, coords, levels)
+    results.add_geometry_types(geometry_type, len(indices))
+    for criteria_type, selected in (
+        ("invalid", criteria["criteria_invalid"] or []),
+        ("problematic", criteria["criteria_problematic"] or []),
+    ):
+        for criterium in selected:
+            flagged = np.flatnonzero(_flag_parts(parts, criteria_type, criterium))
+            rows = parts.rows[flagged]
+            sub_indices = None
+            if geometry_type.startswith("Multi") and flagged.size:
+                # Like validate_geometries, {index: [sub-indices]} for a multi-geometry.
+                sub_index = flagged - levels[-1][rows]
+                splits = np.flatnonzero(np.diff(rows)) + 1
+                sub_indices = {
+                    int(indices[row[0]]): sub.tolist()
+                    for row, sub in zip(
+                        np.split(rows, splits), np.split(sub_index, splits)
+                    )
+                }
+            results.add_flagged(
+                criteria_type, criterium, np.unique(indices[rows]), sub_indices
+            )
+
+
+def _validate_shared_range(
+    shm_name: str,
+    layout: Layout,
+    fallback: Dict[int, Any],
+    feature_range: Tuple[int, int],
+    criteria: Dict[str, Any],
+) -> ValidationResults:
+    """Validates a range of the packed geometries in shared memory, in a worker."""
+    shm = SharedMemory(name=shm_name)
+    assert shm.buf is not None
+    try:
+        packed = PackedGeometries.from_shared_memory(shm.buf, layout, fallback)
+        start, stop = feature_range
+        results = ValidationResults()
+        # The checks run on the shared arrays, grouped by geometry type and dimension.
+        dims = packed.ragged_dims(start, stop)
+        groups = packed.feature_types[start:stop].astype(np.int64) * 4 + dims
+        for group in np.unique(groups[dims > 0]):
+            indices = start + np.flatnonzero(groups == group)
+            _add_array_flags(results, packed, indices, criteria)
+        # The few other geometries are checked one by one, e.g. those that shapely can
+        # not build, on which the GEOS based criteria are skipped.
+        others = (start + np.flatnonzero(dims == 0)).tolist()
+        _collect(
+            (packed.geometry(i) for i in others),
+            compile_plan(**criteria),
+            results,
+            indices=others,
+        )
+        # The views into the shared memory must be gone before it can be closed.
+        del packed
+    finally:
+        shm.close()
+    return results
+
+
+def validate_geometries_parallel(
+    geojson_input: Union[dict, str, Path, Any],
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    *,
+    workers: Optional[int] = None,
+    features_per_task: int = 10_000,
+) -> Dict[str, Any]:
+    """
+    Validate the geometries in worker processes, which read the coordinates from shared memory.
+
+    The coordinates are packed once into flat arrays in shared memory (`PackedGeometries`),
+    instead of pickling every feature to the workers. The workers run the vectorized
+    checks of `validate_geometry_array` on those arrays, only the few geometries that
+    shapely can not build are checked one by one. They return the compact flags of their
+    features (`ValidationResults`), so the traffic between the processes does not grow
+    with the number of vertices. The results are the same as `validate_geometries`.
+
+    Args:
+        geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            Not the criteria that compare the features with each other, use
+            `validate_file_parallel` for those.
+        workers: The number of worker processes, by default the number of CPUs. With 1, the
+            packed geometries are validated in this process.
+        features_per_task: The number of features a worker validates at once.
+
+    Returns:
+        A dictionary with the violated criteria and the affected feature indices, e.g.
+        {"invalid": {"unclosed": [0]}, "problematic": {}, ...}.
+    """
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    cross_feature = set(criteria_problematic or []) & set(CROSS_FEATURE_CRITERIA)
+    if cross_feature:
+        raise ValueError(
+            f"The criteria {sorted(cross_feature)} compare the features with each other and "
+            f"are not supported here, use `validate_file_parallel`"
+        )
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(criteria_problematic, PROBLEMATIC_CRITERIA, name="problematic")
+    if features_per_task < 1:
+        raise ValueError("`features_per_task` must be at least 1")
+    criteria: Dict[str, Any] = {
+        "criteria_invalid": criteria_invalid,
+        "criteria_problematic": criteria_problematic,
+    }
+    workers = workers or os.cpu_count() or 1
+
+    packed = PackedGeometries.from_geometries(
+        geojson_geometries(input_to_geojson(geojson_input))
+    )
+    ranges = [
+        (start, min(start + features_per_task, len(packed)))
+        for start in range(0, len(packed), features_per_task)
+    ]
+    # Each task only gets the few unpacked geometries of its own range.
+    tasks = [
+        {i: g for i, g in packed.fallback.items() if start <= i < stop}
+        for start, stop in ranges
+    ]
+    shm, layout = packed.to_shared_memory()
+    del packed
+    try:
+        args = ([shm.name] * len(ranges), [layout] * len(ranges), tasks, ranges)
+        if workers == 1 or len(ranges) <= 1:
+            partitions = list(
+                map(_validate_shared_range, *args, [criteria] * len(ranges))
+            )
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partitions = list(
+                    executor.map(
+                        _validate_shared_range, *args, [criteria] * len(ranges)
+                    )
+                )
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results = ValidationResults()
+    for partition in partitions:
+        results.merge(partition)
+    results_dict = results.to_dict()
+    logger.info(f"Validation results: {results_dict}")
+    return results_dict
@@ -0,0 +1,127 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from collections import Counter
+from itertools import count
+
+from .geometry_utils import geojson_geometries, iter_feature_geometries
+from .geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    ALLOWED_PROBLEMATIC_CRITERIA,
+    check_criteria,
+    check_criteria_options,
+    compile_plan,
+    _iter_validate,
+)
+from .results import DictResults
+
+# The key of a partition's results under which the unfinished cross-feature criteria are
+# handed to merge_results.
+PENDING_KEY = "pending_cross_feature"
+
+
+def validate_partition(
+    features: Union[dict, Iterable[Any]],
+    offset: int = 0,
+    criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+    criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+    criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Validate a slice of a larger collection, e.g. one shard in a map-reduce job.
+
+    Combine the results of all slices with `merge_results`, which gives the same results as
+    `validate_geometries` on the whole collection. Takes and returns only plain picklable
+    objects, so it can be submitted to any executor.
+
+    Args:
+        features: The GeoJSON Features (or geometries) of the slice, or a FeatureCollection.
+        offset: The index of the slice's first feature in the whole collection.
+        criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+        criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+        criteria_options: Options of the criteria that compare the features with each other,
+            e.g. {"duplicate_features": {"normalize": True}}.
+
+    Returns:
+        The results of the slice, with the feature indices of the whole collection. The
+        criteria that compare the features with each other are left unfinished, under
+        the "pending_cross_feature" key.
+    """
+    if not criteria_invalid and not criteria_problematic:
+        raise ValueError(
+            "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+        )
+    check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+    check_criteria(
+        criteria_problematic, ALLOWED_PROBLEMATIC_CRITERIA, name="problematic"
+    )
+    check_criteria_options(criteria_options, criteria_problematic)
+    plan = compile_plan(
+        criteria_invalid, criteria_problematic, criteria_options=criteria_options
+    )
+
+    if isinstance(features, dict):
+        geometries: Iterable[Any] = geojson_geometries(features)
+    else:
+        geometries = iter_feature_geometries(features)
+    accumulators = [(name, new()) for name, new in plan.cross_feature]
+    collector = DictResults()
+    for result, geometry_type, counted in _iter_validate(
+        geometries, plan, accumulators, count(offset)
+    ):
+        collector.add(result, geometry_type, counted)
+
+    results = collector.to_dict()
+    if accumulators:
+        results[PENDING_KEY] = dict(accumulators)
+    return results
+
+
+def _feature_index(entry: Any) -> int:
+    """The feature index of a results entry: an index, or {index: [sub-indices]}."""
+    return next(iter(entry)) if isinstance(entry, dict) else entry
+
+
+def merge_results(partition_results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the results of `validate_partition` into those of the whole collection.
+
+    Args:
+        partition_results: The results of every slice, in any order. Their unfinished
+            cross-feature criteria are merged into each other, so are used up.
+
+    Returns:
+        The same results as `validate_geometries` on the whole collection.
+    """
+    invalid: Dict[str, List[Any]] = {}
+    problematic: Dict[str, List[Any]] = {}
+    geometry_types: Counter = Counter()
+    skipped_validation: List[int] = []
+    pending: Dict[str, Any] = {}
+    for results in partition_results:
+        for merged, partial in (
+            (invalid, results["invalid"]),
+            (problematic, results["problematic"]),
+        ):
+            for criterium, entries in partial.items():
+                merged.setdefault(criterium, []).extend(entries)
+        geometry_types.update(results["count_geometry_types"])
+        skipped_validation.extend(results["skipped_validation"])
+        for criterium, accumulator in results.get(PENDING_KEY, {}).items():
+            if criterium in pending:
+                pending[criterium].merge(accumulator)
+            else:
+                pending[criterium] = accumulator
+
+    for merged in (invalid, problematic):
+        for entries in merged.values():
+            entries.sort(key=_feature_index)
+    for criterium, accumulator in pending.items():
+        cross_feature_result = accumulator.result()
+        if cross_feature_result:
+            problematic[criterium] = cross_feature_result
+    return {
+        "invalid": invalid,
+        "problematic": problematic,
+        "count_geometry_types": dict(geometry_types),
+        "skipped_validation": sorted(skipped_validation),
+    }
@@ -0,0 +1,265 @@
+from typing import (
+    Any,
+    Counter as CounterType,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+)
+from array import array
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+
+
+class FeatureResult(NamedTuple):
+    """The validation result of one feature."""
+
+    feature_index: int
+    # Per violated criterium, the feature index, or {index: [sub-indices]} for a
+    # multi-geometry with the violating sub-geometries.
+    flagged_invalid: Dict[str, Any]
+    flagged_problematic: Dict[str, Any]
+    # The geometry, or a sub-geometry of it, could not be checked.
+    skipped: bool
+
+
+class ResultsCollector(Protocol):
+    """Collects the results of the features, and of the criteria comparing them."""
+
+    def add(
+        self, result: FeatureResult, geometry_type: Optional[str], counted: bool
+    ) -> None: ...
+
+    def add_cross_feature(self, criterium: str, entries: List[Any]) -> None: ...
+
+
+class DictResults:
+    """Collects the feature results into the validate_geometries results dictionary."""
+
+    def __init__(self) -> None:
+        self.invalid: Dict[str, List[Any]] = {}
+        self.problematic: Dict[str, List[Any]] = {}
+        self.skipped_validation: List[int] = []
+        self.geometry_types: CounterType[Optional[str]] = Counter()
+
+    def add(
+        self, result: FeatureResult, geometry_type: Optional[str], counted: bool
+    ) -> None:
+        """
+        Args:
+            result: The result of the feature.
+            geometry_type: Its geometry type, None if missing.
+            counted: If the geometry type counts, not for a null or non-object geometry.
+        """
+        if counted:
+            self.geometry_types[geometry_type] += 1
+        if result.skipped:
+            self.skipped_validation.append(result.feature_index)
+        for criterium, flagged in result.flagged_invalid.items():
+            self.invalid.setdefault(criterium, []).append(flagged)
+        for criterium, flagged in result.flagged_problematic.items():
+            self.problematic.setdefault(criterium, []).append(flagged)
+
+    def add_cross_feature(self, criterium: str, entries: List[Any]) -> None:
+        if entries:
+            self.problematic[criterium] = entries
+
+    def to_dict(self) -> Dict[str, Any]:
+        # TODO: Results format better: feature1: flaws, feature4: flaws, feature9: flaws?
+        return {
+            "invalid": self.invalid,
+            "problematic": self.problematic,
+            "count_geometry_types": dict(self.geometry_types),
+            "skipped_validation": self.skipped_validation,
+        }
+
+
+class SummaryResults:
+    """Counts the features per violated criterium, without keeping their indices."""
+
+    def __init__(self) -> None:
+        self.invalid: CounterType[str] = Counter()
+        self.problematic: CounterType[str] = Counter()
+        self.skipped_validation = 0
+        self.geometry_types: CounterType[Optional[str]] = Counter()
+
+    def add(
+        self, result: FeatureResult, geometry_type: Optional[str], counted: bool
+    ) -> None:
+        """Same as `DictResults.add`."""
+        if counted:
+            self.geometry_types[geometry_type] += 1
+        self.skipped_validation += result.skipped
+        self.invalid.update(result.flagged_invalid.keys())
+        self.problematic.update(result.flagged_problematic.keys())
+
+    def add_cross_feature(self, criterium: str, entries: List[Any]) -> None:
+        if entries:
+            self.problematic[criterium] = len(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "invalid": dict(self.invalid),
+            "problematic": dict(self.problematic),
+            "count_geometry_types": dict(self.geometry_types),
+            "skipped_validation": self.skipped_validation,
+        }
+
+
+class ValidationResults:
+    """
+    Compact validation results, e.g. for millions of features that mostly violate a criterium.
+
+    Stores one bit per feature and criterium instead of a list of feature indices, and the
+    sub-geometry indices only for the multi-geometries. Convert to the usual results
+    dictionary with `to_dict()`.
+    """
+
+    def __init__(self) -> None:
+        self._bits: Dict[str, Dict[str, bytearray]] = {"invalid": {}, "problematic": {}}
+        self._sub_indices: Dict[str, Dict[str, Dict[int, Any]]] = {
+            "invalid": {},
+            "problematic": {},
+        }
+        self._cross_feature: Dict[str, List[Any]] = {}
+        self._skipped = array("q")
+        self._geometry_types: CounterType[Optional[str]] = Counter()
+
+    def add(
+        self, result: FeatureResult, geometry_type: Optional[str], counted: bool
+    ) -> None:
+        """Same as `DictResults.add`."""
+        if counted:
+            self._geometry_types[geometry_type] += 1
+        index = result.feature_index
+        if result.skipped:
+            self._skipped.append(index)
+        for criteria_type, flagged in (
+            ("invalid", result.flagged_invalid),
+            ("problematic", result.flagged_problematic),
+        ):
+            for criterium, value in flagged.items():
+                bits = self._bits[criteria_type].setdefault(criterium, bytearray())
+                byte = index >> 3
+                if byte >= len(bits):
+                    bits.extend(bytes(max(byte + 1 - len(bits), len(bits))))
+                bits[byte] |= 1 << (index & 7)
+                if isinstance(value, dict):
+                    sub_indices = self._sub_indices[criteria_type]
+                    sub_indices.setdefault(criterium, {}).update(value)
+
+    def add_flagged(
+        self,
+        criteria_type: str,
+        criterium: str,
+        indices: np.ndarray,
+        sub_indices: Optional[Dict[int, List[int]]] = None,
+    ) -> None:
+        """
+        Flags many features at once, e.g. from the vectorized checks.
+
+        Args:
+            criteria_type: "invalid" or "problematic".
+            criterium: The violated criterium.
+            indices: The indices of the violating features.
+            sub_indices: The violating sub-geometries of the multi-geometries by index.
+        """
+        if indices.size == 0:
+            return
+        bits = self._bits[criteria_type].setdefault(criterium, bytearray())
+        size = int(indices.max()) // 8 + 1
+        if size > len(bits):
+            bits.extend(bytes(max(size - len(bits), len(bits))))
+        view = np.frombuffer(bits, np.uint8)
+        np.bitwise_or.at(view, indices >> 3, (1 << (indices & 7)).astype(np.uint8))
+        del view  # a view would keep the bytearray from growing
+        if sub_indices:
+            self._sub_indices[criteria_type].setdefault(criterium, {}).update(
+                sub_indices
+            )
+
+    def add_geometry_types(self, geometry_type: str, count: int) -> None:
+        """Counts many features of the geometry type at once, like `add`."""
+        self._geometry_types[geometry_type] += count
+
+    def add_cross_feature(self, criterium: str, entries: List[Any]) -> None:
+        if entries:
+            self._cross_feature[criterium] = entries
+
+    def merge(self, other: "ValidationResults") -> None:
+        """Adds the results of another part of the collection, e.g. from a worker process."""
+        for criteria_type in ("invalid", "problematic"):
+            for criterium, other_bits in other._bits[criteria_type].items():
+                bits = self._bits[criteria_type].setdefault(criterium, bytearray())
+                if len(bits) < len(other_bits):
+                    bits.extend(bytes(len(other_bits) - len(bits)))
+                merged = np.frombuffer(bits, np.uint8)[: len(other_bits)]
+                merged |= np.frombuffer(other_bits, np.uint8)
+                del merged  # a view would keep the bytearray from growing
+            for criterium, sub_indices in other._sub_indices[criteria_type].items():
+                self._sub_indices[criteria_type].setdefault(criterium, {}).update(
+                    sub_indices
+                )
+        self._skipped.extend(other._skipped)
+        self._geometry_types.update(other._geometry_types)
+        self._cross_feature.update(other._cross_feature)
+
+    def flagged(self, criterium: str) -> np.ndarray:
+        """The sorted indices of the features that violate the criterium."""
+        for criteria_type in ("invalid", "problematic"):
+            if criterium in self._bits[criteria_type]:
+                bits = np.frombuffer(self._bits[criteria_type][criterium], np.uint8)
+                return np.flatnonzero(np.unpackbits(bits, bitorder="little"))
+        if criterium in self._cross_feature:
+            # The groups of duplicate features can differ in size.
+            indices = chain.from_iterable(self._cross_feature[criterium])
+            return np.unique(np.fromiter(indices, dtype=np.int64))
+        return np.empty(0, dtype=np.int64)
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        The number of results per violated criterium, e.g. {"invalid": {"unclosed": 3}, ...}:
+        of features, or of groups/pairs for the criteria that compare features.
+        """
+        counts: Dict[str, Dict[str, int]] = {
+            criteria_type: {
+                criterium: int(
+                    np.unpackbits(np.frombuffer(bits, np.uint8)).sum(dtype=np.int64)
+                )
+                for criterium, bits in self._bits[criteria_type].items()
+            }
+            for criteria_type in ("invalid", "problematic")
+        }
+        for criterium, entries in self._cross_feature.items():
+            counts["problematic"][criterium] = len(entries)
+        return counts
+
+    @property
+    def count_geometry_types(self) -> Dict[Optional[str], int]:
+        return dict(self._geometry_types)
+
+    @property
+    def skipped_validation(self) -> np.ndarray:
+        return np.array(self._skipped, dtype=np.int64)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The results in the format `validate_geometries` returns by default."""
+        results: Dict[str, Any] = {}
+        for criteria_type in ("invalid", "problematic"):
+            results[criteria_type] = {}
+            for criterium in self._bits[criteria_type]:
+                sub_indices = self._sub_indices[criteria_type].get(criterium, {})
+                results[criteria_type][criterium] = [
+                    {index: sub_indices[index]} if index in sub_indices else index
+                    for index in self.flagged(criterium).tolist()
+                ]
+        results["problematic"].update(self._cross_feature)
+        results["count_geometry_types"] = self.count_geometry_types
+        results["skipped_validation"] = sorted(self._skipped)
+        return results
+
+    def __repr__(self) -> str:
+        return f"ValidationResults({self.counts()})"
@@ -1,5 +1,7 @@
 from typing import Any, Dict, List, Optional, Union
 
+from .packed_json import PackedGeometry
+
 
 class GeoJsonLint:
     """
@@ -29,27 +31,37 @@ class GeoJsonLint:
         "Feature",
     ] + GEOMETRY_TYPES
 
-    def __init__(self, check_crs: bool = False):
+    def __init__(self, check_crs: bool = False, summary_only: bool = False):
+        """
+        Args:
+            check_crs: Also flag a crs member, which the GeoJSON specification disallows.
+            summary_only: Only count the occurrences of each error message, instead of
+                listing their paths and feature indices.
+        """
         self.check_crs = check_crs
+        self.summary_only = summary_only
         self.feature_idx: Optional[int] = None
         self.errors: Dict[str, Dict[str, List[Any]]] = {}
+        self.error_counts: Dict[str, int] = {}
 
-    def lint(self, geojson_data: Union[dict, Any]) -> Dict[str, Dict[str, List[Any]]]:
+    def lint(self, geojson_data: Union[dict, Any]) -> Dict[str, Any]:
         # Reset, so a reused instance does not report the previous call's errors.
         self.errors = {}
+        self.error_counts = {}
         self.feature_idx = None
 
         root_path = ""
-        if not isinstance(geojson_data, dict):
+        if not isinstance(geojson_data, (dict, PackedGeometry)):
             self._add_error("Root of GeoJSON must be an object/dictionary", root_path)
-            return self.errors
-
-        self._validate_geojson_root(geojson_data)
+        else:
+            self._validate_geojson_root(geojson_data)
 
-        return self.errors
+        return self.error_counts if self.summary_only else self.errors
 
     def _add_error(self, message: str, path: str) -> None:
-        if message not in self.errors:
+        if self.summary_only:
+            self.error_counts[message] = self.error_counts.get(message, 0) + 1
+        elif message not in self.errors:
             self.errors[message] = {"path": [path]}
             if self.feature_idx is not None:
                 self.errors[message]["feature"] = [self.feature_idx]
@@ -95,7 +107,7 @@ class GeoJsonLint:
         ):  # allowed to be empty
             for idx, feature in enumerate(feature_collection["features"]):
                 self.feature_idx = idx
-                if not isinstance(feature, dict):
+                if not isinstance(feature, (dict, PackedGeometry)):
                     self._add_error(
                         "Every feature must be a dictionary/object.",
                         f"{path}/features/{idx}",
@@ -128,7 +140,9 @@ class GeoJsonLint:
         if bbox:
             self._validate_bbox(bbox, f"{path}/bbox")
 
-    def _validate_geometry(self, geometry: dict, path: str) -> None:
+    def _validate_geometry(
+        self, geometry: Union[dict, PackedGeometry], path: str
+    ) -> None:
         """Validate that the geometry object conforms to the requirements."""
         if self._is_invalid_type_property(
             geometry, self.GEOMETRY_TYPES, f"{path}/type"
@@ -136,10 +150,15 @@ class GeoJsonLint:
             return
 
         obj_type = geometry["type"]
-        if obj_type == "GeometryCollection":
+        if isinstance(geometry, PackedGeometry):
+            # Only regular coordinates are packed, there is nothing to report on them.
+            pass
+        elif obj_type == "GeometryCollection":
             if not self._is_invalid_property(geometry, "geometries", "array", path):
                 for idx, geom in enumerate(geometry["geometries"]):
-                    if not self._is_invalid_datatype(
+                    if isinstance(
+                        geom, PackedGeometry
+                    ) or not self._is_invalid_datatype(
                         geom, dict, path
                     ):  # geometries: [false]
                         self._validate_geometry(geom, f"{path}/geometries/{idx}")
@@ -178,7 +197,7 @@ class GeoJsonLint:
             allowed_types: List of the allowed types to check against.
             path: The line_map path pointing to the type property in question.
         """
-        if not isinstance(obj, dict):
+        if not isinstance(obj, (dict, PackedGeometry)):
             return True
         obj_type = obj.get("type")
         if obj_type is None:
@@ -221,7 +240,7 @@ class GeoJsonLint:
         if required_type == "object":
             if property_name in ["geometry", "properties"] and property_value is None:
                 return False
-            if not isinstance(property_value, dict):
+            if not isinstance(property_value, (dict, PackedGeometry)):
                 self._add_error(
                     f'"{property_name}" member must be an object/dictionary, but is a {property_type} instead',
                     path,
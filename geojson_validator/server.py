@@ -0,0 +1,363 @@
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import json
+import os
+import socketserver
+import statistics
+import threading
+import time
+
+from loguru import logger
+
+from .batch import (
+    _FileValidator,
+    error_report,
+    expand_paths,
+    submit_files,
+    validate_body,
+    worker_pool,
+)
+from .geometry_validation import INVALID_CRITERIA, PROBLEMATIC_CRITERIA
+
+# The latencies of the last requests that the metrics are computed from.
+_LATENCY_WINDOW = 10_000
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class _Metrics:
+    """The request counts and latencies of a `ValidationServer`, shared by its threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.counts = {"requests": 0, "rejected": 0, "errors": 0, "in_flight": 0}
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += value
+
+    def add_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            metrics: Dict[str, Any] = dict(self.counts)
+        if latencies:
+            # Before Python 3.13, quantiles raises for a single value.
+            if len(latencies) == 1:
+                percentiles = latencies * 99
+            else:
+                percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+            metrics["latency_ms"] = {
+                "mean": 1000 * statistics.fmean(latencies),
+                "p50": 1000 * percentiles[49],
+                "p95": 1000 * percentiles[94],
+                "p99": 1000 * percentiles[98],
+                "max": 1000 * latencies[-1],
+            }
+        return metrics
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "geojson-validator"
+    # Set on the subclass of each server.
+    validation_server: "ValidationServer"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if self.path == "/metrics":
+            self._send_json(200, self.validation_server.metrics())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        if self.path not in ("/validate", "/validate-files"):
+            self._send_json(404, {"error": f"Unknown path {self.path}"}, close=True)
+            return
+        server = self.validation_server
+        # Backpressure before the body is read, a full server does not buffer the uploads
+        # of the requests that it rejects.
+        if not server.slots.acquire(blocking=False):
+            server.stats.count("rejected")
+            self.send_response(503)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            return
+        try:
+            body = self._read_body()
+            if body is not None:
+                self._validate(body)
+        finally:
+            server.slots.release()
+
+    def _read_body(self) -> Optional[bytes]:
+        """The request body, or None if the request was answered with an error."""
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._send_json(411, {"error": "Content-Length required"}, close=True)
+            return None
+        # Not int(), which accepts e.g. "-1", " 1" and "1_000".
+        if not (length.isascii() and length.isdigit()):
+            self._send_json(400, {"error": "Invalid Content-Length"}, close=True)
+            return None
+        max_body_bytes = self.validation_server.max_body_bytes
+        if int(length) > max_body_bytes:
+            self._send_json(
+                413,
+                {"error": f"The body is larger than {max_body_bytes} bytes"},
+                close=True,
+            )
+            return None
+        return self.rfile.read(int(length))
+
+    def _validate(self, body: bytes) -> None:
+        server = self.validation_server
+        start = time.perf_counter()
+        server.stats.count("requests")
+        server.stats.count("in_flight")
+        executor = server.executor
+        try:
+            if self.path == "/validate":
+                report = server.submit(validate_body, body).result()
+                self._send_json(200, report)
+            else:
+                self._stream_files(body)
+        except Exception as error:  # pylint: disable=broad-except
+            # E.g. a crashed worker, the server keeps serving the other requests.
+            if isinstance(error, BrokenProcessPool):
+                server.replace_broken_pool(executor)
+            server.stats.count("errors")
+            logger.exception("Validation request failed")
+            self.close_connection = True
+            if self.path == "/validate":
+                self._send_json(500, {"error": "Validation failed"})
+        finally:
+            server.stats.count("in_flight", -1)
+            server.stats.add_latency(time.perf_counter() - start)
+
+    def _stream_files(self, body: bytes) -> None:
+        """Validates the files of a json list of filepaths/globs, one json line per file."""
+        try:
+            sources = json.loads(body)
+            paths = expand_paths(sources if isinstance(sources, list) else [sources])
+        except (ValueError, TypeError) as error:
+            self._send_json(
+                400, {"error": f"Expected a json list of filepaths: {error}"}
+            )
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        reported: Set[str] = set()
+        try:
+            for report in self.validation_server.submit_paths(paths):
+                self._write_chunk(report)
+                reported.add(report["path"])
+        except Exception as error:
+            # E.g. a broken worker pool, the files that are left are reported as failed.
+            for path in paths:
+                if path not in reported:
+                    self._write_chunk(error_report(path, error))
+            raise
+        finally:
+            # The response is always complete, the status is sent already.
+            self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, report: Dict[str, Any]) -> None:
+        line = json.dumps(report).encode() + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: Any, close: bool = False) -> None:
+        """Sends the json response, with `close` e.g. if the request body was not read."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # The client address of a unix socket is empty.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(
+        self, format: str, *args: Any  # pylint: disable=redefined-builtin
+    ) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ValidationServer:
+    """
+    A long-running local validation service over HTTP or a unix socket, for pipelines that
+    would otherwise start a Python process (and import shapely) per validation.
+
+    A warm pool of worker processes compiles the criteria once and validates the requests:
+
+    - `POST /validate` with a GeoJSON body returns its report as json, e.g.
+      {"structure": {...}, "geometries": {"invalid": {...}, ...}, "valid": False}.
+    - `POST /validate-files` with a json list of filepaths or glob patterns streams one json
+      line per file as soon as it is done, like `validate_files`.
+    - `GET /metrics` returns the request counts and latencies in milliseconds.
+
+    At most `max_pending` validation requests are handled at once, further requests are
+    rejected with "503 Service Unavailable" and a Retry-After header, before their body is
+    read. Request bodies larger than `max_body_bytes` are rejected with "413 Content Too
+    Large".
+
+    Example:
+        with ValidationServer(("127.0.0.1", 8080), workers=4) as server:
+            server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        address: Union[Tuple[str, int], str, Path] = ("127.0.0.1", 8080),
+        criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+        criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+        criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        *,
+        check_structure: bool = True,
+        check_crs: bool = False,
+        workers: Optional[int] = None,
+        max_pending: int = 64,
+        max_body_bytes: int = 256 * 2**20,
+    ):
+        """
+        Args:
+            address: A (host, port) tuple, port 0 for any free port, or the path of a unix
+                socket.
+            criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+            criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            criteria_options: Options of the criteria that compare the features with each
+                other, e.g. {"duplicate_features": {"normalize": True}}.
+            check_structure: Also validate the structure of each input.
+            check_crs: Also flag a crs member, see `validate_structure`.
+            workers: The number of worker processes, by default the number of CPUs.
+            max_pending: The number of validation requests handled at once.
+            max_body_bytes: The largest request body in bytes, by default 256 MiB.
+        """
+        options: Dict[str, Any] = {
+            "check_structure": check_structure,
+            "check_crs": check_crs,
+            "criteria_invalid": criteria_invalid,
+            "criteria_problematic": criteria_problematic,
+            "criteria_options": criteria_options,
+        }
+        _FileValidator(options)  # Raises for unknown criteria here, not in the workers.
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.max_body_bytes = max_body_bytes
+        self.stats = _Metrics()
+        self._options = options
+        self._workers = workers or os.cpu_count() or 1
+        self._pool_lock = threading.Lock()
+        self.executor = self._start_pool()
+
+        handler = type("Handler", (_Handler,), {"validation_server": self})
+        self._httpd: socketserver.BaseServer
+        if isinstance(address, tuple):
+            self._httpd = ThreadingHTTPServer(address, handler)
+            self.address: Union[Tuple[str, int], str] = self._httpd.server_address[:2]  # type: ignore[assignment]
+        else:
+            Path(address).unlink(missing_ok=True)
+            self._httpd = _UnixHTTPServer(str(address), handler)
+            self.address = str(address)
+        logger.info(f"Validation server listening on {self.address}")
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        executor = worker_pool(self._options, self._workers)
+        # Starts all workers now, so the first requests do not wait for the imports.
+        for future in [executor.submit(time.sleep, 0.01) for _ in range(self._workers)]:
+            future.result()
+        return executor
+
+    def replace_broken_pool(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Replaces the worker pool after a worker process died, e.g. killed by the OOM killer,
+        which breaks the whole pool. Only once, if several requests find it broken.
+        """
+        with self._pool_lock:
+            if self.executor is not broken:
+                return
+            logger.warning("A worker process died, restarting the worker pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._start_pool()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Submits the job to the worker pool. If the pool broke before, the job did not run
+        and is submitted again to a new pool.
+        """
+        executor = self.executor
+        try:
+            return executor.submit(func, *args)
+        except BrokenProcessPool:
+            self.replace_broken_pool(executor)
+            return self.executor.submit(func, *args)
+
+    def submit_paths(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Validates the files in the worker pool like `submit_files`. If the pool broke
+        before, no file was submitted and they are submitted again to a new pool.
+        """
+        executor = self.executor
+        try:
+            yield from submit_files(executor, paths)
+        except BrokenProcessPool:
+            # Only raised by the submission, before any report. The files of a worker
+            # that dies later are reported with an error.
+            self.replace_broken_pool(executor)
+            yield from submit_files(self.executor, paths)
+
+    def metrics(self) -> Dict[str, Any]:
+        """The request counts and the latencies of the last requests in milliseconds."""
+        return self.stats.to_dict()
+
+    def serve_forever(self) -> None:
+        """Handles requests until `shutdown` is called, e.g. from another thread."""
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stops `serve_forever`."""
+        self._httpd.shutdown()
+
+    def close(self) -> None:
+        """Closes the socket and stops the worker processes."""
+        self._httpd.server_close()
+        self.executor.shutdown(cancel_futures=True)
+        if isinstance(self.address, str):
+            Path(self.address).unlink(missing_ok=True)
+
+    def __enter__(self) -> "ValidationServer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,247 @@
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeGuard,
+    TypeVar,
+    Union,
+)
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+import bz2
+import gzip
+import io
+import lzma
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .url_cache import UrlCache
+
+T = TypeVar("T")
+
+GEOJSON_SUFFIXES = (".json", ".geojson")
+# The compression of a file by its last suffix, e.g. data.geojson.gz.
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+# The first bytes of each compression format, no json text starts with them.
+_MAGIC_BYTES = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+# The HTTP responses that are retried, e.g. a rate limit or an overloaded server.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# The session that all url inputs are read with, see `configure_http`.
+_HTTP: Dict[str, Any] = {}
+_HTTP_LOCK = threading.Lock()
+
+
+def _new_session(
+    retries: int, backoff_factor: float, pool_maxsize: int
+) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        # The last response is returned, raise_for_status then gives a clear HTTP error.
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def configure_http(
+    timeout: Union[float, Tuple[float, float]] = (5, 30),
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    pool_maxsize: int = 10,
+    *,
+    cache_dir: Optional[Union[str, Path]] = None,
+    cache_max_bytes: int = 2**30,
+) -> requests.Session:
+    """
+    Configures how url inputs are requested. All urls are read with one shared
+    `requests.Session`, so the connections (and their TLS setup) to a host are reused.
+
+    Args:
+        timeout: Seconds to wait for the connection and for the next bytes of the response,
+            as one number or a (connect, read) tuple. It is no limit for the whole download,
+            so large files do not time out while their bytes keep arriving.
+        retries: How often a failed connection or a response with a status of
+            `RETRY_STATUSES` is retried.
+        backoff_factor: The wait before the n-th retry is backoff_factor * 2 ** (n - 1)
+            seconds, a Retry-After header of the server is respected.
+        pool_maxsize: The number of connections kept open per host, e.g. for reading urls
+            from several threads.
+        cache_dir: Opt-in directory of a `UrlCache`, which stores the body of each url with
+            its ETag/Last-Modified and revalidates it with a conditional request. While a
+            url is not modified, its body is not downloaded again and the validation
+            results of `validate_structure` and `validate_geometries` are reused.
+        cache_max_bytes: The size of the cache, the least recently used urls are evicted
+            beyond it.
+
+    Returns:
+        The new session, e.g. to add authentication headers.
+    """
+    session = _new_session(retries, backoff_factor, pool_maxsize)
+    cache = None if cache_dir is None else UrlCache(cache_dir, cache_max_bytes)
+    with _HTTP_LOCK:
+        previous = _HTTP.get("session")
+        _HTTP.update(session=session, timeout=timeout, cache=cache)
+    if previous is not None:
+        previous.close()
+    return session
+
+
+def http_session() -> Tuple[requests.Session, Union[float, Tuple[float, float]]]:
+    """The shared session and timeout of the url requests, with the defaults of
+    `configure_http` on first use."""
+    with _HTTP_LOCK:
+        if "session" not in _HTTP:
+            _HTTP.update(
+                session=_new_session(retries=3, backoff_factor=0.5, pool_maxsize=10),
+                timeout=(5, 30),
+                cache=None,
+            )
+        return _HTTP["session"], _HTTP["timeout"]
+
+
+def is_url(fp_or_url: Union[str, Path]) -> bool:
+    return urlparse(str(fp_or_url)).scheme in ("http", "https", "ftp", "ftps")
+
+
+def is_cached_url(fp_or_url: Any) -> TypeGuard[Union[str, Path]]:
+    """Whether the input is a url that is read through the cache of `configure_http`."""
+    return (
+        _HTTP.get("cache") is not None
+        and isinstance(fp_or_url, (str, Path))
+        and is_url(fp_or_url)
+    )
+
+
+def validate_cached(
+    url: Union[str, Path], key: Hashable, validate: Callable[[Path], T]
+) -> T:
+    """
+    The stored result of the key while the url is not modified, else `validate` of the
+    stored body, see `UrlCache.cached_result`.
+
+    Args:
+        url: A url with `is_cached_url`.
+        key: The validation function and its options, e.g. the criteria.
+        validate: Validates the stored body of the url at the given path.
+    """
+    check_geojson_source(url)
+    session, timeout = http_session()
+    cache: UrlCache = _HTTP["cache"]
+    return cache.cached_result(str(url), key, validate, session, timeout)
+
+
+def check_geojson_source(fp_or_url: Union[str, Path]) -> Optional[str]:
+    """
+    Checks the suffix of a (Geo)JSON filepath or url, optionally compressed, e.g.
+    data.geojson.gz.
+
+    Returns:
+        The compression of the suffix, e.g. "gzip", None for a plain (Geo)JSON.
+    """
+    # For urls the suffix must come from the path only, a query string would be part of it.
+    path = Path(urlparse(str(fp_or_url)).path if is_url(fp_or_url) else fp_or_url)
+    compression = COMPRESSION_SUFFIXES.get(path.suffix.lower())
+    if compression:
+        path = path.with_suffix("")
+    if path.suffix.lower() not in GEOJSON_SUFFIXES:
+        raise ValueError("Filepath or URL must be a geojson or json file")
+    return compression
+
+
+def _zstd_reader(stream: BinaryIO) -> Any:
+    try:
+        from compression import zstd  # pylint: disable=import-outside-toplevel
+
+        return zstd.ZstdFile(stream)
+    except ImportError:  # before Python 3.14
+        pass
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(
+            "Reading zstd compressed GeoJSON requires Python >= 3.14 or the zstandard "
+            "package, install it with `pip install geojson-validator[zstd]`"
+        ) from error
+    return zstandard.ZstdDecompressor().stream_reader(stream)
+
+
+def decompressed(stream: io.BufferedReader, compression: Optional[str]) -> BinaryIO:
+    """
+    The stream, decompressed while it is read. The compression is detected from the first
+    bytes, else taken from the suffix.
+    """
+    magic = stream.peek(6)[:6]
+    for prefix, name in _MAGIC_BYTES.items():
+        if magic.startswith(prefix):
+            compression = name
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream)  # type: ignore[return-value]
+    if compression == "bz2":
+        return bz2.BZ2File(stream)  # type: ignore[return-value]
+    if compression == "xz":
+        return lzma.LZMAFile(stream)  # type: ignore[return-value]
+    if compression == "zstd":
+        return _zstd_reader(stream)
+    return stream
+
+
+@contextmanager
+def open_geojson_source(fp_or_url: Union[str, Path]) -> Iterator[BinaryIO]:
+    """
+    Opens a (Geo)JSON filepath or url as a binary stream, transparently decompressing
+    gzip, bz2, xz or zstd. Nothing is read ahead, so the decompressed json can be parsed
+    incrementally, also while the bytes of a url are still arriving. Urls are requested with
+    the shared session of `configure_http`, and with its cache first stored on disk.
+
+    Args:
+        fp_or_url: Filepath or url to a (Geo)JSON, optionally compressed, e.g. data.geojson.gz.
+    """
+    compression = check_geojson_source(fp_or_url)
+    if is_url(fp_or_url):
+        session, timeout = http_session()
+        cache: Optional[UrlCache] = _HTTP["cache"]
+        if cache is not None:
+            fp_or_url, _ = cache.fetch(str(fp_or_url), session, timeout)
+    if is_url(fp_or_url):
+        response = session.get(str(fp_or_url), timeout=timeout, stream=True)
+        response.raise_for_status()  # raise a clear HTTP error instead of falling through to a file open
+        # A content encoding of the transfer, e.g. gzip, is undone by the raw stream.
+        response.raw.decode_content = True
+        try:
+            yield decompressed(io.BufferedReader(response.raw), compression)
+        finally:
+            response.close()
+    else:
+        with Path(fp_or_url).open("rb") as f:
+            yield decompressed(f, compression)
@@ -0,0 +1,110 @@
+from typing import BinaryIO, Iterator, Optional, Union
+from pathlib import Path
+import json
+import re
+
+from .feature_index import _features_array_start
+from .geometry_utils import any_geojson_to_featurecollection, input_to_geojson
+from .sources import check_geojson_source, open_geojson_source
+
+# Like the feature index tokens, and a lone quote for a string that continues in the
+# next chunk of the stream.
+_STREAM_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]|"')
+_CHUNK_BYTES = 1024 * 1024
+
+
+def _read_more(stream: BinaryIO, buffered: int, chunk_bytes: int) -> bytes:
+    # At least as much as is buffered, so a large feature is only rescanned a few times.
+    return stream.read(max(chunk_bytes, buffered))
+
+
+def _iter_stream_features(stream: BinaryIO, chunk_bytes: int) -> Iterator[dict]:
+    buffer = b""
+    while True:
+        chunk = _read_more(stream, len(buffer), chunk_bytes)
+        buffer += chunk
+        try:
+            pos = _features_array_start(buffer)
+            break
+        except ValueError as error:
+            if chunk:
+                continue  # e.g. the "features" member is not read yet
+            geojson_data = input_to_geojson(json.loads(buffer))
+            if geojson_data.get("type") == "FeatureCollection":
+                raise error
+            # E.g. a single Feature, it is read whole.
+            yield from any_geojson_to_featurecollection(geojson_data)["features"]
+            return
+
+    # The position to continue scanning from, the start of the current feature and the
+    # end of the last one.
+    scan = gap_start = pos
+    start = -1
+    depth = count = 0
+    while True:
+        for match in _STREAM_TOKEN.finditer(buffer, scan):
+            token = match.group()
+            if token == b'"':
+                break  # an incomplete string, scanned again with the next chunk
+            if depth == 0:
+                gap = buffer[gap_start : match.start()].strip()
+                if gap.startswith(b"]"):
+                    return
+                if token != b"{":
+                    raise ValueError(f"Feature {count} is not an object")
+                if gap != (b"," if count else b""):
+                    raise ValueError(f"Expected ',' or ']' after feature {count - 1}")
+                start = match.start()
+            if token == b"{":
+                depth += 1
+            elif token == b"}":
+                depth -= 1
+                if depth == 0:
+                    yield json.loads(buffer[start : match.end()])
+                    count += 1
+                    gap_start = match.end()
+            scan = match.end()
+
+        # Only the current feature, or the gap after the last one, is kept.
+        keep = start if depth else gap_start
+        buffer, scan, start, gap_start = (
+            buffer[keep:],
+            scan - keep,
+            start - keep,
+            gap_start - keep,
+        )
+        chunk = _read_more(stream, len(buffer), chunk_bytes)
+        if not chunk:
+            if depth == 0 and buffer[gap_start:].strip().startswith(b"]"):
+                return
+            raise ValueError("Unterminated features array")
+        buffer += chunk
+
+
+def iter_features(
+    fp_or_url: Union[str, Path], chunk_bytes: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Lazily the Features of a GeoJSON file or url, parsing one feature at a time from the
+    stream, so neither the file nor the decompressed json is read into memory at once.
+
+    The source can be compressed with gzip, bz2, xz or zstd, detected from the suffix
+    (e.g. data.geojson.gz) or the first bytes. A single Feature or Geometry is read whole
+    and yielded as one Feature.
+
+    Args:
+        fp_or_url: Filepath or url to a (Geo)JSON, optionally compressed.
+        chunk_bytes: The number of bytes read from the stream at once.
+
+    Raises:
+        ValueError: On iterating, if the features can not be split, e.g. a feature is not
+            an object.
+    """
+    check_geojson_source(fp_or_url)
+
+    def features() -> Iterator[dict]:
+        with open_geojson_source(fp_or_url) as stream:
+            yield from _iter_stream_features(stream, chunk_bytes or _CHUNK_BYTES)
+
+    # The source is checked above on the call, the features only on iterating.
+    return features()
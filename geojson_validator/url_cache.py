@@ -0,0 +1,192 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
+from pathlib import Path
+from urllib.parse import urlparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+
+import requests
+from loguru import logger
+
+T = TypeVar("T")
+
+_META = ".meta.json"
+_RESULTS = ".results.pickle"
+
+
+def _touch(meta_path: Path) -> None:
+    """Marks the url as the most recently used, its meta file's mtime orders the eviction."""
+    # The precise clock, a new file's mtime can have the resolution of a kernel tick.
+    now = time.time_ns()
+    os.utime(meta_path, ns=(now, now))
+
+
+class UrlCache:
+    """
+    An on-disk cache of url inputs. The body of each url is stored together with its ETag
+    and Last-Modified headers, and revalidated with a conditional request on every use.
+    While the server answers "304 Not Modified", the stored body and the stored validation
+    results of the url are reused.
+
+    The least recently used urls are evicted when the cache exceeds `max_bytes`. Create it
+    with `configure_http(cache_dir=...)`.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 2**30):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+    def _body_path(self, url: str) -> Path:
+        # Keeps the suffixes, e.g. .geojson.gz, so the body is read like the url.
+        suffixes = "".join(Path(urlparse(url).path).suffixes[-2:])
+        return self.directory / f"{self._key(url)}{suffixes}"
+
+    def _read_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        meta_path = self.directory / f"{self._key(url)}{_META}"
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not self._body_path(url).exists():
+            return None
+        return meta
+
+    def _tmp_path(self, path: Path) -> Path:
+        # Per thread and process, which can store the same url at the same time.
+        return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp = self._tmp_path(path)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # Readers never see a partially written file.
+
+    def fetch(
+        self,
+        url: str,
+        session: requests.Session,
+        timeout: Union[float, Tuple[float, float]],
+    ) -> Tuple[Path, bool]:
+        """
+        Revalidates the stored body of the url with a conditional request, or downloads it.
+
+        Returns:
+            The path of the stored body, and whether it is unchanged since it was stored.
+        """
+        meta = self._read_meta(url)
+        headers = {}
+        if meta is not None and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta is not None and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        body_path = self._body_path(url)
+        meta_path = self.directory / f"{self._key(url)}{_META}"
+
+        response = session.get(url, timeout=timeout, stream=True, headers=headers)
+        try:
+            if response.status_code == 304 and meta is not None:
+                logger.info(f"Using the cached body of {url}, it is not modified")
+                _touch(meta_path)
+                return body_path, True
+            response.raise_for_status()
+            # A content encoding of the transfer, e.g. gzip, is undone by the raw stream.
+            response.raw.decode_content = True
+            tmp = self._tmp_path(body_path)
+            with tmp.open("wb") as f:
+                shutil.copyfileobj(response.raw, f)
+        finally:
+            response.close()
+        with self._lock:
+            os.replace(tmp, body_path)
+            # The results of the previous body are outdated.
+            (self.directory / f"{self._key(url)}{_RESULTS}").unlink(missing_ok=True)
+            self._write(
+                meta_path,
+                json.dumps(
+                    {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                ).encode(),
+            )
+            _touch(meta_path)
+            self._evict(keep=self._key(url))
+        return body_path, False
+
+    def cached_result(
+        self,
+        url: str,
+        key: Hashable,
+        validate: Callable[[Path], T],
+        session: requests.Session,
+        timeout: Union[float, Tuple[float, float]],
+    ) -> T:
+        """
+        The stored result of `validate` with this key while the url is not modified, else
+        validates the (downloaded) body and stores its result.
+
+        Args:
+            url: The url input.
+            key: The validation function and its options, e.g. the criteria.
+            validate: Validates the stored body of the url at the given path.
+            session: The session of the requests.
+            timeout: The timeout of the requests.
+        """
+        body_path, not_modified = self.fetch(url, session, timeout)
+        results_path = self.directory / f"{self._key(url)}{_RESULTS}"
+        results: Dict[Hashable, Any] = {}
+        if not_modified:
+            try:
+                with results_path.open("rb") as f:
+                    results = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                results = {}
+            if key in results:
+                logger.info(f"Using the cached validation results of {url}")
+                return results[key]
+        result = validate(body_path)
+        with self._lock:
+            results[key] = result
+            self._write(results_path, pickle.dumps(results))
+            self._evict(keep=self._key(url))
+        return result
+
+    def size(self) -> int:
+        """The bytes of all stored urls."""
+        return sum(path.stat().st_size for path in self.directory.iterdir())
+
+    def _evict(self, keep: str) -> None:
+        """Removes the least recently used urls, except `keep`, down to `max_bytes`."""
+        entries: Dict[str, List[Path]] = {}
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp":  # Still being written.
+                continue
+            entries.setdefault(path.name[:32], []).append(path)
+        sizes = {
+            key: sum(path.stat().st_size for path in paths)
+            for key, paths in entries.items()
+        }
+        total = sum(sizes.values())
+
+        def last_used(key: str) -> float:
+            meta_path = self.directory / f"{key}{_META}"
+            return meta_path.stat().st_mtime if meta_path.exists() else 0.0
+
+        for key in sorted(entries, key=last_used):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for path in entries[key]:
+                path.unlink(missing_ok=True)
+            total -= sizes[key]
+            logger.info(f"Evicted cached url {key} from {self.directory}")
@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+from pathlib import Path
+
+from .geometry_utils import input_to_geojson, geojson_geometries
+from .geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    ALLOWED_PROBLEMATIC_CRITERIA,
+    ValidationPlan,
+    check_criteria,
+    check_criteria_options,
+    compile_plan,
+    _validate,
+)
+
+
+class Validator:
+    """
+    Validates geometries against a criteria selection that is checked and compiled once.
+
+    For validating many small inputs, e.g. single Features in a web API, where
+    `validate_geometries` would re-check and re-resolve the criteria on every call. The
+    compiled plan is immutable and no state is kept between calls, so one instance can be
+    shared between threads.
+
+    Example:
+        validator = Validator(criteria_problematic=["self_intersection"])
+        results = validator.validate(feature)
+    """
+
+    def __init__(
+        self,
+        criteria_invalid: Sequence[str] = INVALID_CRITERIA,
+        criteria_problematic: Sequence[str] = PROBLEMATIC_CRITERIA,
+        order_by_cost: bool = False,
+        stop_on_first_invalid: bool = False,
+        criteria_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Args:
+            criteria_invalid: A list of validation criteria that are invalid according the GeoJSON specification.
+            criteria_problematic: A list of validation criteria that are valid, but problematic with some tools.
+            order_by_cost: Run the cheap checks on the raw json first, and the checks that need
+                the geometry parsed by shapely last. Only the order of the criteria in the
+                results changes.
+            stop_on_first_invalid: Stop checking a geometry after the first invalid criterium it
+                violates, e.g. to skip the expensive self-intersection check of an unclosed
+                polygon. The results then only report whether a geometry is invalid, not all
+                the reasons why.
+            criteria_options: Options of the criteria that compare the features with each
+                other, e.g. {"duplicate_features": {"normalize": True}}.
+        """
+        if not criteria_invalid and not criteria_problematic:
+            raise ValueError(
+                "Select at least one criteria in `criteria_invalid` or `criteria_problematic`"
+            )
+        check_criteria(criteria_invalid, INVALID_CRITERIA, name="invalid")
+        check_criteria(
+            criteria_problematic, ALLOWED_PROBLEMATIC_CRITERIA, name="problematic"
+        )
+        check_criteria_options(criteria_options, criteria_problematic)
+        self._plan = compile_plan(
+            criteria_invalid,
+            criteria_problematic,
+            order_by_cost=order_by_cost,
+            stop_on_first_invalid=stop_on_first_invalid,
+            criteria_options=criteria_options,
+        )
+
+    @property
+    def plan(self) -> ValidationPlan:
+        return self._plan
+
+    def validate(self, geojson_input: Union[dict, str, Path, Any]) -> Dict[str, Any]:
+        """
+        Validate one GeoJSON, with the same results as `validate_geometries`.
+
+        Unlike `validate_geometries`, the results are not logged, as formatting them
+        costs more than validating a small geometry.
+
+        Args:
+            geojson_input: Input GeoJSON FeatureCollection, Feature, Geometry or filepath/url to (Geo)JSON.
+        """
+        if not isinstance(geojson_input, dict) or "type" not in geojson_input:
+            # Reads a file/url, or raises the error for an unsupported input.
+            geojson_input = input_to_geojson(geojson_input)
+        return _validate(geojson_geometries(geojson_input), self._plan)
+
+    def validate_many(
+        self, geojson_inputs: Iterable[Union[dict, str, Path, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Validate each of the inputs, lazily yielding the results in input order.
+
+        Args:
+            geojson_inputs: Iterable of inputs, each of any type accepted by `validate`.
+        """
+        for geojson_input in geojson_inputs:
+            yield self.validate(geojson_input)
+
+    def __repr__(self) -> str:
+        invalid = [name for name, _ in self._plan.invalid]
+        problematic = [name for name, _ in self._plan.problematic] + [
+            name for name, _ in self._plan.cross_feature
+        ]
+        return (
+            f"Validator(criteria_invalid={invalid}, criteria_problematic={problematic})"
+        )
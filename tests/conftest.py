@@ -2,6 +2,8 @@ from pathlib import Path
 from typing import List
 
 import pytest
+import shapely
+from shapely.geometry import Point, Polygon, shape
 
 from .helpers import DATA, read_geojson
 
@@ -35,3 +37,34 @@ def invalid_structure_files() -> List[Path]:
 @pytest.fixture(scope="module")
 def problematic_structure_files() -> List[Path]:
     return _files_in("problematic_structure")
+
+
+@pytest.fixture(scope="module")
+def shapely_geometries(all_normal_geojson_files) -> List[shapely.Geometry]:
+    """The test geometries that shapely can build, and some more only shapely has."""
+    geoms = []
+    for file_path in all_normal_geojson_files:
+        data = read_geojson(file_path)
+        if data["type"] == "FeatureCollection":
+            geometries = [feature["geometry"] for feature in data["features"]]
+        elif data["type"] == "Feature":
+            geometries = [data["geometry"]]
+        else:
+            geometries = [data]
+        for geometry in geometries:
+            if geometry is None:
+                continue
+            try:
+                geoms.append(shape(geometry))
+            except (ValueError, TypeError, shapely.errors.ShapelyError):
+                continue  # not a shapely geometry, e.g. with an unclosed ring
+    # Also the coordinates of shapely geometries closed rings and e.g. 3D positions.
+    geoms += [
+        Polygon([(0, 0, 1), (1, 0, 1), (1, 1, 1)]),
+        Point(),
+        Polygon(),
+        shapely.MultiPolygon(),
+        Point(190.1234567, -0.0),
+        shapely.LineString([(179, 0), (-179, 0), (-179, 0)]),
+    ]
+    return geoms
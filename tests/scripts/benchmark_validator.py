@@ -0,0 +1,48 @@
+"""
+Calls per second of validating a single small Feature, with `validate_geometries` and
+with a reused `Validator`.
+
+Usage: python tests/scripts/benchmark_validator.py [seconds-per-case]
+"""
+
+import sys
+import time
+from typing import Callable
+
+import geojson_validator
+
+FEATURE = {
+    "type": "Feature",
+    "properties": {"name": "parcel"},
+    "geometry": {
+        "type": "Polygon",
+        "coordinates": [
+            [[8.5, 47.3], [8.6, 47.3], [8.6, 47.4], [8.5, 47.4], [8.5, 47.3]]
+        ],
+    },
+}
+
+
+def calls_per_second(func: Callable[[dict], object], seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        for _ in range(100):
+            func(FEATURE)
+        calls += 100
+    return calls / elapsed
+
+
+def main(seconds: float = 2.0) -> None:
+    geojson_validator.configure_logging(enabled=False)
+    validator = geojson_validator.Validator()
+    cases = {
+        "validate_geometries": geojson_validator.validate_geometries,
+        "Validator.validate": validator.validate,
+    }
+    for name, func in cases.items():
+        print(f"{name:<22} {calls_per_second(func, seconds):>10,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:2]))
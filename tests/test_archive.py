@@ -0,0 +1,66 @@
+import gzip
+import zipfile
+
+import pytest
+
+from geojson_validator import main, validate_archive
+from .helpers import DATA
+
+VALID = DATA / "valid/valid_featurecollection.geojson"
+UNCLOSED = DATA / "invalid_geometries/invalid_unclosed.geojson"
+
+
+@pytest.fixture(name="zip_path")
+def fixture_zip_path(tmp_path):
+    zip_path = tmp_path / "batch.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(VALID, "valid.geojson")
+        archive.write(UNCLOSED, "nested/unclosed.json")
+        archive.writestr(
+            "nested/unclosed.geojson.gz", gzip.compress(UNCLOSED.read_bytes())
+        )
+        archive.writestr("broken.geojson", "{not json")
+        archive.writestr("readme.txt", "not validated")
+        archive.writestr("__MACOSX/._valid.geojson", "resource fork")
+    return zip_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_archive(zip_path, workers):
+    reports = validate_archive(zip_path, workers=workers)
+    assert list(reports) == [
+        "valid.geojson",
+        "nested/unclosed.json",
+        "nested/unclosed.geojson.gz",
+        "broken.geojson",
+    ]
+    for name, filepath in [
+        ("valid.geojson", VALID),
+        ("nested/unclosed.json", UNCLOSED),
+    ]:
+        assert reports[name] == {
+            "structure": main.validate_structure(filepath),
+            "geometries": main.validate_geometries(filepath),
+        }
+    assert reports["nested/unclosed.geojson.gz"] == reports["nested/unclosed.json"]
+    assert reports["nested/unclosed.json"]["geometries"]["invalid"] == {"unclosed": [0]}
+    assert "error" in reports["broken.geojson"]
+
+
+def test_validate_archive_options(zip_path):
+    reports = validate_archive(
+        zip_path,
+        criteria_invalid=["unclosed"],
+        criteria_problematic=[],
+        check_structure=False,
+    )
+    assert reports["nested/unclosed.json"] == {
+        "geometries": main.validate_geometries(
+            UNCLOSED, criteria_invalid=["unclosed"], criteria_problematic=[]
+        )
+    }
+
+
+def test_validate_archive_raises(zip_path):
+    with pytest.raises(ValueError):
+        validate_archive(zip_path, criteria_invalid=["unknown"])
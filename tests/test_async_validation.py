@@ -0,0 +1,133 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+import pytest
+
+from geojson_validator import (
+    async_validation,
+    main,
+    fix_geometries_async,
+    validate_geometries_async,
+    validate_structure_async,
+)
+from .helpers import DATA, read_geojson
+
+SQUARE = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+UNCLOSED = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]}
+FEATURES = {
+    "type": "FeatureCollection",
+    "features": [
+        {"type": "Feature", "properties": {}, "geometry": geometry}
+        for geometry in [SQUARE, UNCLOSED, SQUARE, UNCLOSED, None]
+    ],
+}
+
+
+def test_validate_geometries_async_same_as_sync(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        expected = main.validate_geometries(file_path)
+        for chunk_size in (1, 2, 10_000):
+            results = asyncio.run(
+                validate_geometries_async(file_path, chunk_size=chunk_size)
+            )
+            assert results == expected, file_path.name
+
+
+def test_validate_geometries_async_process_pool():
+    async def validate():
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            return await validate_geometries_async(
+                FEATURES, executor=executor, chunk_size=2
+            )
+
+    assert asyncio.run(validate()) == main.validate_geometries(FEATURES)
+
+
+def test_validate_structure_and_fix_async():
+    for file_path in [
+        DATA / "invalid_structure/invalid_feature_id_type.geojson",
+        DATA / "invalid_geometries/invalid_unclosed.geojson",
+    ]:
+        assert asyncio.run(validate_structure_async(file_path)) == (
+            main.validate_structure(file_path)
+        )
+    file_path = DATA / "invalid_geometries/invalid_exterior_not_ccw.geojson"
+    assert asyncio.run(fix_geometries_async(read_geojson(file_path), chunk_size=1)) == (
+        main.fix_geometries(file_path)
+    )
+
+
+def test_validate_geometries_async_semaphore(monkeypatch):
+    running, most_running = [0], [0]
+    lock = threading.Lock()
+    validate_partition = async_validation.validate_partition
+
+    def counting_validate_partition(*args):
+        with lock:
+            running[0] += 1
+            most_running[0] = max(most_running[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return validate_partition(*args)
+
+    monkeypatch.setattr(
+        async_validation, "validate_partition", counting_validate_partition
+    )
+
+    async def validate():
+        semaphore = asyncio.Semaphore(2)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return await asyncio.gather(
+                *(
+                    validate_geometries_async(
+                        FEATURES, executor=executor, semaphore=semaphore, chunk_size=1
+                    )
+                    for _ in range(3)
+                )
+            )
+
+    expected = main.validate_geometries(FEATURES)
+    assert asyncio.run(validate()) == [expected] * 3
+    assert most_running[0] == 2
+
+
+def test_validate_geometries_async_cancel(monkeypatch):
+    started = []
+    validate_partition = async_validation.validate_partition
+
+    def slow_validate_partition(*args):
+        started.append(args[1])
+        time.sleep(0.05)
+        return validate_partition(*args)
+
+    monkeypatch.setattr(async_validation, "validate_partition", slow_validate_partition)
+
+    async def cancel():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.create_task(
+                validate_geometries_async(FEATURES, executor=executor, chunk_size=1)
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(cancel())
+    # The chunks that had not started are not checked.
+    assert started == [0]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"criteria_invalid": ["unknown"]},
+        {"criteria_invalid": [], "criteria_problematic": []},
+        {"chunk_size": 0},
+    ],
+)
+def test_validate_geometries_async_raises(kwargs):
+    with pytest.raises(ValueError):
+        asyncio.run(validate_geometries_async(FEATURES, **kwargs))
@@ -0,0 +1,80 @@
+import pytest
+
+from geojson_validator import batch, main, validate_files
+from .helpers import DATA
+
+VALID = DATA / "valid/valid_featurecollection.geojson"
+UNCLOSED = DATA / "invalid_geometries/invalid_unclosed.geojson"
+STRUCTURE = DATA / "invalid_structure/invalid_feature_id_type.geojson"
+
+
+@pytest.fixture(name="folder")
+def fixture_folder(tmp_path):
+    for name, filepath in [
+        ("valid.geojson", VALID),
+        ("nested/unclosed.json", UNCLOSED),
+        ("nested/structure.geojson", STRUCTURE),
+    ]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_bytes(filepath.read_bytes())
+    (tmp_path / "broken.geojson").write_text("{not json")
+    (tmp_path / "readme.txt").write_text("not validated")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_files(folder, workers):
+    reports = {
+        report.pop("path"): report for report in validate_files(folder, workers=workers)
+    }
+    assert sorted(reports) == sorted(
+        str(folder / name)
+        for name in [
+            "valid.geojson",
+            "nested/unclosed.json",
+            "nested/structure.geojson",
+            "broken.geojson",
+        ]
+    )
+    for name, filepath in [
+        ("valid.geojson", VALID),
+        ("nested/unclosed.json", UNCLOSED),
+        ("nested/structure.geojson", STRUCTURE),
+    ]:
+        assert reports[str(folder / name)] == {
+            "structure": main.validate_structure(filepath),
+            "geometries": main.validate_geometries(filepath),
+            "valid": name == "valid.geojson",
+        }
+    assert "error" in reports[str(folder / "broken.geojson")]
+    assert not reports[str(folder / "broken.geojson")]["valid"]
+
+
+def test_validate_files_largest_first(folder):
+    paths = [report["path"] for report in validate_files(folder, workers=1)]
+    sizes = [(folder / path).stat().st_size for path in paths]
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_expand_paths(folder):
+    assert batch.expand_paths(str(folder / "**/*.json")) == [
+        str(folder / "nested/unclosed.json")
+    ]
+    assert batch.expand_paths(
+        [folder / "valid.geojson", "https://a.com/b.geojson"]
+    ) == [
+        str(folder / "valid.geojson"),
+        "https://a.com/b.geojson",
+    ]
+
+
+def test_batches(monkeypatch):
+    monkeypatch.setattr(batch, "_BATCH_FILES", 2)
+    monkeypatch.setattr(batch, "_BATCH_BYTES", 100)
+    sized_paths = [(150, "a"), (60, "b"), (30, "c"), (5, "d"), (5, "e"), (1, "f")]
+    assert batch._batches(sized_paths) == [["a"], ["b", "c"], ["d", "e"], ["f"]]
+
+
+def test_validate_files_raises():
+    with pytest.raises(ValueError):
+        validate_files(DATA, criteria_invalid=["unknown"])
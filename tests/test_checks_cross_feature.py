@@ -0,0 +1,182 @@
+import pickle
+
+import pytest
+
+from geojson_validator import checks_cross_feature
+
+SQUARE = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+
+
+def polygon(ring) -> dict:
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def test_geometry_digest_equal_for_identical_geometries():
+    digest = checks_cross_feature.geometry_digest(polygon(SQUARE))
+    assert digest == checks_cross_feature.geometry_digest(polygon(SQUARE))
+    # 1 and 1.0, 0 and -0.0 are the same coordinate.
+    same = [[0.0, -0.0], [1.0, 0], [1, 1.0], [0, 1], [0, 0]]
+    assert digest == checks_cross_feature.geometry_digest(polygon(same))
+    assert digest != checks_cross_feature.geometry_digest(
+        {"type": "LineString", "coordinates": SQUARE}
+    )
+
+
+def test_geometry_digest_normalize_ignores_ring_start_and_orientation():
+    rotated = [[1, 0], [1, 1], [0, 1], [0, 0], [1, 0]]
+    reversed_ = SQUARE[::-1]
+    digest = checks_cross_feature.geometry_digest(polygon(SQUARE), normalize=True)
+    for ring in [rotated, reversed_]:
+        assert checks_cross_feature.geometry_digest(polygon(ring)) != (
+            checks_cross_feature.geometry_digest(polygon(SQUARE))
+        )
+        assert digest == checks_cross_feature.geometry_digest(
+            polygon(ring), normalize=True
+        )
+    moved = [[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]
+    assert digest != checks_cross_feature.geometry_digest(polygon(moved), True)
+
+
+GEOMETRIES = [
+    polygon(SQUARE),
+    {"type": "Point", "coordinates": [1, 2]},
+    polygon([[1, 0], [1, 1], [0, 1], [0, 0], [1, 0]]),  # rotated square
+    polygon(SQUARE),
+    {"type": "Point", "coordinates": [1.0, 2.0]},
+    {"type": "Point", "coordinates": [1, 3]},
+    polygon(SQUARE),
+]
+
+
+@pytest.mark.parametrize(
+    "normalize, expected",
+    [(False, [[0, 3, 6], [1, 4]]), (True, [[0, 2, 3, 6], [1, 4]])],
+)
+@pytest.mark.parametrize("partitions", [1, 3])
+def test_duplicate_features(normalize, expected, partitions):
+    accumulator = checks_cross_feature.DuplicateFeatures(normalize, partitions)
+    for index, geometry in enumerate(GEOMETRIES):
+        accumulator.add(index, geometry)
+    assert accumulator.result() == expected
+
+
+@pytest.mark.parametrize("partitions", [1, 3])
+def test_duplicate_features_merge_of_pickled_parts(partitions):
+    parts = []
+    for start in range(0, len(GEOMETRIES), 3):
+        part = checks_cross_feature.DuplicateFeatures(partitions=partitions)
+        for index in range(start, min(start + 3, len(GEOMETRIES))):
+            part.add(index, GEOMETRIES[index])
+        parts.append(pickle.loads(pickle.dumps(part)))
+    merged = checks_cross_feature.DuplicateFeatures(partitions=partitions)
+    for part in parts:
+        merged.merge(part)
+    assert merged.result() == [[0, 3, 6], [1, 4]]
+
+
+def test_duplicate_features_spill_files_removed():
+    accumulator = checks_cross_feature.DuplicateFeatures(partitions=2)
+    accumulator.add(0, polygon(SQUARE))
+    spill_dir = accumulator._spill_dir
+    assert accumulator.result() == []
+    del accumulator
+    assert not spill_dir.exists()
+
+
+def test_duplicate_features_pickled_copies_are_independent():
+    accumulator = checks_cross_feature.DuplicateFeatures(partitions=2)
+    for index, geometry in enumerate(GEOMETRIES):
+        accumulator.add(index, geometry)
+    first = pickle.dumps(accumulator)
+    data = pickle.dumps(accumulator)
+    copies = [pickle.loads(data), pickle.loads(data)]
+    assert copies[0]._spill_dir != copies[1]._spill_dir
+    spill_dirs = [copy._spill_dir for copy in copies]
+    del copies[0]
+    assert not spill_dirs[0].exists()
+    assert copies[0].result() == [[0, 3, 6], [1, 4]]
+    # The original keeps its files, and removes them itself.
+    assert accumulator.result() == [[0, 3, 6], [1, 4]]
+    spill_dir = accumulator._spill_dir
+    del accumulator
+    assert not spill_dir.exists()
+    # Also a fresh copy, e.g. on another machine.
+    fresh = pickle.loads(first)
+    assert fresh.result() == [[0, 3, 6], [1, 4]]
+
+
+def square(x: float, y: float, size: float = 1) -> dict:
+    return polygon([[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]])
+
+
+POLYGONS = [
+    square(0, 0),
+    square(1, 0),  # touches 0 along an edge
+    square(0.9, 0.5),  # overlaps 0 and 1 a bit
+    square(5, 5, 3),
+    square(6, 6),  # within 3
+    {"type": "Point", "coordinates": [0.5, 0.5]},  # not a polygon
+    square(5, 5, 3),  # identical to 3, contains 4
+    {
+        "type": "MultiPolygon",
+        "coordinates": [square(20, 20)["coordinates"], square(0.5, 0.5)["coordinates"]],
+    },  # overlaps 0, 1 and 2 with its second part
+]
+
+
+def test_overlapping_features():
+    accumulator = checks_cross_feature.OverlappingFeatures()
+    for index, geometry in enumerate(POLYGONS):
+        accumulator.add(index, geometry)
+    assert accumulator.result() == [
+        [0, 2],
+        [0, 7],
+        [1, 2],
+        [1, 7],
+        [2, 7],
+        [3, 4],
+        [3, 6],
+        [4, 6],
+    ]
+
+
+def test_overlapping_features_min_overlap_area():
+    accumulator = checks_cross_feature.OverlappingFeatures(min_overlap_area=0.1)
+    for index, geometry in enumerate(POLYGONS):
+        accumulator.add(index, geometry)
+    # The overlaps of 2 with 0 and 1 are 0.05 and 0.45.
+    assert accumulator.result() == [
+        [0, 7],
+        [1, 2],
+        [1, 7],
+        [2, 7],
+        [3, 4],
+        [3, 6],
+        [4, 6],
+    ]
+
+
+def test_overlapping_features_merge_of_pickled_parts():
+    parts = []
+    for start in range(0, len(POLYGONS), 3):
+        part = checks_cross_feature.OverlappingFeatures()
+        for index in range(start, min(start + 3, len(POLYGONS))):
+            part.add(index, POLYGONS[index])
+        parts.append(pickle.loads(pickle.dumps(part)))
+    merged = checks_cross_feature.OverlappingFeatures()
+    for part in parts:
+        merged.merge(part)
+    assert len(merged.result()) == 8
+
+
+def test_overlapping_features_grid_scales():
+    # A tiling grid, where only the shared edges touch, plus one overlapping square.
+    accumulator = checks_cross_feature.OverlappingFeatures()
+    size = 100
+    for i in range(size * size):
+        accumulator.add(i, square(i % size, i // size))
+    accumulator.add(size * size, square(10.5, 10.5))
+    assert accumulator.result() == [
+        [i, size * size]
+        for i in [10 * size + 10, 10 * size + 11, 11 * size + 10, 11 * size + 11]
+    ]
@@ -1,9 +1,45 @@
-from shapely.geometry import shape
+from typing import List
+
+import pytest
+from shapely.geometry import Polygon
 
 from geojson_validator import checks_invalid
+from geojson_validator.geometry_utils import geojson_geometries, to_shapely_or_none
 from .helpers import DATA, read_geojson
 
 
+# The shapely implementations the raw coordinate checks replaced, kept as a reference.
+def shapely_exterior_not_ccw(geom: Polygon) -> bool:
+    return not geom.exterior.is_ccw
+
+
+def shapely_interior_not_cw(geom: Polygon) -> bool:
+    return any(interior.is_ccw for interior in geom.interiors)
+
+
+def _all_test_polygons() -> List[dict]:
+    polygons = []
+    for folder in ["valid", "invalid_geometries", "problematic_geometries"]:
+        for file_path in (DATA / folder).rglob("*.geojson"):
+            polygons.extend(_polygons_of(read_geojson(file_path)))
+    return polygons
+
+
+def _polygons_of(geojson: dict) -> List[dict]:
+    polygons = []
+    for geometry in geojson_geometries(geojson):
+        if not isinstance(geometry, dict):
+            continue
+        if geometry.get("type") == "Polygon":
+            polygons.append(geometry)
+        elif geometry.get("type") == "MultiPolygon":
+            polygons.extend(
+                {"type": "Polygon", "coordinates": coordinates}
+                for coordinates in geometry["coordinates"]
+            )
+    return polygons
+
+
 def test_check_unclosed(valid_geometry):
     geometry = read_geojson(
         DATA / "invalid_geometries/invalid_unclosed.geojson",
@@ -46,9 +82,8 @@ def test_check_exterior_not_ccw(valid_geometry):
         DATA / "invalid_geometries/invalid_exterior_not_ccw.geojson",
         geometries=True,
     )
-    geom = shape(geometry)
-    assert checks_invalid.check_exterior_not_ccw(geom)
-    assert not checks_invalid.check_exterior_not_ccw(shape(valid_geometry))
+    assert checks_invalid.check_exterior_not_ccw(geometry)
+    assert not checks_invalid.check_exterior_not_ccw(valid_geometry)
 
 
 def test_check_interior_not_cw(valid_geometry):
@@ -56,6 +91,78 @@ def test_check_interior_not_cw(valid_geometry):
         DATA / "invalid_geometries/invalid_interior_not_cw.geojson",
         geometries=True,
     )
-    geom = shape(geometry)
-    assert checks_invalid.check_interior_not_cw(geom)
-    assert not checks_invalid.check_interior_not_cw(shape(valid_geometry))
+    assert checks_invalid.check_interior_not_cw(geometry)
+    assert not checks_invalid.check_interior_not_cw(valid_geometry)
+
+
+# Like the other shapely checks, they are skipped for a geometry shapely cannot parse.
+def shapely_reference(reference):
+    def check(geometry: dict) -> bool:
+        geom = to_shapely_or_none(geometry)
+        return geom is not None and reference(geom)
+
+    return check
+
+
+@pytest.mark.parametrize(
+    "check, reference",
+    [
+        (checks_invalid.check_exterior_not_ccw, shapely_exterior_not_ccw),
+        (checks_invalid.check_interior_not_cw, shapely_interior_not_cw),
+    ],
+)
+def test_orientation_checks_match_shapely(check, reference):
+    reference = shapely_reference(reference)
+    polygons = _all_test_polygons()
+    assert polygons
+    for geometry in polygons:
+        # Also the self-intersecting, unclosed and degenerate rings.
+        assert check(geometry) == reference(geometry), geometry
+        # Mirrored along the x axis, every ring orientation flips.
+        mirrored = {
+            "type": "Polygon",
+            "coordinates": [
+                [[x, -y, *rest] for x, y, *rest in ring]
+                for ring in geometry["coordinates"]
+            ],
+        }
+        assert check(mirrored) == reference(mirrored), mirrored
+
+
+def test_check_exterior_not_ccw_self_intersecting_ring():
+    # Positive area, but clockwise at its highest vertex, which decides in GEOS.
+    geometry = read_geojson(
+        DATA / "problematic_geometries/problematic_outside_lat_lon_boundaries.geojson",
+        geometries=True,
+    )
+    assert checks_invalid.check_exterior_not_ccw(geometry)
+
+
+def test_check_exterior_not_ccw_unclosed_and_3d_ring():
+    ccw = [[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]]
+    assert not checks_invalid.check_exterior_not_ccw(
+        {"type": "Polygon", "coordinates": [ccw]}
+    )
+    assert checks_invalid.check_exterior_not_ccw(
+        {"type": "Polygon", "coordinates": [ccw[::-1]]}
+    )
+
+
+def test_check_orientation_degenerate_rings():
+    # Like with shapely, a ring without area is not counter-clockwise.
+    geometry = {
+        "type": "Polygon",
+        "coordinates": [
+            [[0, 0], [1, 1], [2, 2], [0, 0]],
+            [[0, 0], [1, 1], [2, 2], [0, 0]],
+        ],
+    }
+    assert checks_invalid.check_exterior_not_ccw(geometry)
+    assert not checks_invalid.check_interior_not_cw(geometry)
+    # Too few positions for shapely, the checks are skipped.
+    geometry = {
+        "type": "Polygon",
+        "coordinates": [[[1, 1], [0, 0]], [[0, 0], [1, 1]]],
+    }
+    assert not checks_invalid.check_exterior_not_ccw(geometry)
+    assert not checks_invalid.check_interior_not_cw(geometry)
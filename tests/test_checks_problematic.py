@@ -1,6 +1,9 @@
-from shapely.geometry import shape
+import pytest
+import shapely
+from shapely.geometry import Polygon, shape
 
 from geojson_validator import checks_problematic
+from geojson_validator.geometry_utils import geojson_geometries
 from .helpers import DATA, read_geojson
 
 
@@ -9,9 +12,17 @@ def test_check_holes():
         DATA / "problematic_geometries/problematic_holes.geojson",
         geometries=True,
     )
-    geom = shape(geometry)
-    problematic = checks_problematic.check_holes(geom)
-    assert problematic
+    assert checks_problematic.check_holes(geometry)
+    # Unclosed, the hole is closed like by shapely.
+    square = [[0, 0], [10, 0], [10, 10], [0, 10]]
+    hole = [[1, 1], [1, 2], [2, 2], [2, 1]]
+    assert checks_problematic.check_holes(
+        {"type": "Polygon", "coordinates": [square, hole]}
+    )
+    # Skipped like the other shapely checks, shapely cannot parse the hole.
+    assert not checks_problematic.check_holes(
+        {"type": "Polygon", "coordinates": [square, [[1, 1], [2, 2]]]}
+    )
 
 
 def test_check_self_intersection():
@@ -19,9 +30,61 @@ def test_check_self_intersection():
         DATA / "problematic_geometries/problematic_self_intersection_small.geojson",
         geometries=True,
     )
-    geom = shape(geometry)
-    problematic = checks_problematic.check_self_intersection(geom)
-    assert problematic
+    reason = shapely.is_valid_reason(shape(geometry))
+    assert checks_problematic.check_self_intersection(reason)
+    assert not checks_problematic.check_self_intersection("Valid Geometry")
+    # Also takes the shapely geometry, like before.
+    assert checks_problematic.check_self_intersection(shape(geometry))
+    assert not checks_problematic.check_self_intersection(
+        Polygon([(0, 0), (1, 0), (1, 1)])
+    )
+
+
+@pytest.mark.parametrize(
+    "ring, trivially_simple",
+    [
+        ([[0, 0], [1, 0], [1, 1], [0, 0]], True),  # triangle
+        ([[0, 0], [0, 1], [1, 1], [0, 0]], True),  # clockwise triangle
+        ([[0, 0], [2, 0], [2, 1], [0, 1], [0, 0]], True),  # rectangle
+        ([[0, 0], [2, 0], [2, 0], [2, 1], [0, 1]], True),  # repeated node, unclosed
+        ([[0, 0], [1, 0], [2, 0], [2, 1], [0, 1], [0, 0]], False),  # collinear node
+        ([[0, 0], [4, 0], [2, 1], [0, 4], [0, 0]], False),  # simple, but concave
+        ([[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]], False),  # bowtie
+        ([[0, 0], [2, 0], [1, 0], [1, 1], [0, 0]], False),  # spike
+        # Pentagram, turning in one direction only but winding around twice.
+        ([[0, 10], [6, -8], [-9, 3], [9, 3], [-6, -8], [0, 10]], False),
+        ([[0, 0], [1, 1], [0, 0]], False),  # degenerate
+    ],
+)
+def test_is_trivially_simple(ring, trivially_simple):
+    geometry = {"type": "Polygon", "coordinates": [ring]}
+    assert checks_problematic.is_trivially_simple(geometry) == trivially_simple
+    if trivially_simple:
+        assert shape(geometry).is_valid
+
+
+@pytest.mark.parametrize(
+    "coordinates",
+    [
+        [[[0, 0], [], [1, 1], [0, 0]]],  # empty position
+        [[[0, 0], [1, 0], [1, 1], [0, "a"]]],  # non-numeric
+        [[["0", "0"], ["1", "0"], ["1", "1"], ["0", "0"]]],
+        [5],
+        {"ring": []},
+        5,
+    ],
+)
+def test_is_trivially_simple_broken_coordinates(coordinates):
+    # Unknown, left to the shapely parsing.
+    geometry = {"type": "Polygon", "coordinates": coordinates}
+    assert not checks_problematic.is_trivially_simple(geometry)
+
+
+def test_is_trivially_simple_only_single_rings():
+    exterior = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    hole = [[1, 1], [1, 2], [2, 2], [2, 1], [1, 1]]
+    geometry = {"type": "Polygon", "coordinates": [exterior, hole]}
+    assert not checks_problematic.is_trivially_simple(geometry)
 
 
 def test_check_inner_and_exterior_ring_intersect(valid_geometry):
@@ -162,3 +225,66 @@ def test_check_crosses_antimeridian():
         geometries=True,
     )
     assert checks_problematic.check_crosses_antimeridian(geometry)
+
+
+def test_is_trivially_simple_never_contradicts_geos(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        for geometry in geojson_geometries(read_geojson(file_path)):
+            if not isinstance(geometry, dict) or geometry.get("type") != "Polygon":
+                continue
+            if checks_problematic.is_trivially_simple(geometry):
+                assert shape(geometry).is_valid, file_path.name
+
+
+def _reference_inner_and_exterior_ring_intersect(geom: Polygon) -> bool:
+    """The plain per-hole implementation the indexed check replaced."""
+    shell = Polygon(geom.exterior)
+    for interior in geom.interiors:
+        intersection = geom.exterior.intersection(interior)
+        if not intersection.is_empty and intersection.geom_type != "Point":
+            return True
+        if not shell.covers(interior):
+            return True
+    return False
+
+
+def _polygon_with_holes(extra_hole=None) -> Polygon:
+    holes = [
+        [(x + 1, y + 1), (x + 1, y + 2), (x + 2, y + 2), (x + 2, y + 1)]
+        for x in range(0, 60, 3)
+        for y in range(0, 60, 3)
+    ]
+    if extra_hole is not None:
+        holes.append(extra_hole)
+    return Polygon([(0, 0), (62, 0), (62, 62), (0, 62)], holes)
+
+
+@pytest.mark.parametrize(
+    "extra_hole, expected",
+    [
+        (None, False),
+        ([(0, 30), (0.5, 30.5), (0.5, 29.5)], False),  # touches in a single point
+        ([(0, 30), (0, 30.5), (0.5, 30.5)], True),  # shares a line with the exterior
+        ([(-0.5, 30), (0.5, 30.5), (0.5, 29.5)], True),  # crosses the exterior
+        ([(70, 70), (71, 71), (71, 70)], True),  # outside the exterior
+        ([(62, 30), (63, 30.5), (63, 29.5)], True),  # outside, touching in a point
+    ],
+)
+def test_check_inner_and_exterior_ring_intersect_many_holes(extra_hole, expected):
+    geom = _polygon_with_holes(extra_hole)
+    assert len(geom.interiors) >= 400
+    assert checks_problematic.check_inner_and_exterior_ring_intersect(geom) == expected
+    assert _reference_inner_and_exterior_ring_intersect(geom) == expected
+
+
+def test_check_inner_and_exterior_ring_intersect_matches_reference(
+    all_normal_geojson_files,
+):
+    for file_path in all_normal_geojson_files:
+        for geometry in geojson_geometries(read_geojson(file_path)):
+            if not isinstance(geometry, dict) or geometry.get("type") != "Polygon":
+                continue
+            geom = shape(geometry)
+            assert checks_problematic.check_inner_and_exterior_ring_intersect(
+                geom
+            ) == _reference_inner_and_exterior_ring_intersect(geom), file_path.name
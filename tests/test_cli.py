@@ -0,0 +1,92 @@
+import json
+import zipfile
+
+import pytest
+
+from geojson_validator import cli, main
+from .helpers import DATA
+
+UNCLOSED = DATA / "invalid_geometries/invalid_unclosed.geojson"
+VALID = DATA / "valid/valid_featurecollection.geojson"
+
+
+def test_cli_file_and_archive(tmp_path, capsys):
+    zip_path = tmp_path / "batch.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.write(UNCLOSED, "unclosed.geojson")
+
+    exit_code = cli.main(
+        [str(UNCLOSED), str(zip_path), "--criteria-problematic", "", "--quiet"]
+    )
+    # The unclosed polygon is invalid.
+    assert exit_code == 1
+    report = json.loads(capsys.readouterr().out)
+    expected = {
+        "structure": main.validate_structure(UNCLOSED),
+        "geometries": main.validate_geometries(UNCLOSED, criteria_problematic=[]),
+    }
+    assert report == {
+        str(UNCLOSED): expected,
+        str(zip_path): {"unclosed.geojson": expected},
+    }
+
+
+def test_cli_criteria(capsys):
+    exit_code = cli.main([str(VALID), "--quiet"])
+    assert exit_code == 0
+    capsys.readouterr()
+
+    cli.main([str(UNCLOSED), "--criteria-invalid", "unclosed", "--no-structure"])
+    report = json.loads(capsys.readouterr().out)
+    assert report[str(UNCLOSED)] == {
+        "geometries": main.validate_geometries(UNCLOSED, criteria_invalid=["unclosed"])
+    }
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_jsonl(tmp_path, capsys, workers):
+    for name, filepath in [("a.geojson", VALID), ("b.geojson", UNCLOSED)]:
+        (tmp_path / name).write_bytes(filepath.read_bytes())
+
+    exit_code = cli.main(
+        [str(tmp_path / "*.geojson"), "--jsonl", "--workers", workers, "--quiet"]
+    )
+    assert exit_code == 1
+    lines = capsys.readouterr().out.splitlines()
+    reports = {
+        report.pop("path"): report for report in (json.loads(line) for line in lines)
+    }
+    assert reports == {
+        str(tmp_path / "a.geojson"): {
+            "structure": {},
+            "geometries": main.validate_geometries(VALID),
+            "valid": True,
+        },
+        str(tmp_path / "b.geojson"): {
+            "structure": {},
+            "geometries": main.validate_geometries(UNCLOSED),
+            "valid": False,
+        },
+    }
+
+    assert cli.main([str(tmp_path / "a.geojson"), "--jsonl", "--quiet"]) == 0
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--criteria-invalid", "unknown"],
+        ["--criteria-invalid", "", "--criteria-problematic", ""],
+        ["--criteria-invalid", "unknown", "--jsonl"],
+    ],
+)
+def test_cli_usage_errors(argv):
+    with pytest.raises(SystemExit) as error:
+        cli.main([str(UNCLOSED), *argv])
+    assert error.value.code == 2
+
+
+def test_cli_no_sources():
+    with pytest.raises(SystemExit) as error:
+        cli.main(["--quiet"])
+    assert error.value.code == 2
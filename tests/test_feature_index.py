@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from geojson_validator import main, FeatureIndex, validate_file_parallel
+from geojson_validator import feature_index
+from .helpers import DATA, read_geojson
+
+FILE = DATA / "invalid_geometries/invalid_unclosed.geojson"
+
+
+@pytest.fixture(name="large_file")
+def fixture_large_file(tmp_path):
+    fc = read_geojson(DATA / "valid/valid_featurecollection.geojson")
+    unclosed = read_geojson(FILE)["features"]
+    fc["features"] = (fc["features"] + unclosed) * 10
+    file_path = tmp_path / "large.geojson"
+    file_path.write_text(json.dumps(fc, indent=2), encoding="UTF-8")
+    return file_path
+
+
+def test_feature_index_reads_features_by_index(large_file):
+    features = read_geojson(large_file)["features"]
+    with FeatureIndex.open(large_file) as index:
+        assert len(index) == len(features)
+        assert index[7] == features[7]
+        assert index[-1] == features[-1]
+    assert feature_index.index_path(large_file).is_file()
+
+
+def test_feature_index_sidecar_reused_and_rebuilt_when_stale(large_file):
+    FeatureIndex.open(large_file).close()
+    with patch.object(
+        feature_index, "feature_byte_ranges", wraps=feature_index.feature_byte_ranges
+    ) as mock_scan:
+        with FeatureIndex.open(large_file) as index:
+            assert index[0]["type"] == "Feature"
+        mock_scan.assert_not_called()
+
+        fc = read_geojson(large_file)
+        fc["features"] = fc["features"][:3]
+        large_file.write_text(json.dumps(fc), encoding="UTF-8")
+        with FeatureIndex.open(large_file) as index:
+            assert len(index) == 3
+            assert index[2] == fc["features"][2]
+        mock_scan.assert_called_once()
+
+
+def test_feature_index_read_ignores_corrupt_sidecar(large_file):
+    feature_index.index_path(large_file).write_bytes(b"GJVIDX01")
+    assert feature_index.read_feature_index(large_file) is None
+
+
+def test_validate_geometries_feature_indices(large_file):
+    results = main.validate_geometries(large_file)
+    flagged = results["invalid"]["unclosed"]
+    with patch.object(main, "input_to_geojson") as mock_input:
+        rechecked = main.validate_geometries(
+            large_file, criteria_problematic=[], feature_indices=flagged + [0]
+        )
+    mock_input.assert_not_called()
+    assert rechecked["invalid"] == {"unclosed": flagged}
+    assert rechecked["count_geometry_types"] == {"Polygon": len(flagged) + 1}
+
+
+def test_validate_geometries_feature_indices_non_file_input():
+    fc = read_geojson(FILE)
+    results = main.validate_geometries(fc, feature_indices=[0])
+    assert results["invalid"]["unclosed"] == [0]
+    with pytest.raises(ValueError, match="must be between 0 and 0"):
+        main.validate_geometries(fc, feature_indices=[1])
+
+
+def test_validate_file_parallel_saves_index(large_file):
+    validate_file_parallel(large_file, workers=1, save_index=True)
+    assert feature_index.read_feature_index(large_file) is not None
+
+
+def test_feature_index_unwritable_directory(large_file, tmp_path):
+    read_only = tmp_path / "read_only"
+    read_only.mkdir()
+    file_path = read_only / large_file.name
+    shutil.copy(large_file, file_path)
+    os.chmod(read_only, 0o555)
+    try:
+        with FeatureIndex.open(file_path) as index:
+            assert len(index) == 20
+    finally:
+        os.chmod(read_only, 0o755)
@@ -21,9 +21,9 @@ def test_fix_exterior_not_ccw():
         geometries=True,
     )
     geom = shape(geometry)
-    assert checks_invalid.check_exterior_not_ccw(geom)
+    assert checks_invalid.check_exterior_not_ccw(geometry)
     fixed_geom = fixes.fix_exterior_not_ccw(geom)
-    assert not checks_invalid.check_exterior_not_ccw(fixed_geom)
+    assert not checks_invalid.check_exterior_not_ccw(fixed_geom.__geo_interface__)
 
 
 def test_fix_interior_not_cw():
@@ -32,9 +32,9 @@ def test_fix_interior_not_cw():
         geometries=True,
     )
     geom = shape(geometry)
-    assert checks_invalid.check_interior_not_cw(geom)
+    assert checks_invalid.check_interior_not_cw(geometry)
     fixed_geom = fixes.fix_interior_not_cw(geom)
-    assert not checks_invalid.check_interior_not_cw(fixed_geom)
+    assert not checks_invalid.check_interior_not_cw(fixed_geom.__geo_interface__)
 
 
 def test_fix_duplicate_nodes():
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LinearRing, Point, Polygon
+
+from geojson_validator import main, validate_geometry_array
+from geojson_validator.geometry_arrays import _Parts, _flag_rows
+
+CRITERIA = list(main.INVALID_CRITERIA) + list(main.PROBLEMATIC_CRITERIA)
+_RAGGED_TYPES = {
+    shapely.GeometryType.POINT: "Point",
+    shapely.GeometryType.LINESTRING: "LineString",
+    shapely.GeometryType.POLYGON: "Polygon",
+    shapely.GeometryType.MULTIPOINT: "MultiPoint",
+    shapely.GeometryType.MULTILINESTRING: "MultiLineString",
+    shapely.GeometryType.MULTIPOLYGON: "MultiPolygon",
+}
+
+
+def _flagged_rows(results, count):
+    """The per row columns of the validate_geometries results."""
+    columns = {}
+    for criteria_type in ("invalid", "problematic"):
+        for criterium, entries in results[criteria_type].items():
+            rows = [next(iter(e)) if isinstance(e, dict) else e for e in entries]
+            columns[criterium] = np.isin(np.arange(count), rows)
+    return columns
+
+
+def test_validate_geometry_array_same_as_validate_geometries(shapely_geometries):
+    geoms = shapely_geometries
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": g.__geo_interface__} for g in geoms
+        ],
+    }
+    expected = _flagged_rows(main.validate_geometries(geojson), len(geoms))
+
+    results = validate_geometry_array(np.array(geoms, dtype=object))
+    assert list(results) == CRITERIA + ["skipped_validation"]
+    for criterium in CRITERIA:
+        assert results[criterium].dtype == bool
+        np.testing.assert_array_equal(
+            results[criterium],
+            expected.get(criterium, np.zeros(len(geoms), dtype=bool)),
+            err_msg=criterium,
+        )
+    assert not results["skipped_validation"].any()
+
+    wkb_results = validate_geometry_array(shapely.to_wkb(geoms))
+    for criterium, flags in results.items():
+        np.testing.assert_array_equal(wkb_results[criterium], flags)
+
+
+def test_validate_geometry_array_skips_missing_geometries():
+    square = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])  # clockwise
+    results = validate_geometry_array(
+        [square, None, LinearRing([(0, 0), (1, 0), (1, 1)])],
+        criteria_invalid=["exterior_not_ccw"],
+        criteria_problematic=[],
+    )
+    assert results["exterior_not_ccw"].tolist() == [True, False, False]
+    assert results["skipped_validation"].tolist() == [False, True, True]
+
+    results = validate_geometry_array(
+        [shapely.to_wkb(square), b"not wkb"], criteria_problematic=["holes"]
+    )
+    assert results["skipped_validation"].tolist() == [False, True]
+
+
+@pytest.mark.parametrize("family", ["Point", "LineString", "Polygon"])
+@pytest.mark.parametrize("include_z", [False, True])
+def test_parts_from_ragged_same_as_from_geometries(
+    shapely_geometries, family, include_z
+):
+    geoms = np.array(
+        [
+            g
+            for g in shapely_geometries
+            if g.geom_type.replace("Multi", "") == family
+            and shapely.has_z(g) == include_z
+            # An empty point part has no place in the GeoArrow layout of a MultiPoint.
+            and not (family == "Point" and g.is_empty)
+        ],
+        dtype=object,
+    )
+    if geoms.size == 0:
+        pytest.skip(f"No {family} test geometries")
+    criteria = (main.INVALID_CRITERIA, main.PROBLEMATIC_CRITERIA)
+    expected = _flag_rows(
+        _Parts.from_geometries(geoms), np.zeros(len(geoms), dtype=bool), *criteria
+    )
+    # The layout of the multi type, and of the single type for the rows that have it.
+    for rows in (np.ones(len(geoms), dtype=bool), shapely.get_type_id(geoms) < 4):
+        geometry_type, coords, offsets = shapely.to_ragged_array(
+            geoms[rows], include_z=include_z
+        )
+        results = _flag_rows(
+            _Parts.from_ragged(_RAGGED_TYPES[geometry_type], coords, offsets),
+            np.zeros(rows.sum(), dtype=bool),
+            *criteria,
+        )
+        for criterium, flags in results.items():
+            np.testing.assert_array_equal(
+                flags, expected[criterium][rows], err_msg=criterium
+            )
+
+
+class _GeoDataFrame:
+    """The part of the GeoDataFrame interface that is used: its geometry column."""
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+
+
+def test_validate_geometry_array_geodataframe():
+    results = validate_geometry_array(
+        _GeoDataFrame([Point(0, 0), Point(200, 0)]),
+        criteria_invalid=[],
+        criteria_problematic=["outside_lat_lon_boundaries"],
+    )
+    assert results["outside_lat_lon_boundaries"].tolist() == [False, True]
+
+
+@pytest.mark.parametrize(
+    "geometries, criteria",
+    [
+        (["POINT (0 0)"], {}),
+        (np.array([[Point(0, 0)]], dtype=object), {}),
+        ([Point(0, 0)], {"criteria_problematic": ["duplicate_features"]}),
+        ([Point(0, 0)], {"criteria_invalid": [], "criteria_problematic": []}),
+    ],
+)
+def test_validate_geometry_array_raises(geometries, criteria):
+    with pytest.raises(ValueError):
+        validate_geometry_array(geometries, **criteria)
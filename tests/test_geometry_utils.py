@@ -1,9 +1,11 @@
 from pathlib import Path
+import io
 
+import numpy as np
 import pytest
 from shapely.geometry import shape, Point
 
-from geojson_validator import geometry_utils
+from geojson_validator import geometry_utils, sources
 from .helpers import DATA, read_geojson
 
 
@@ -41,19 +43,22 @@ def test_read_geojson_file_or_url_suffix_accepts_query_string_and_any_case(monke
     requested = []
 
     class FakeResponse:
+        def __init__(self):
+            self.raw = io.BytesIO(b'{"type": "FeatureCollection", "features": []}')
+
         @staticmethod
         def raise_for_status():
             pass
 
         @staticmethod
-        def json():
-            return {"type": "FeatureCollection", "features": []}
+        def close():
+            pass
 
-    def fake_get(url, timeout):  # pylint: disable=unused-argument
+    def fake_get(url, timeout, stream):  # pylint: disable=unused-argument
         requested.append(url)
         return FakeResponse()
 
-    monkeypatch.setattr(geometry_utils.requests, "get", fake_get)
+    monkeypatch.setattr(sources.http_session()[0], "get", fake_get)
     for url in [
         "https://example.com/a.geojson?token=abc&x=1",
         "https://example.com/a.GeoJSON",
@@ -122,3 +127,34 @@ def test_to_shapely_or_none():
         "coordinates": [[[0, 0], [1, 0], [1, 1, 5], [0, 1], [0, 0]]],
     }
     assert geometry_utils.to_shapely_or_none(mixed_dimensions) is None
+
+
+def test_ring_xy():
+    assert geometry_utils.ring_xy([[0, 1], [2, 3, 4]]).tolist() == [[0, 1], [2, 3]]
+    for ring in [[[0, 1], [], [2, 3]], [[0, 1], [], [2, 3, 4]], [["0", "1"]], [[0]]]:
+        with pytest.raises(TypeError):
+            geometry_utils.ring_xy(ring)
+
+
+def test_closed_ring_arrays():
+    square = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+    rings = geometry_utils.closed_ring_arrays(
+        {"type": "Polygon", "coordinates": [square]}
+    )
+    assert [ring.tolist() for ring in rings] == [square]
+    # Rings that shapely changes or rejects.
+    for coordinates in [[], [square[:-1]], [square[:3]], [[*square[:-1], [0, 0, 1]]]]:
+        assert (
+            geometry_utils.closed_ring_arrays(
+                {"type": "Polygon", "coordinates": coordinates}
+            )
+            is None
+        )
+
+
+def test_ring_is_ccw():
+    square = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]], dtype=float)
+    assert geometry_utils.ring_is_ccw(square)
+    assert not geometry_utils.ring_is_ccw(square[::-1])
+    flat = np.array([[0, 0], [1, 0], [2, 0], [0, 0]], dtype=float)
+    assert not geometry_utils.ring_is_ccw(flat)
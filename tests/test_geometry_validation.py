@@ -1,6 +1,11 @@
+from unittest.mock import patch
+
 import pytest
+import shapely
 
 from geojson_validator import geometry_validation
+from geojson_validator.geometry_utils import geojson_geometries, to_shapely_or_none
+from .helpers import read_geojson
 
 
 def test_check_criteria_invalid():
@@ -237,3 +242,99 @@ def test_process_validation_multiple_types():
     results = geometry_validation.process_validation(geometries, invalid_criteria, [])
     assert results["invalid"]["unclosed"] == [{1: [1, 2]}, 2]
     assert results["count_geometry_types"] == {"Polygon": 2, "MultiPolygon": 1}
+
+
+def test_compile_plan_order_by_cost_runs_raw_json_checks_first():
+    plan = geometry_validation.compile_plan(
+        ["less_three_unique_nodes", "unclosed"],
+        ["self_intersection", "3d_coordinates", "holes"],
+        order_by_cost=True,
+    )
+    assert [name for name, _ in plan.invalid] == [
+        "unclosed",
+        "less_three_unique_nodes",
+    ]
+    assert [name for name, _ in plan.problematic] == [
+        "holes",
+        "3d_coordinates",
+        "self_intersection",
+    ]
+
+
+def test_compile_plan_order_by_cost_same_results(all_normal_geojson_files):
+    plan = geometry_validation.compile_plan(
+        geometry_validation.INVALID_CRITERIA,
+        geometry_validation.PROBLEMATIC_CRITERIA,
+        order_by_cost=True,
+    )
+    for file_path in all_normal_geojson_files:
+        geometries = geojson_geometries(read_geojson(file_path))
+        assert geometry_validation._validate(
+            geometries, plan
+        ) == geometry_validation.process_validation(
+            geometries,
+            geometry_validation.INVALID_CRITERIA,
+            geometry_validation.PROBLEMATIC_CRITERIA,
+        )
+
+
+def test_stop_on_first_invalid_skips_remaining_checks():
+    geometries = [
+        # Unclosed, and also a self-intersecting bowtie.
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [1, 0], [0, 1]]]},
+        # Concave, so GEOS has to check it.
+        {"type": "Polygon", "coordinates": [[[0, 0], [4, 0], [2, 1], [0, 4], [0, 0]]]},
+    ]
+    plan = geometry_validation.compile_plan(
+        ["unclosed"], ["self_intersection"], stop_on_first_invalid=True
+    )
+    with patch(
+        "geojson_validator.geometry_validation.to_shapely_or_none",
+        wraps=to_shapely_or_none,
+    ) as parse:
+        results = geometry_validation._validate(geometries, plan)
+    assert results["invalid"] == {"unclosed": [0]}
+    assert not results["problematic"]
+    assert parse.call_count == 1  # only for the concave polygon
+
+
+def test_shapely_not_built_when_no_shapely_check_applies():
+    # Without interior rings, the ring intersection check cannot flag the polygon.
+    geometries = [
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}
+    ]
+    with patch("geojson_validator.geometry_validation.to_shapely_or_none") as parse:
+        results = geometry_validation.process_validation(
+            geometries, ["unclosed"], ["inner_and_exterior_ring_intersect"]
+        )
+    parse.assert_not_called()
+    assert not results["invalid"]
+    assert not results["problematic"]
+
+
+def test_invalid_criteria_do_not_build_shapely_geometries(all_normal_geojson_files):
+    with patch("geojson_validator.geometry_validation.to_shapely_or_none") as parse:
+        for file_path in all_normal_geojson_files:
+            geometry_validation.process_validation(
+                geojson_geometries(read_geojson(file_path)),
+                geometry_validation.INVALID_CRITERIA,
+                [],
+            )
+    parse.assert_not_called()
+
+
+def test_validity_reason_computed_once_and_only_if_needed():
+    geometries = [
+        # Trivially simple, settled without GEOS.
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]},
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]},
+    ]
+    with patch(
+        "geojson_validator.geometry_validation.shapely.is_valid_reason",
+        wraps=shapely.is_valid_reason,
+    ) as is_valid_reason:
+        results = geometry_validation.process_validation(
+            geometries, [], ["self_intersection"]
+        )
+    assert results["problematic"] == {"self_intersection": [1]}
+    assert is_valid_reason.call_count == 1
@@ -0,0 +1,166 @@
+import json
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Point, Polygon
+
+from geojson_validator import (
+    iter_validate_geoparquet,
+    validate_geoparquet,
+    validate_geometry_array,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _flagged_rows(results):
+    """The validate_geoparquet results of validate_geometry_array results."""
+    flagged = {
+        criterium: np.flatnonzero(flags).tolist()
+        for criterium, flags in results.items()
+    }
+    return flagged, flagged.pop("skipped_validation")
+
+
+def _geoarrow_polygons(geoms, interleaved=True):
+    """The polygons as a GeoArrow "multipolygon" array, with nulls for None."""
+    missing = np.array([g is None for g in geoms])
+    filled = [shapely.MultiPolygon() if g is None else g for g in geoms]
+    _, coords, (ring, polygon, multipolygon) = shapely.to_ragged_array(filled)
+    if interleaved:
+        array = pa.FixedSizeListArray.from_arrays(
+            pa.array(coords.ravel()), type=pa.list_(pa.field("xy", pa.float64()), 2)
+        )
+    else:
+        array = pa.StructArray.from_arrays(
+            [pa.array(coords[:, 0]), pa.array(coords[:, 1])], names=["x", "y"]
+        )
+    array = pa.ListArray.from_arrays(pa.array(ring), array)
+    array = pa.ListArray.from_arrays(pa.array(polygon), array)
+    return pa.ListArray.from_arrays(
+        pa.array(multipolygon), array, mask=pa.array(missing)
+    )
+
+
+def test_validate_geoparquet_wkb_file(tmp_path, shapely_geometries):
+    geoms = shapely_geometries + [None]
+    filepath = tmp_path / "data.parquet"
+    table = pa.table({"id": range(len(geoms)), "geometry": shapely.to_wkb(geoms)})
+    geo = {"primary_column": "geometry", "columns": {"geometry": {"encoding": "WKB"}}}
+    table = table.replace_schema_metadata({"geo": json.dumps(geo)})
+    pq.write_table(table, filepath, row_group_size=4)
+
+    expected = validate_geometry_array(geoms)
+    first_rows = [first for first, _ in iter_validate_geoparquet(filepath)]
+    assert first_rows == list(range(0, len(geoms), 4))
+
+    results = validate_geoparquet(filepath)
+    flagged, skipped = _flagged_rows(expected)
+    assert {**results["invalid"], **results["problematic"]} == {
+        criterium: rows for criterium, rows in flagged.items() if rows
+    }
+    assert results["skipped_validation"] == skipped == [len(geoms) - 1]
+
+
+@pytest.mark.parametrize("interleaved", [True, False])
+def test_validate_geoparquet_geoarrow(interleaved, shapely_geometries):
+    polygons = [
+        g
+        for g in shapely_geometries
+        if g.geom_type in ("Polygon", "MultiPolygon") and not shapely.has_z(g)
+    ]
+    geoms = polygons[:3] + [None] + polygons[3:]
+    field = pa.field(
+        "geom",
+        _geoarrow_polygons(geoms, interleaved).type,
+        metadata={"ARROW:extension:name": "geoarrow.multipolygon"},
+    )
+    table = pa.Table.from_arrays(
+        [_geoarrow_polygons(geoms, interleaved)], schema=pa.schema([field])
+    )
+    # Record batches of a slice of the array, as e.g. a reader yields them.
+    reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches(5))
+
+    results = validate_geoparquet(reader)
+    flagged, skipped = _flagged_rows(validate_geometry_array(geoms))
+    assert {**results["invalid"], **results["problematic"]} == {
+        criterium: rows for criterium, rows in flagged.items() if rows
+    }
+    assert results["skipped_validation"] == skipped == [3]
+
+
+def test_validate_geoparquet_geoarrow_points():
+    array = pa.StructArray.from_arrays(
+        [pa.array([0.0, 200.0, 1.0]), pa.array([0.0, 0.0, 1.0]), pa.array([1.0] * 3)],
+        names=["x", "y", "z"],
+        mask=pa.array([False, False, True]),
+    )
+    table = pa.table({"geometry": array})
+    geo = {"primary_column": "geometry", "columns": {"geometry": {"encoding": "point"}}}
+    results = validate_geoparquet(
+        table.replace_schema_metadata({"geo": json.dumps(geo)}),
+        criteria_invalid=[],
+        criteria_problematic=["outside_lat_lon_boundaries", "3d_coordinates"],
+    )
+    assert results == {
+        "invalid": {},
+        "problematic": {"outside_lat_lon_boundaries": [1], "3d_coordinates": [0, 1]},
+        "skipped_validation": [2],
+    }
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        pa.array(
+            [[0.0, 0.0], None, [200.0, 0.0]],
+            type=pa.list_(pa.field("xy", pa.float64()), 2),
+        ),
+        pa.StructArray.from_arrays(
+            [pa.array([0.0, 1.0, 200.0]), pa.array([0.0, 1.0, 0.0])],
+            names=["x", "y"],
+            mask=pa.array([False, True, False]),
+        ),
+    ],
+)
+def test_validate_geoparquet_geoarrow_points_null_row(array):
+    geo = {"primary_column": "geometry", "columns": {"geometry": {"encoding": "point"}}}
+    # Also a slice, whose positions start at an offset.
+    for rows in (array, pa.concat_arrays([array, array]).slice(3)):
+        table = pa.table({"geometry": rows})
+        results = validate_geoparquet(
+            table.replace_schema_metadata({"geo": json.dumps(geo)}),
+            criteria_invalid=[],
+            criteria_problematic=["outside_lat_lon_boundaries"],
+        )
+        assert results == {
+            "invalid": {},
+            "problematic": {"outside_lat_lon_boundaries": [2]},
+            "skipped_validation": [1],
+        }
+
+
+def test_validate_geoparquet_plain_wkb_column():
+    square = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])  # clockwise
+    table = pa.table({"wkb": shapely.to_wkb([Point(0, 0), square])})
+    results = validate_geoparquet(
+        table, criteria_invalid=["exterior_not_ccw"], geometry_column="wkb"
+    )
+    assert results["invalid"] == {"exterior_not_ccw": [1]}
+
+
+@pytest.mark.parametrize(
+    "metadata, geometry_column",
+    [
+        ({}, None),
+        ({}, "missing"),
+        ({"ARROW:extension:name": "geoarrow.wkt"}, None),
+    ],
+)
+def test_validate_geoparquet_raises(metadata, geometry_column):
+    field = pa.field("geometry", pa.string(), metadata=metadata)
+    table = pa.Table.from_arrays([pa.array(["POINT (0 0)"])], schema=pa.schema([field]))
+    with pytest.raises(ValueError):
+        validate_geoparquet(table, geometry_column=geometry_column)
@@ -0,0 +1,189 @@
+import json
+
+import pytest
+
+from geojson_validator import main
+from geojson_validator.geometry_validation import GeosGeometry
+from geojson_validator.feature_index import feature_byte_ranges
+from geojson_validator.geos_parsing import (
+    _DECODE,
+    _NULL,
+    _scan_features,
+    geos_file_geometries,
+)
+from .helpers import read_geojson
+
+SHAPELY_CRITERIA = ["inner_and_exterior_ring_intersect", "self_intersection"]
+
+EDGE_CASE_GEOMETRIES = [
+    None,
+    {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]},
+    {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [0, 0]]]},
+    {"type": "Polygon", "coordinates": [[[0, 0, 1], [2, 0], [2, 2, 1], [0, 0, 1]]]},
+    {"type": "Polygon", "coordinates": [[["0", 0], [2, 0], [2, 2], ["0", 0]]]},
+    {"type": "Polygon", "coordinates": []},
+    {"type": "polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]},
+    {
+        "type": "MultiPolygon",
+        "coordinates": [[[[0, 0], [2, 0], [0, 2], [2, 2], [0, 0]]], []],
+    },
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [1, 2]}},
+    {
+        "type": "GeometryCollection",
+        "geometries": [
+            {"type": "Point", "coordinates": [1, 2]},
+            {
+                "type": "MultiPolygon",
+                "coordinates": [[[[0, 0], [2, 0], [0, 2], [2, 2], [0, 0]]]],
+            },
+        ],
+    },
+]
+
+
+def _write_collection(tmp_path, geometries):
+    features = [
+        {"type": "Feature", "properties": {"geometry": {}}, "geometry": g}
+        for g in geometries
+    ]
+    # A bare geometry among the features has no geometry member.
+    features.append(
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}
+    )
+    fp = tmp_path / "collection.geojson"
+    fp.write_text(
+        json.dumps({"features": features, "type": "FeatureCollection"}, indent=1)
+    )
+    return fp
+
+
+def _all_geometries(files):
+    geometries = []
+    for file_path in files:
+        data = read_geojson(file_path)
+        if data["type"] == "FeatureCollection":
+            geometries.extend(feature.get("geometry") for feature in data["features"])
+        elif data["type"] == "Feature":
+            geometries.append(data.get("geometry"))
+        else:
+            geometries.append(data)
+    return geometries
+
+
+@pytest.mark.parametrize("criteria_invalid", [[], list(main.INVALID_CRITERIA)])
+@pytest.mark.parametrize(
+    "criteria_problematic", [SHAPELY_CRITERIA, list(main.PROBLEMATIC_CRITERIA)]
+)
+def test_geos_parsing_same_results(
+    tmp_path, all_normal_geojson_files, criteria_invalid, criteria_problematic
+):
+    geometries = _all_geometries(all_normal_geojson_files) + EDGE_CASE_GEOMETRIES
+    fp = _write_collection(tmp_path, geometries)
+    criteria = {
+        "criteria_invalid": criteria_invalid,
+        "criteria_problematic": criteria_problematic,
+    }
+    assert main.validate_geometries(
+        fp, geos_parsing=True, **criteria
+    ) == main.validate_geometries(fp, **criteria)
+
+
+def test_geos_file_geometries_decodes_only_the_needed_geometries(tmp_path):
+    fp = _write_collection(tmp_path, EDGE_CASE_GEOMETRIES[:3])
+    geometries = list(geos_file_geometries(fp, [], SHAPELY_CRITERIA))
+    assert geometries[0] is None
+    # GEOS rejects the unclosed ring, and the short ring that shape would pad is decoded.
+    assert geometries[1] == EDGE_CASE_GEOMETRIES[1]
+    assert geometries[2] == EDGE_CASE_GEOMETRIES[2]
+    assert geometries[3] is None
+
+    fp = _write_collection(
+        tmp_path,
+        [{"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}],
+    )
+    parsed, _ = geos_file_geometries(fp, [], SHAPELY_CRITERIA)
+    assert isinstance(parsed, GeosGeometry) and parsed.geometry is None
+    parsed, _ = geos_file_geometries(fp, ["unclosed"], SHAPELY_CRITERIA)
+    assert parsed.geometry == {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+    }
+
+
+def test_geos_file_geometries_not_applicable(tmp_path):
+    fp = _write_collection(tmp_path, [None])
+    assert geos_file_geometries(fp, ["unclosed"], []) is None
+    assert (
+        geos_file_geometries(fp, [], ["duplicate_features", "self_intersection"])
+        is None
+    )
+    assert geos_file_geometries(read_geojson(fp), [], SHAPELY_CRITERIA) is None
+    fp.write_text(json.dumps({"type": "Feature", "features": [], "geometry": None}))
+    assert geos_file_geometries(fp, [], SHAPELY_CRITERIA) is None
+    assert main.validate_geometries(fp, geos_parsing=True) == main.validate_geometries(
+        fp
+    )
+
+
+def test_geos_parsing_excludes_other_options(tmp_path):
+    fp = _write_collection(tmp_path, [None])
+    with pytest.raises(ValueError):
+        main.validate_geometries(fp, geos_parsing=True, packed_coordinates=True)
+
+
+def test_scan_features_finds_the_geometries():
+    polygon = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"geometry": {"type": "Point"}},
+            "geometry": polygon,
+        },
+        {"geometry": {"coordinates": [1, 2], "bbox": [1, 2, 1, 2], "type": "Point"}},
+        {"type": "Feature", "geometry": None},
+        {"type": "Feature", "properties": {}},
+        {"type": "Feature", "geometry": [1, 2]},
+        {"type": "Feature", "geometry": {"type": "polygon", "coordinates": []}},
+        {"type": "Feature", "geometry": {"type": ["Polygon"], "coordinates": []}},
+        {"type": "Feature", "geometry": {"coordinates": []}},
+    ]
+    data = json.dumps({"type": "FeatureCollection", "features": features})
+    # An escaped key, and a duplicate geometry member (json keeps the last).
+    data = data.replace('"properties": {}', '"geo\\u006detry": null')
+    data = data.replace(
+        '"geometry": [1, 2]', '"geometry": {"type": "Point"}, "geometry": null'
+    )
+    buffer = data.encode()
+    scan = _scan_features(buffer)
+
+    assert (scan.starts, scan.ends) == tuple(map(list, feature_byte_ranges(buffer)))
+    assert scan.geometry_codes == [
+        4,
+        0,
+        _NULL,
+        _DECODE,
+        _NULL,
+        _DECODE,
+        _DECODE,
+        _DECODE,
+    ]
+    for code, start, end, feature in zip(
+        scan.geometry_codes, scan.geometry_starts, scan.geometry_ends, features
+    ):
+        if code >= 0:
+            assert json.loads(buffer[start:end]) == feature["geometry"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"type": "FeatureCollection", "features": [null]}',
+        b'{"type": "FeatureCollection", "features": [{}, 5, {}]}',
+        b'{"type": "FeatureCollection", "features": [{} {}]}',
+        b'{"type": "FeatureCollection", "features": [{}, "a"]}',
+        b'{"type": "FeatureCollection", "features": [{}',
+    ],
+)
+def test_scan_features_raises_if_not_splittable(data):
+    with pytest.raises(ValueError):
+        _scan_features(data)
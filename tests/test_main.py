@@ -169,6 +169,35 @@ def test_validate_geometries_runs_all_normal_files(
             assert results["count_geometry_types"] or results["skipped_validation"]
 
 
+# Their root is no readable FeatureCollection, Feature or Geometry, so there are no
+# geometries to validate (see validate_structure). Unchanged since the first release.
+ROOT_ERRORS = {
+    "invalid_featurecollcetion_no_features_member.geojson": KeyError,
+    "invalid_featurecollection_feature_nullfeature.geojson": AttributeError,
+    "invalid_featurecollection_nulltype.geojson": ValueError,
+    "invalid_featurecollection_type_lowercase.geojson": ValueError,
+    "invalid_featurecollection_unknown_type.geojson": ValueError,
+    "invalid_geometry_missing_type.geojson": ValueError,
+    "invalid_geometry_wrong_geometry_type.geojson": ValueError,
+}
+
+
+def test_validate_geometries_does_not_raise_on_invalid_structure(
+    invalid_structure_files,
+):
+    for file_path in invalid_structure_files:
+        if file_path.name in ROOT_ERRORS:
+            with pytest.raises(ROOT_ERRORS[file_path.name]):
+                main.validate_geometries(file_path)
+            continue
+        results = main.validate_geometries(file_path)
+        assert isinstance(results["skipped_validation"], list), file_path.name
+    results = main.validate_geometries(
+        DATA / "invalid_structure/invalid_geometry_coordinates_empty_position.geojson"
+    )
+    assert results["skipped_validation"] == [0]
+
+
 def test_validations_raise_bad_filepath():
     filepath = "abc.geojson"
     with pytest.raises(FileNotFoundError):
@@ -204,3 +233,94 @@ def test_fix_geometries_optional_single_string_raises():
     fc = read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")
     with pytest.raises(ValueError, match="must be a list of criteria names"):
         main.fix_geometries(fc, optional="duplicate_nodes")
+
+
+def test_validate_geometries_duplicate_features_opt_in():
+    fc = read_geojson(DATA / "valid/valid_featurecollection.geojson")
+    fc["features"] = fc["features"] * 3
+    assert "duplicate_features" not in main.validate_geometries(fc)["problematic"]
+    results = main.validate_geometries(fc, criteria_problematic=["duplicate_features"])
+    n = len(fc["features"]) // 3
+    assert results["problematic"]["duplicate_features"] == [
+        [i, i + n, i + 2 * n] for i in range(n)
+    ]
+
+
+def test_validate_geometries_criteria_options():
+    fc = read_geojson(DATA / "valid/valid_featurecollection.geojson")
+    results = main.validate_geometries(
+        fc,
+        criteria_problematic=["duplicate_features"],
+        criteria_options={"duplicate_features": {"normalize": True}},
+    )
+    assert "duplicate_features" not in results["problematic"]
+    with pytest.raises(ValueError, match="Invalid options"):
+        main.validate_geometries(
+            fc,
+            criteria_problematic=["duplicate_features"],
+            criteria_options={"duplicate_features": {"unknown": True}},
+        )
+    with pytest.raises(ValueError, match="not a selected criterium"):
+        main.validate_geometries(
+            fc, criteria_options={"duplicate_features": {"normalize": True}}
+        )
+    with pytest.raises(ValueError, match="only supported for the criteria"):
+        main.validate_geometries(fc, criteria_options={"holes": {}})
+
+
+def test_validate_geometries_overlapping_features():
+    fc = read_geojson(DATA / "valid/valid_featurecollection.geojson")
+    fc["features"] = fc["features"][:1] * 2
+    results = main.validate_geometries(
+        fc,
+        criteria_invalid=[],
+        criteria_problematic=["overlapping_features"],
+        criteria_options={"overlapping_features": {"min_overlap_area": 0}},
+    )
+    assert results["problematic"] == {"overlapping_features": [[0, 1]]}
+
+
+def test_iter_validate_geometries_same_results_as_validate_geometries(
+    all_normal_geojson_files,
+):
+    for file_path in all_normal_geojson_files:
+        fc = read_geojson(file_path)
+        expected = main.validate_geometries(fc)
+        results_invalid: dict = {}
+        results_problematic: dict = {}
+        skipped = []
+        for result in main.iter_validate_geometries(fc):
+            for criterium, flagged in result.flagged_invalid.items():
+                results_invalid.setdefault(criterium, []).append(flagged)
+            for criterium, flagged in result.flagged_problematic.items():
+                results_problematic.setdefault(criterium, []).append(flagged)
+            if result.skipped:
+                skipped.append(result.feature_index)
+        assert results_invalid == expected["invalid"], file_path.name
+        assert results_problematic == expected["problematic"], file_path.name
+        assert skipped == expected["skipped_validation"], file_path.name
+
+
+def test_iter_validate_geometries_is_lazy_over_iterable_of_features():
+    feature = read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")[
+        "features"
+    ][0]
+
+    def features():
+        yield feature
+        yield None
+        raise AssertionError("Read beyond the consumed features")
+
+    results = main.iter_validate_geometries(features(), criteria_problematic=[])
+    result = next(results)
+    assert result.feature_index == 0
+    assert result.flagged_invalid == {"unclosed": 0}
+    assert not result.skipped
+    assert next(results).skipped
+
+
+def test_iter_validate_geometries_raises_on_call():
+    with pytest.raises(ValueError, match="not supported per feature"):
+        main.iter_validate_geometries([], criteria_problematic=["duplicate_features"])
+    with pytest.raises(ValueError, match="not a valid argument"):
+        main.iter_validate_geometries([], criteria_invalid=["unknown"])
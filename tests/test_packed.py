@@ -0,0 +1,173 @@
+import json
+
+import numpy as np
+import pytest
+import shapely
+
+from geojson_validator import main
+from geojson_validator.geometry_utils import geojson_geometries
+from geojson_validator.packed import PackedGeometries
+from geojson_validator.parallel import validate_geometries_parallel
+from .helpers import read_geojson
+
+POLYGON = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}
+BROKEN_OR_UNPACKABLE = [
+    None,
+    "not an object",
+    {"type": "Point", "coordinates": [1]},
+    {"type": "Point", "coordinates": [1, 2, 3, 4]},
+    {"type": "Point", "coordinates": [True, False]},
+    {"type": "Point", "coordinates": ["1", 2]},
+    {"type": "LineString", "coordinates": [[0, 0], [1, 1, 1]]},
+    {"type": "Polygon", "coordinates": [[0, 0], [1, 0]]},
+    {"type": "Polygon", "coordinates": [[[2**60, 0], [1, 0], [1, 1], [2**60, 0]]]},
+    {"type": "MultiPolygon", "coordinates": [POLYGON["coordinates"], 5]},
+    {"type": "GeometryCollection", "geometries": [POLYGON]},
+    {"type": "Unknown", "coordinates": []},
+    {"type": "Polygon"},
+]
+
+
+def test_packed_geometries_round_trip(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        geometries = geojson_geometries(read_geojson(file_path))
+        packed = PackedGeometries.from_geometries(geometries)
+        assert len(packed) == len(geometries)
+        for i, geometry in enumerate(geometries):
+            unpacked = packed.geometry(i)
+            if geometry is None:
+                assert unpacked is None
+                continue
+            assert unpacked["type"] == geometry["type"], file_path.name
+            if "coordinates" in unpacked:
+                assert unpacked["coordinates"] == geometry["coordinates"]
+
+
+def test_packed_geometries_keeps_unpackable_geometries():
+    geometries = [
+        POLYGON,
+        *BROKEN_OR_UNPACKABLE,
+        {"type": "MultiPoint", "coordinates": []},
+    ]
+    packed = PackedGeometries.from_geometries(geometries)
+    assert packed.geometry(0) == POLYGON
+    assert sorted(packed.fallback) == list(range(1, len(BROKEN_OR_UNPACKABLE) + 1))
+    assert packed.geometry(len(geometries) - 1) == geometries[-1]
+
+
+def test_packed_geometries_shared_memory_views():
+    packed = PackedGeometries.from_geometries([POLYGON, None, POLYGON])
+    shm, layout = packed.to_shared_memory()
+    try:
+        shared = PackedGeometries.from_shared_memory(shm.buf, layout, packed.fallback)
+        assert [shared.geometry(i) for i in range(3)] == [POLYGON, None, POLYGON]
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_packed_geometries_ragged_dims():
+    polygon_z = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0, 1], [1, 0, 1], [0, 1, 1], [0, 0, 1]]],
+    }
+    geometries = [
+        POLYGON,
+        polygon_z,
+        {"type": "MultiPolygon", "coordinates": []},
+        {"type": "Point", "coordinates": [1, 2]},
+        {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+        None,
+        # Not what shapely builds from them, or nothing at all.
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]},
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [0, 0]]]},
+        {"type": "Polygon", "coordinates": []},
+        {"type": "LineString", "coordinates": [[0, 0]]},
+        {"type": "Point", "coordinates": [float("nan"), 0]},
+        {
+            "type": "MultiPolygon",
+            "coordinates": [POLYGON["coordinates"], polygon_z["coordinates"]],
+        },
+    ]
+    packed = PackedGeometries.from_geometries(geometries)
+    assert packed.ragged_dims(0, len(packed)).tolist() == [2, 3, 2, 2, 2] + [0] * 7
+    assert packed.ragged_dims(1, 4).tolist() == [3, 2, 2]
+
+
+@pytest.mark.parametrize("include_z", [False, True])
+def test_packed_geometries_ragged_same_as_shapely(shapely_geometries, include_z):
+    geoms = [
+        g
+        for g in shapely_geometries
+        if not g.is_empty
+        and g.geom_type not in ("GeometryCollection", "LinearRing")
+        and shapely.has_z(g) == include_z
+    ]
+    packed = PackedGeometries.from_geometries(
+        [json.loads(json.dumps(g.__geo_interface__)) for g in geoms]
+    )
+    types = np.array([g.geom_type for g in geoms])
+    for geometry_type in np.unique(types):
+        indices = np.flatnonzero(types == geometry_type)
+        coords, offsets = packed.ragged(indices)
+        _, expected_coords, expected_offsets = shapely.to_ragged_array(
+            np.array(geoms, dtype=object)[indices], include_z=include_z
+        )
+        np.testing.assert_array_equal(coords, expected_coords)
+        assert len(offsets) == len(expected_offsets), geometry_type
+        for level, expected in zip(offsets, expected_offsets):
+            np.testing.assert_array_equal(level, expected)
+
+
+def test_validate_geometries_parallel_only_unpacks_irregular_geometries(monkeypatch):
+    unclosed = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]}
+    multi = {"type": "MultiPolygon", "coordinates": [POLYGON["coordinates"]] * 2}
+    geometries = [POLYGON, unclosed, multi, None, POLYGON]
+    unpacked = []
+    geometry = PackedGeometries.geometry
+
+    def tracked(self, index):
+        unpacked.append(index)
+        return geometry(self, index)
+
+    monkeypatch.setattr(PackedGeometries, "geometry", tracked)
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": {}, "geometry": g} for g in geometries
+        ],
+    }
+    results = validate_geometries_parallel(fc, workers=1)
+    assert results == main.validate_geometries(fc)
+    assert unpacked == [1, 3]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_geometries_parallel_same_as_validate_geometries(
+    all_normal_geojson_files, workers
+):
+    for file_path in all_normal_geojson_files:
+        assert validate_geometries_parallel(
+            file_path, workers=workers, features_per_task=1
+        ) == main.validate_geometries(file_path), file_path.name
+
+
+def test_validate_geometries_parallel_broken_geometries():
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": {}, "geometry": g}
+            for g in [POLYGON, *BROKEN_OR_UNPACKABLE[2:]] * 3
+        ],
+    }
+    assert validate_geometries_parallel(
+        fc, workers=2, features_per_task=4
+    ) == main.validate_geometries(fc)
+
+
+def test_validate_geometries_parallel_rejects_cross_feature_criteria():
+    with pytest.raises(ValueError, match="not supported here"):
+        validate_geometries_parallel(
+            POLYGON, criteria_problematic=["duplicate_features"]
+        )
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+from shapely.geometry import shape
+
+from geojson_validator import main
+from geojson_validator.packed_json import PackedGeometry, loads_packed, pack_geometry
+from .helpers import DATA
+
+POLYGON = {
+    "type": "Polygon",
+    "coordinates": [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[1, 1], [2, 1], [2, 2], [1, 1]],
+    ],
+}
+
+
+def _all_files():
+    return sorted(DATA.rglob("*.geojson"))
+
+
+def test_validate_structure_packed_coordinates_same_results():
+    for file_path in _all_files():
+        for check_crs in (False, True):
+            assert main.validate_structure(
+                file_path, check_crs=check_crs, packed_coordinates=True
+            ) == main.validate_structure(file_path, check_crs=check_crs), file_path.name
+
+
+def test_validate_geometries_packed_coordinates_same_results(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        assert main.validate_geometries(
+            file_path, packed_coordinates=True
+        ) == main.validate_geometries(file_path), file_path.name
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        POLYGON,
+        {
+            "type": "LineString",
+            "coordinates": [[0, 0, 1], [1, 1, 2]],
+            "bbox": [0, 0, 1, 1],
+        },
+        {
+            "type": "MultiLineString",
+            "coordinates": [[[0, 0], [1, 1]], [[2, 2], [3, 3]]],
+        },
+        {"type": "MultiPolygon", "coordinates": [POLYGON["coordinates"]] * 2},
+    ],
+)
+def test_pack_geometry_behaves_like_the_dict(geometry):
+    packed = pack_geometry(geometry)
+    assert isinstance(packed, PackedGeometry)
+    assert dict(packed) == geometry
+    assert packed["type"] == geometry["type"]
+    assert shape(packed).equals(shape(geometry))
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        {"type": "Point", "coordinates": [0, 0]},
+        {"type": "Polygon", "coordinates": []},
+        {"type": "Polygon", "coordinates": [[]]},
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1, 1], [0, 0]]]},
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 0]], [[0, 0, 0], [1, 0, 0]]]},
+        {"type": "LineString", "coordinates": [[0, "0"], [1, 1]]},
+        {"type": "LineString", "coordinates": [[[0, 0], [1, 1]]]},
+        {"type": "MultiPolygon", "coordinates": [[]]},
+    ],
+)
+def test_pack_geometry_keeps_irregular_coordinates(geometry):
+    assert pack_geometry(geometry) is geometry
+
+
+def test_loads_packed_keeps_properties_and_is_smaller():
+    ring = [[i * 0.001, (i % 7) * 0.001] for i in range(10_000)] + [[0.0, 0.0]]
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "a", "coordinates": "not a geometry"},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        ],
+    }
+    decoded = loads_packed(json.dumps(fc))
+    feature = decoded["features"][0]
+    assert feature["properties"] == fc["features"][0]["properties"]
+    geometry = feature["geometry"]
+    assert isinstance(geometry, PackedGeometry)
+    assert geometry.coords.nbytes == len(ring) * 2 * 8
+
+
+def test_loads_packed_only_packs_geometries():
+    square = [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"footprint": {"type": "Polygon", "coordinates": square}},
+                "geometry": {
+                    "type": "GeometryCollection",
+                    "geometries": [{"type": "Polygon", "coordinates": square}],
+                },
+            }
+        ],
+    }
+    feature = loads_packed(json.dumps(fc))["features"][0]
+    footprint = feature["properties"]["footprint"]
+    assert isinstance(footprint, dict)
+    assert footprint == fc["features"][0]["properties"]["footprint"]
+    assert isinstance(feature["geometry"]["geometries"][0], PackedGeometry)
+    assert isinstance(loads_packed(json.dumps(POLYGON)), PackedGeometry)
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from geojson_validator import main, validate_file_parallel
+from geojson_validator.feature_index import feature_byte_ranges
+from .helpers import DATA, read_geojson
+
+
+def test_feature_byte_ranges_only_splits_the_features_array():
+    fc = {
+        "type": "FeatureCollection",
+        "crs": {"name": "{"},
+        "features": [
+            {"type": "Feature", "properties": {"name": '}{"\\'}, "geometry": None},
+            {
+                "type": "Feature",
+                "properties": {"features": {}},
+                "geometry": {"type": "Point", "coordinates": [1, 2]},
+            },
+        ],
+        "bbox": [0, 0, 1, 1],
+    }
+    for indent in (None, 2):
+        data = json.dumps(fc, indent=indent).encode()
+        starts, ends = feature_byte_ranges(data)
+        features = [json.loads(data[s:e]) for s, e in zip(starts, ends)]
+        assert features == fc["features"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"type": "Feature", "geometry": null}',
+        b'{"type": "FeatureCollection", "features": [null]}',
+        b'{"type": "FeatureCollection", "features": {}}',
+        b"",
+    ],
+)
+def test_feature_byte_ranges_raises_if_not_splittable(data):
+    with pytest.raises(ValueError):
+        feature_byte_ranges(data)
+
+
+def test_feature_byte_ranges_empty_features():
+    starts, ends = feature_byte_ranges(
+        b'{"features": [ ], "type": "FeatureCollection"}'
+    )
+    assert not starts and not ends
+
+
+def test_validate_file_parallel_same_as_validate_geometries(all_normal_geojson_files):
+    # Also covers the files that are not a FeatureCollection, which are read whole.
+    for file_path in all_normal_geojson_files:
+        assert validate_file_parallel(
+            file_path, workers=1, chunk_bytes=1
+        ) == main.validate_geometries(file_path), file_path.name
+
+
+def test_validate_file_parallel_worker_processes(tmp_path):
+    fc = read_geojson(DATA / "problematic_geometries/problematic_holes.geojson")
+    unclosed = read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")
+    null_geometry = {"type": "Feature", "properties": {}, "geometry": None}
+    fc["features"] = (fc["features"] + unclosed["features"] + [null_geometry]) * 20
+    file_path = tmp_path / "large.geojson"
+    file_path.write_text(json.dumps(fc), encoding="UTF-8")
+    criteria = {"criteria_problematic": ["holes", "duplicate_features"]}
+    assert validate_file_parallel(
+        file_path, workers=2, **criteria
+    ) == main.validate_geometries(file_path, **criteria)
@@ -0,0 +1,79 @@
+import pickle
+import random
+
+import pytest
+
+from geojson_validator import main, validate_partition, merge_results
+from .helpers import DATA, read_geojson
+
+SQUARE = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+UNCLOSED = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]}
+
+
+def _features(geometries):
+    return [
+        {"type": "Feature", "properties": {}, "geometry": geometry}
+        for geometry in geometries
+    ]
+
+
+def _validate_in_partitions(features, size, **criteria):
+    partitions = [
+        validate_partition(features[start : start + size], start, **criteria)
+        for start in range(0, len(features), size)
+    ]
+    random.Random(0).shuffle(partitions)
+    # As if sent to and from a worker process.
+    return merge_results(pickle.loads(pickle.dumps(p)) for p in partitions)
+
+
+def test_merge_results_same_as_validate_geometries(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        fc = read_geojson(file_path)
+        if fc.get("type") != "FeatureCollection":
+            continue
+        expected = main.validate_geometries(fc)
+        for size in (1, 2, 5):
+            assert (
+                _validate_in_partitions(fc["features"], size) == expected
+            ), file_path.name
+
+
+def test_merge_results_multi_geometries_and_skipped():
+    features = _features(
+        [
+            SQUARE,
+            None,
+            {"type": "MultiPolygon", "coordinates": [UNCLOSED["coordinates"]] * 2},
+            {"type": "Point", "coordinates": [1]},
+            UNCLOSED,
+            {"type": "GeometryCollection", "geometries": [SQUARE, UNCLOSED]},
+            {"type": "Unknown"},
+        ]
+    )
+    expected = main.validate_geometries(
+        {"type": "FeatureCollection", "features": features}
+    )
+    assert expected["invalid"]["unclosed"] == [{2: [0, 1]}, 4, {5: [1]}]
+    for size in (1, 3, 4):
+        assert _validate_in_partitions(features, size) == expected
+
+
+@pytest.mark.parametrize("partitions", [1, 4])
+def test_merge_results_cross_feature_criteria_across_partitions(partitions):
+    features = _features([SQUARE, UNCLOSED, SQUARE, None, SQUARE, UNCLOSED])
+    criteria = {
+        "criteria_invalid": [],
+        "criteria_problematic": ["duplicate_features", "overlapping_features"],
+        "criteria_options": {"duplicate_features": {"partitions": partitions}},
+    }
+    expected = main.validate_geometries(
+        {"type": "FeatureCollection", "features": features}, **criteria
+    )
+    assert expected["problematic"]["duplicate_features"] == [[0, 2, 4], [1, 5]]
+    assert _validate_in_partitions(features, 2, **criteria) == expected
+
+
+def test_validate_partition_single_partition_same_as_validate_geometries():
+    fc = read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")
+    assert validate_partition(fc) == main.validate_geometries(fc)
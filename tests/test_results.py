@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from geojson_validator import main, ValidationResults
+from geojson_validator.geometry_validation import (
+    INVALID_CRITERIA,
+    PROBLEMATIC_CRITERIA,
+    process_validation,
+)
+from geojson_validator.results import FeatureResult
+from .helpers import read_geojson
+
+UNCLOSED = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]}
+VALID = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+
+
+def test_compact_results_to_dict_same_as_validate_geometries(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        fc = read_geojson(file_path)
+        results = main.validate_geometries(fc, compact=True)
+        assert isinstance(results, ValidationResults)
+        assert results.to_dict() == main.validate_geometries(fc), file_path.name
+
+
+def test_compact_results_to_dict_multi_geometries_and_skipped():
+    geometries = [
+        VALID,
+        None,
+        {"type": "MultiPolygon", "coordinates": [VALID["coordinates"], [[[0, 0]]]]},
+        {"type": "Point", "coordinates": [1]},
+        UNCLOSED,
+        {"type": "GeometryCollection", "geometries": [VALID, UNCLOSED]},
+        "not an object",
+        {"type": "Unknown"},
+    ]
+    args = (geometries, INVALID_CRITERIA, PROBLEMATIC_CRITERIA)
+    results = process_validation(*args, compact=True)
+    assert results.to_dict() == process_validation(*args)
+    assert (
+        results.count_geometry_types
+        == process_validation(*args)["count_geometry_types"]
+    )
+
+
+def test_compact_results_counts_and_flagged():
+    geometries = [UNCLOSED if i % 3 == 0 else VALID for i in range(1000)]
+    results = process_validation(
+        geometries, ["unclosed"], [], criteria_options=None, compact=True
+    )
+    assert results.counts() == {"invalid": {"unclosed": 334}, "problematic": {}}
+    np.testing.assert_array_equal(results.flagged("unclosed"), np.arange(0, 1000, 3))
+    assert results.flagged("holes").size == 0
+    assert results.skipped_validation.size == 0
+    assert "unclosed" in repr(results)
+
+
+def test_compact_results_add_flagged_same_as_add():
+    flagged = [0, 7, 8, 30]
+    one_by_one = ValidationResults()
+    for index in flagged:
+        value = {index: [1]} if index == 8 else index
+        one_by_one.add(
+            FeatureResult(index, {}, {"holes": value}, False), "Polygon", True
+        )
+    at_once = ValidationResults()
+    at_once.add_flagged("problematic", "holes", np.array(flagged), {8: [1]})
+    at_once.add_flagged("invalid", "unclosed", np.array([], dtype=np.int64))
+    at_once.add_geometry_types("Polygon", len(flagged))
+    assert at_once.to_dict() == one_by_one.to_dict()
+
+
+def test_compact_results_cross_feature_criteria():
+    results = main.validate_geometries(
+        {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "properties": {}, "geometry": geometry}
+                for geometry in [VALID, UNCLOSED, VALID, VALID]
+            ],
+        },
+        criteria_invalid=[],
+        criteria_problematic=["duplicate_features"],
+        compact=True,
+    )
+    assert results.counts()["problematic"] == {"duplicate_features": 1}
+    np.testing.assert_array_equal(results.flagged("duplicate_features"), [0, 2, 3])
+    assert results.to_dict()["problematic"] == {"duplicate_features": [[0, 2, 3]]}
+
+
+def test_compact_results_flagged_unequal_groups():
+    results = main.validate_geometries(
+        {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "properties": {}, "geometry": geometry}
+                for geometry in [VALID, VALID, VALID, UNCLOSED, UNCLOSED]
+            ],
+        },
+        criteria_invalid=[],
+        criteria_problematic=["duplicate_features"],
+        compact=True,
+    )
+    assert results.to_dict()["problematic"] == {
+        "duplicate_features": [[0, 1, 2], [3, 4]]
+    }
+    np.testing.assert_array_equal(
+        results.flagged("duplicate_features"), [0, 1, 2, 3, 4]
+    )
+
+
+def test_summary_only_counts_same_as_results(all_normal_geojson_files):
+    for file_path in all_normal_geojson_files:
+        fc = read_geojson(file_path)
+        results = main.validate_geometries(fc)
+        summary = main.validate_geometries(fc, summary_only=True)
+        for criteria_type in ("invalid", "problematic"):
+            assert summary[criteria_type] == {
+                criterium: len(flagged)
+                for criterium, flagged in results[criteria_type].items()
+            }, file_path.name
+        assert summary["count_geometry_types"] == results["count_geometry_types"]
+        assert summary["skipped_validation"] == len(results["skipped_validation"])
+
+
+def test_summary_only_and_compact_exclusive():
+    with pytest.raises(ValueError, match="only one of"):
+        main.validate_geometries(VALID, compact=True, summary_only=True)
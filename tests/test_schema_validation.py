@@ -146,3 +146,13 @@ def test_schema_validation_crs_files_only_flagged_with_check_crs(
         fc = read_geojson(file_path)
         assert not schema_validation.GeoJsonLint().lint(fc), file_path.name
         assert schema_validation.GeoJsonLint(check_crs=True).lint(fc), file_path.name
+
+
+def test_schema_validation_summary_only_counts_errors(invalid_structure_files):
+    for file_path in invalid_structure_files:
+        geojson_data = read_geojson(file_path)
+        errors = schema_validation.GeoJsonLint().lint(geojson_data)
+        counts = schema_validation.GeoJsonLint(summary_only=True).lint(geojson_data)
+        assert counts == {
+            message: len(error["path"]) for message, error in errors.items()
+        }, file_path.name
@@ -0,0 +1,229 @@
+from concurrent.futures.process import BrokenProcessPool
+from http.client import HTTPConnection
+import json
+import os
+import socket
+import threading
+
+import pytest
+import requests
+
+from geojson_validator import ValidationServer, batch, main
+from geojson_validator.server import _Metrics
+from .helpers import DATA
+
+VALID = DATA / "valid/valid_featurecollection.geojson"
+UNCLOSED = DATA / "invalid_geometries/invalid_unclosed.geojson"
+
+
+def _exit_worker(_paths):
+    os._exit(1)
+
+
+@pytest.fixture(name="server", scope="module")
+def fixture_server():
+    with ValidationServer(("127.0.0.1", 0), workers=2, max_pending=4) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+def _url(server, path):
+    host, port = server.address
+    return f"http://{host}:{port}{path}"
+
+
+def test_validate(server):
+    response = requests.post(
+        _url(server, "/validate"), data=UNCLOSED.read_bytes(), timeout=5
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "structure": main.validate_structure(UNCLOSED),
+        "geometries": main.validate_geometries(UNCLOSED),
+        "valid": False,
+    }
+
+    response = requests.post(_url(server, "/validate"), data=b"{not json", timeout=5)
+    assert response.status_code == 200
+    assert "error" in response.json()
+    assert not response.json()["valid"]
+
+
+def test_validate_files_streamed(server, tmp_path):
+    (tmp_path / "a.geojson").write_bytes(VALID.read_bytes())
+    (tmp_path / "b.geojson").write_bytes(UNCLOSED.read_bytes())
+    with requests.post(
+        _url(server, "/validate-files"),
+        json=[str(tmp_path / "*.geojson")],
+        stream=True,
+        timeout=5,
+    ) as response:
+        assert response.status_code == 200
+        reports = [json.loads(line) for line in response.iter_lines() if line]
+    assert {report["path"]: report["valid"] for report in reports} == {
+        str(tmp_path / "a.geojson"): True,
+        str(tmp_path / "b.geojson"): False,
+    }
+
+    response = requests.post(
+        _url(server, "/validate-files"), data=b"{not json", timeout=5
+    )
+    assert response.status_code == 400
+
+
+def test_backpressure_and_metrics(server):
+    for _ in range(4):
+        server.slots.acquire()
+    try:
+        response = requests.post(
+            _url(server, "/validate"), data=VALID.read_bytes(), timeout=5
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        for _ in range(4):
+            server.slots.release()
+
+    metrics = requests.get(_url(server, "/metrics"), timeout=5).json()
+    assert metrics["rejected"] >= 1
+    assert metrics["requests"] >= 1
+    assert metrics["in_flight"] == 0
+    assert set(metrics["latency_ms"]) == {"mean", "p50", "p95", "p99", "max"}
+    assert requests.get(_url(server, "/unknown"), timeout=5).status_code == 404
+
+
+def _post_headers(server, content_length):
+    """The status line and headers of a POST /validate whose body is never sent."""
+    with socket.create_connection(server.address, timeout=5) as sock:
+        sock.sendall(
+            b"POST /validate HTTP/1.1\r\nHost: localhost\r\n"
+            + f"Content-Length: {content_length}\r\n\r\n".encode()
+        )
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+    return response.decode().split("\r\n\r\n")[0]
+
+
+def test_rejected_before_the_body_is_read(server):
+    for _ in range(4):
+        server.slots.acquire()
+    try:
+        # Answered at once, not after a timeout waiting for the body.
+        head = _post_headers(server, 10**9)
+    finally:
+        for _ in range(4):
+            server.slots.release()
+    assert head.startswith("HTTP/1.1 503")
+    assert "Connection: close" in head
+
+    head = _post_headers(server, server.max_body_bytes + 1)
+    assert head.startswith("HTTP/1.1 413")
+    assert "Connection: close" in head
+
+
+@pytest.mark.parametrize("content_length", ["-1", "abc", "1_000", "+1"])
+def test_invalid_content_length(server, content_length):
+    head = _post_headers(server, content_length)
+    assert head.startswith("HTTP/1.1 400")
+    assert "Connection: close" in head
+    assert requests.get(_url(server, "/metrics"), timeout=5).json()["in_flight"] == 0
+
+
+class _UnixConnection(HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def test_metrics_of_a_single_request():
+    metrics = _Metrics()
+    metrics.add_latency(0.01)
+    latency_ms = metrics.to_dict()["latency_ms"]
+    assert latency_ms == pytest.approx(
+        {"mean": 10.0, "p50": 10.0, "p95": 10.0, "p99": 10.0, "max": 10.0}
+    )
+
+
+def test_unix_socket(tmp_path):
+    socket_path = str(tmp_path / "validator.sock")
+    with ValidationServer(socket_path, criteria_problematic=[], workers=1) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        connection = _UnixConnection(socket_path)
+        connection.request("POST", "/validate", body=VALID.read_bytes())
+        report = json.loads(connection.getresponse().read())
+        connection.close()
+        server.shutdown()
+    assert report["geometries"] == main.validate_geometries(
+        VALID, criteria_problematic=[]
+    )
+    assert report["valid"]
+
+
+def test_worker_pool_restarts_after_a_worker_died(tmp_path):
+    (tmp_path / "a.geojson").write_bytes(VALID.read_bytes())
+    with ValidationServer(("127.0.0.1", 0), workers=1) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        for _ in range(2):
+            broken = server.executor
+            with pytest.raises(BrokenProcessPool):
+                broken.submit(os._exit, 1).result()
+            response = requests.post(
+                _url(server, "/validate"), data=VALID.read_bytes(), timeout=10
+            )
+            assert response.status_code == 200
+            assert response.json()["valid"]
+            assert server.executor is not broken
+        response = requests.post(
+            _url(server, "/validate-files"), json=[str(tmp_path)], timeout=10
+        )
+        assert [json.loads(line)["valid"] for line in response.iter_lines()] == [True]
+        server.shutdown()
+
+
+def test_validate_files_stream_completes_on_errors(tmp_path, monkeypatch):
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.geojson").write_bytes(VALID.read_bytes())
+    with ValidationServer(("127.0.0.1", 0), workers=1) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        # Submitted to a broken pool, the files are submitted again to a new pool.
+        with pytest.raises(BrokenProcessPool):
+            server.executor.submit(os._exit, 1).result()
+        response = requests.post(
+            _url(server, "/validate-files"), json=[str(tmp_path)], timeout=10
+        )
+        assert [json.loads(line)["valid"] for line in response.iter_lines()] == [
+            True,
+            True,
+        ]
+
+        # The worker of the batch dies, its files are reported as failed.
+        monkeypatch.setattr(batch, "_validate_batch", _exit_worker)
+        response = requests.post(
+            _url(server, "/validate-files"), json=[str(tmp_path)], timeout=10
+        )
+        assert response.status_code == 200
+        reports = [json.loads(line) for line in response.iter_lines()]
+        server.shutdown()
+    assert sorted(report["path"] for report in reports) == [
+        str(tmp_path / "a.geojson"),
+        str(tmp_path / "b.geojson"),
+    ]
+    assert all("error" in report and not report["valid"] for report in reports)
+
+
+def test_server_raises():
+    with pytest.raises(ValueError):
+        ValidationServer(("127.0.0.1", 0), criteria_invalid=["unknown"])
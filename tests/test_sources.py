@@ -0,0 +1,133 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import bz2
+import gzip
+import json
+import lzma
+import threading
+
+import pytest
+import requests
+
+from geojson_validator import iter_features, sources
+from geojson_validator.geometry_utils import read_geojson_file_or_url
+from .helpers import DATA
+
+FILEPATH = DATA / "valid/valid_featurecollection.geojson"
+
+
+def _zstd_compress(data):
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSIONS = [
+    (".gz", gzip.compress),
+    (".bz2", bz2.compress),
+    (".xz", lzma.compress),
+    (".zst", _zstd_compress),
+]
+
+
+@pytest.mark.parametrize("suffix, compress", COMPRESSIONS)
+def test_read_geojson_file_or_url_compressed(tmp_path, suffix, compress):
+    data = FILEPATH.read_bytes()
+    filepath = tmp_path / f"data.geojson{suffix}"
+    filepath.write_bytes(compress(data))
+    assert read_geojson_file_or_url(filepath) == json.loads(data)
+
+    # Detected from the first bytes, e.g. a compressed file without the suffix.
+    filepath = tmp_path / "data.json"
+    filepath.write_bytes(compress(data))
+    assert read_geojson_file_or_url(filepath) == json.loads(data)
+
+
+@pytest.mark.parametrize(
+    "fp_or_url, compression",
+    [
+        ("a.geojson", None),
+        ("a.JSON", None),
+        ("a.geojson.GZ", "gzip"),
+        ("a.json.bz2", "bz2"),
+        ("https://example.com/a.geojson.zst?sig=xyz", "zstd"),
+    ],
+)
+def test_check_geojson_source(fp_or_url, compression):
+    assert sources.check_geojson_source(fp_or_url) == compression
+
+
+@pytest.mark.parametrize("fp_or_url", ["a.gz", "a.txt.gz", "a.geojson.zip"])
+def test_check_geojson_source_raises(fp_or_url):
+    with pytest.raises(ValueError, match="must be a geojson or json file"):
+        sources.check_geojson_source(fp_or_url)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so that a reused connection is visible as the same client port.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server
+        server.requests.append((self.path, self.client_address[1]))  # type: ignore[attr-defined]
+        if server.failures:  # type: ignore[attr-defined]
+            server.failures -= 1  # type: ignore[attr-defined]
+            status, body = 503, b""
+        elif self.path.startswith("/missing"):
+            status, body = 404, b""
+        else:
+            status, body = 200, FILEPATH.read_bytes()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []  # type: ignore[attr-defined]
+    server.failures = 0  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    sources.configure_http(backoff_factor=0)
+    yield server
+    server.shutdown()
+    server.server_close()
+    sources.configure_http()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_read_url_reuses_connection(server):
+    expected = json.loads(FILEPATH.read_bytes())
+    for _ in range(3):
+        assert read_geojson_file_or_url(_url(server, "/a.geojson")) == expected
+    assert [path for path, _ in server.requests] == ["/a.geojson"] * 3
+    assert len({port for _, port in server.requests}) == 1
+
+
+def test_read_url_retries(server):
+    server.failures = 2
+    assert read_geojson_file_or_url(_url(server, "/a.geojson"))["type"]
+    assert len(server.requests) == 3
+
+    server.failures = 10
+    with pytest.raises(requests.HTTPError, match="503"):
+        read_geojson_file_or_url(_url(server, "/a.geojson"))
+
+    assert len(server.requests) == 3 + 4
+
+    # A client error is not retried.
+    server.failures = 0
+    with pytest.raises(requests.HTTPError, match="404"):
+        read_geojson_file_or_url(_url(server, "/missing.geojson"))
+    assert len(server.requests) == 3 + 4 + 1
+
+
+def test_iter_features_url(server):
+    features = list(iter_features(_url(server, "/a.geojson")))
+    assert features == json.loads(FILEPATH.read_bytes())["features"]
@@ -0,0 +1,66 @@
+import gzip
+import json
+
+import pytest
+
+from geojson_validator import iter_features, main
+from .helpers import DATA, read_geojson
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, None])
+def test_iter_features_same_as_json(all_normal_geojson_files, chunk_bytes):
+    for file_path in all_normal_geojson_files:
+        features = main.any_geojson_to_featurecollection(read_geojson(file_path))
+        assert (
+            list(iter_features(file_path, chunk_bytes=chunk_bytes))
+            == features["features"]
+        ), file_path
+
+
+def test_iter_features_compressed_in_chunks(tmp_path):
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"name": f'escaped \\" {{ {i}', "nested": {"a": [i]}},
+            "geometry": {"type": "Point", "coordinates": [i, i]},
+        }
+        for i in range(100)
+    ]
+    fc = {"type": "FeatureCollection", "name": "points", "features": features}
+    filepath = tmp_path / "points.geojson.gz"
+    filepath.write_bytes(gzip.compress(json.dumps(fc, indent=2).encode()))
+
+    assert list(iter_features(filepath, chunk_bytes=3)) == features
+    results = list(main.iter_validate_geometries(filepath, criteria_invalid=[]))
+    assert [result.feature_index for result in results] == list(range(100))
+
+
+def test_iter_validate_geometries_compressed_file(tmp_path):
+    filepath = DATA / "problematic_geometries/problematic_excessive_vertices.geojson"
+    compressed = tmp_path / "data.geojson.gz"
+    compressed.write_bytes(gzip.compress(filepath.read_bytes()))
+    assert list(main.iter_validate_geometries(compressed)) == list(
+        main.iter_validate_geometries(read_geojson(filepath))
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"type": "FeatureCollection", "features": [null]}',
+        '{"type": "FeatureCollection", "features": [{"type": "Feature"} {}]}',
+        '{"type": "FeatureCollection", "features": [{"type": "Feature"}',
+        '{"type": "FeatureCollection", "features": {}}',
+        '{"type": "FeatureCollection"}',
+    ],
+)
+def test_iter_features_raises(tmp_path, text):
+    filepath = tmp_path / "data.geojson"
+    filepath.write_text(text)
+    with pytest.raises(ValueError):
+        list(iter_features(filepath, chunk_bytes=4))
+
+
+def test_iter_features_raises_on_call():
+    with pytest.raises(ValueError, match="must be a geojson or json file"):
+        iter_features("data.txt")
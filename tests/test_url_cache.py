@@ -0,0 +1,129 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import threading
+
+import pytest
+
+from geojson_validator import configure_http, main, sources
+from geojson_validator.geometry_utils import read_geojson_file_or_url
+from geojson_validator.url_cache import UrlCache
+from .helpers import DATA
+
+VALID = DATA / "valid/valid_featurecollection.geojson"
+UNCLOSED = DATA / "invalid_geometries/invalid_unclosed.geojson"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = self.server.bodies[self.path]  # type: ignore[attr-defined]
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.statuses.append(304)  # type: ignore[attr-defined]
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.server.statuses.append(200)  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.bodies = {  # type: ignore[attr-defined]
+        "/a.geojson": UNCLOSED.read_bytes(),
+        "/b.geojson": VALID.read_bytes(),
+    }
+    server.statuses = []  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    configure_http()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_read_url_cached(server, tmp_path):
+    configure_http(cache_dir=tmp_path)
+    url = _url(server, "/a.geojson")
+    expected = read_geojson_file_or_url(UNCLOSED)
+    assert read_geojson_file_or_url(url) == expected
+    assert read_geojson_file_or_url(url) == expected
+    assert server.statuses == [200, 304]
+
+    # A changed body is downloaded again.
+    server.bodies["/a.geojson"] = VALID.read_bytes()
+    assert read_geojson_file_or_url(url) == read_geojson_file_or_url(VALID)
+    assert server.statuses == [200, 304, 200]
+
+
+def test_validate_geometries_cached_result(server, tmp_path, monkeypatch):
+    configure_http(cache_dir=tmp_path)
+    url = _url(server, "/a.geojson")
+    calls = []
+    process_validation = main.process_validation
+    monkeypatch.setattr(
+        main,
+        "process_validation",
+        lambda *args, **kwargs: calls.append(args)
+        or process_validation(*args, **kwargs),
+    )
+
+    expected = main.validate_geometries(UNCLOSED)
+    calls.clear()
+    assert main.validate_geometries(url) == expected
+    assert main.validate_geometries(url) == expected
+    assert len(calls) == 1
+    assert server.statuses == [200, 304]
+
+    # Other options are validated, and cached, separately.
+    only_unclosed = main.validate_geometries(url, criteria_invalid=["unclosed"])
+    assert main.validate_geometries(url, criteria_invalid=["unclosed"]) == only_unclosed
+    assert len(calls) == 2
+
+    assert main.validate_structure(url) == main.validate_structure(UNCLOSED)
+    assert main.validate_structure(url) == main.validate_structure(UNCLOSED)
+
+    server.bodies["/a.geojson"] = VALID.read_bytes()
+    assert main.validate_geometries(url) == main.validate_geometries(VALID)
+
+
+def test_validate_geometries_cached_without_criteria(server, tmp_path):
+    configure_http(cache_dir=tmp_path)
+    url = _url(server, "/a.geojson")
+    for _ in range(2):
+        assert main.validate_geometries(
+            url, criteria_problematic=None
+        ) == main.validate_geometries(UNCLOSED, criteria_problematic=None)
+    assert server.statuses == [200, 304]
+
+
+def test_url_cache_evicts_least_recently_used(server, tmp_path):
+    session, timeout = sources.http_session()
+    size = len(UNCLOSED.read_bytes())
+    cache = UrlCache(tmp_path, max_bytes=size + len(VALID.read_bytes()) + 500)
+    url_a, url_b = _url(server, "/a.geojson"), _url(server, "/b.geojson")
+    cache.fetch(url_a, session, timeout)
+    cache.fetch(url_b, session, timeout)
+    assert cache.size() <= cache.max_bytes
+
+    # url_b is now the least recently used, so it is evicted to store url_c.
+    server.bodies["/c.geojson"] = UNCLOSED.read_bytes()
+    assert cache.fetch(url_a, session, timeout)[1]
+    cache.fetch(_url(server, "/c.geojson"), session, timeout)
+    assert cache.size() <= cache.max_bytes
+    assert cache.fetch(url_a, session, timeout)[1]
+    assert not cache.fetch(url_b, session, timeout)[1]
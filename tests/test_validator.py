@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from geojson_validator import main, Validator
+from .helpers import DATA, read_geojson
+
+
+def test_validator_same_results_as_validate_geometries(all_normal_geojson_files):
+    validator = Validator()
+    for file_path in all_normal_geojson_files:
+        fc = read_geojson(file_path)
+        assert validator.validate(fc) == main.validate_geometries(fc), file_path.name
+
+
+@pytest.mark.parametrize(
+    "geojson_input",
+    [
+        read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson"),
+        read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")["features"][
+            0
+        ],
+        read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson", True),
+        DATA / "invalid_geometries/invalid_unclosed.geojson",
+    ],
+)
+def test_validator_accepts_all_input_types(geojson_input):
+    results = Validator(criteria_problematic=[]).validate(geojson_input)
+    assert results["invalid"] == {"unclosed": [0]}
+
+
+def test_validator_feature_without_geometry_member_is_skipped():
+    results = Validator().validate({"type": "Feature", "properties": {}})
+    assert results["skipped_validation"] == [0]
+
+
+def test_validator_raises_on_unsupported_input():
+    with pytest.raises(ValueError, match="Unsupported input"):
+        Validator().validate({"coordinates": [1, 2]})
+    with pytest.raises(ValueError, match="Unsupported GeoJSON type"):
+        Validator().validate({"type": "Something"})
+
+
+def test_validator_checks_criteria_once_at_construction():
+    with pytest.raises(ValueError):
+        Validator(criteria_invalid=["non_existent_criteria"])
+    with pytest.raises(ValueError):
+        Validator(criteria_invalid=[], criteria_problematic=[])
+
+
+def test_validator_validate_many_is_lazy_and_ordered():
+    valid = read_geojson(DATA / "valid/valid_feature.geojson")
+    unclosed = read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")
+    results = Validator().validate_many(iter([valid, unclosed]))
+    assert not isinstance(results, list)
+    assert [bool(r["invalid"]) for r in results] == [False, True]
+
+
+def test_validator_shared_between_threads():
+    validator = Validator()
+    fc = read_geojson(DATA / "invalid_geometries/invalid_exterior_not_ccw.geojson")
+    expected = main.validate_geometries(fc)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(validator.validate, [fc] * 64))
+    assert all(result == expected for result in results)
+
+
+def test_validator_stop_on_first_invalid_reports_only_first_reason():
+    fc = read_geojson(DATA / "invalid_geometries/invalid_unclosed.geojson")
+    validator = Validator(order_by_cost=True, stop_on_first_invalid=True)
+    results = validator.validate(fc)
+    assert results["invalid"] == {"unclosed": [0]}
+    assert not results["problematic"]